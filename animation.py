@@ -0,0 +1,126 @@
+"""Неблокирующие анимации клеток поля
+
+Анимация раскладывается на изменения виджетов с задержкой от текущего
+момента и ставится в общую очередь Animator. Очередь обрабатывается
+кадрами через root.after, поэтому главный цикл Tk не останавливается и ввод
+обрабатывается во время анимации. Все изменения, пришедшиеся на один кадр,
+объединяются: у каждого виджета config вызывается не больше одного раза.
+"""
+import heapq
+import time
+import tkinter as tk
+from collections import deque
+
+FRAME_MS = 16
+REVEAL_STEP = 120
+FLASH_INTERVAL = 150
+SHAKE_STEP = 40
+# Сдвиг не больше отступа клетки, чтобы ширина столбцов сетки не менялась
+SHAKE_OFFSETS = (3, -3, 2, -2, 1, 0)
+
+
+class Animator:
+    """Очередь изменений виджетов, применяемых кадрами.
+
+    frames хранит для последних кадров опоздание относительно плана (мс),
+    время обработки кадра (мс) и число изменённых виджетов.
+    """
+
+    def __init__(self, root, frame_ms=FRAME_MS, clock=time.monotonic):
+        self.root = root
+        self.frame_ms = frame_ms
+        self.clock = clock
+        self.frames = deque(maxlen=1000)
+        self._queue = []
+        self._counter = 0
+        self._after_id = None
+        self._wake_at = None
+
+    def _now(self):
+        return self.clock() * 1000
+
+    def schedule(self, delay, widget, method="config", **options):
+        """Вызов widget.method(**options) через delay мс"""
+        self._push(delay, (widget, method, options))
+
+    def call_later(self, delay, callback):
+        """Вызов callback() через delay мс, после изменений виджетов этого кадра"""
+        self._push(delay, callback)
+
+    def _push(self, delay, action):
+        self._counter += 1
+        due = self._now() + delay
+        heapq.heappush(self._queue, (due, self._counter, action))
+        if self._after_id is None or due < self._wake_at:
+            self._wake()
+
+    def _wake(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+        self._after_id = None
+        if self._queue:
+            self._wake_at = self._queue[0][0]
+            delay = max(0, int(self._wake_at - self._now()))
+            self._after_id = self.root.after(delay, self._tick)
+
+    def _tick(self):
+        self._after_id = None
+        start = self._now()
+        planned = self._queue[0][0] if self._queue else start
+        changes = {}
+        callbacks = []
+        # Всё, что приходится на текущий кадр, применяется одним проходом
+        while self._queue and self._queue[0][0] <= start + self.frame_ms / 2:
+            _, _, action = heapq.heappop(self._queue)
+            if callable(action):
+                callbacks.append(action)
+                continue
+            widget, method, options = action
+            key = (id(widget), method)
+            if key not in changes:
+                changes[key] = (widget, method, {})
+            changes[key][2].update(options)
+        for widget, method, options in changes.values():
+            try:
+                getattr(widget, method)(**options)
+            except tk.TclError:
+                pass  # Виджет уже уничтожен, например при выходе в меню
+        self.frames.append((max(0.0, start - planned), self._now() - start, len(changes)))
+        for callback in callbacks:
+            callback()
+        self._wake()
+
+    def busy(self):
+        """Есть ли незавершённые анимации"""
+        return bool(self._queue)
+
+    def clear(self):
+        """Отмена всех запланированных изменений"""
+        self._queue = []
+        self._wake()
+
+    def reveal(self, cells, colors, start=0, step=REVEAL_STEP):
+        """Поочерёдное открытие цветов клеток строки; возвращает время окончания"""
+        for i, (cell, color) in enumerate(zip(cells, colors)):
+            self.schedule(start + i * step, cell, bg=color)
+        return start + len(cells) * step
+
+    def flash(self, cells, color, start=0, times=3, interval=FLASH_INTERVAL, blank="white"):
+        """Мигание строки; возвращает время окончания"""
+        for i in range(times):
+            for cell in cells:
+                self.schedule(start + 2 * i * interval, cell, bg=blank)
+                self.schedule(start + (2 * i + 1) * interval, cell, bg=color)
+        return start + 2 * times * interval
+
+    def shake(self, cells, start=0, step=SHAKE_STEP, pad=3):
+        """Покачивание строки влево-вправо; возвращает время окончания.
+
+        Сдвиг ограничен отступом pad: отрицательный отступ Tk не принимает.
+        """
+        for i, offset in enumerate(SHAKE_OFFSETS):
+            offset = max(-pad, min(pad, offset))
+            for cell in cells:
+                self.schedule(start + i * step, cell, "grid_configure",
+                              padx=(pad + offset, pad - offset))
+        return start + len(SHAKE_OFFSETS) * step
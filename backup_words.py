@@ -0,0 +1,83 @@
+"""Резервные словари для всех длин, пока полный словарь не загружен
+
+Списки проверяются при импорте: слово должно состоять из русских букв и
+лежать в списке своей длины, иначе резервный режим этой длины тихо
+остался бы с меньшим числом слов. Новые списки можно собрать из полного
+словаря: python backup_words.py [--per-length 16] [--seed 0] — команда
+печатает готовое определение BACKUP_WORDS.
+"""
+import argparse
+import random
+
+from lexicon import ALPHABET, Lexicon
+
+LENGTHS = range(4, 11)
+
+BACKUP_WORDS = {
+    4: ["ваза", "гора", "зима", "каша", "лиса", "луна",
+        "нога", "река", "роза", "рука", "рыба", "сова"],
+    5: ["ветер", "каска", "лампа", "метро", "норма", "океан",
+        "пирог", "речка", "рубин", "салат", "столб", "танец",
+        "улица", "хобби", "штора", "эмаль", "юноша", "якорь"],
+    6: ["абажур", "баклан", "береза", "газета", "горшок", "дерево",
+        "дорога", "желудь", "жалюзи", "журнал", "камень", "качели",
+        "лисица", "пальто", "фонарь", "цветок"],
+    7: ["бабочка", "барабан", "игрушка", "капуста", "картина", "комната",
+        "корабль", "попугай", "ромашка", "самолёт", "учитель", "человек"],
+    8: ["апельсин", "виноград", "вертолёт", "карандаш", "крокодил", "листопад",
+        "мармелад", "портфель", "праздник", "стрекоза", "черепаха", "шиповник"],
+    9: ["будильник", "велосипед", "звездопад", "земляника", "картофель", "космонавт",
+        "насекомое", "одуванчик", "подсолнух", "программа", "телевизор", "экскурсия"],
+    10: ["автомобиль", "барабанщик", "библиотека", "композитор", "литература", "математика",
+         "медвежонок", "собеседник", "стоматолог", "фотография", "электричка"],
+}
+
+
+def validate(backup):
+    """Проверка резервных списков; ValueError со всеми ошибочными словами"""
+    errors = []
+    for length, words in backup.items():
+        for word in words:
+            if len(word) != length:
+                errors.append(f"{word!r} в списке для {length} букв")
+            elif not set(word) <= set(ALPHABET):
+                errors.append(f"{word!r}: не только русские строчные буквы")
+        if len(set(words)) != len(words):
+            errors.append(f"повторы в списке для {length} букв")
+    if errors:
+        raise ValueError("Неверные резервные слова: " + "; ".join(errors))
+    return backup
+
+
+def backup_lexicon(lengths=LENGTHS):
+    """Lexicon из резервных слов заданных длин"""
+    return Lexicon(word for length in lengths for word in BACKUP_WORDS.get(length, ()))
+
+
+def generate(lexicon, per_length=16, seed=0, lengths=LENGTHS):
+    """Случайные резервные списки из полного словаря"""
+    rng = random.Random(seed)
+    backup = {}
+    for length in lengths:
+        words = lexicon.words(length)
+        backup[length] = sorted(rng.sample(words, min(per_length, len(words))))
+    return validate(backup)
+
+
+def main(argv=None):
+    from dictionary import load_lexicon
+    parser = argparse.ArgumentParser(description="Резервные словари из полного словаря")
+    parser.add_argument("--per-length", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=0)
+    options = parser.parse_args(argv)
+    backup = generate(load_lexicon(), options.per_length, options.seed)
+    print("BACKUP_WORDS = {")
+    for length, words in backup.items():
+        print(f"    {length}: {words!r},")
+    print("}")
+
+
+validate(BACKUP_WORDS)
+
+if __name__ == "__main__":
+    main()
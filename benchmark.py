@@ -0,0 +1,1100 @@
+"""Замеры производительности горячих путей игры
+
+Запуск: python benchmark.py [имя_замера ...]
+        python benchmark.py --suite [--save] [--threshold 0.25] [--large]
+
+С --suite снимается набор метрик горячих путей и сравнивается с базовой
+линией из benchmark_baseline.json; замедление больше порога считается
+регрессией, и процесс завершается с кодом 1. --save записывает текущие
+метрики как новую базовую линию. Замеры Tk идут на текущем дисплее, а без
+него — на виртуальном Xvfb, если он установлен.
+"""
+import argparse
+import bisect
+import contextlib
+import heapq
+import http.server
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tkinter as tk
+import tracemalloc
+from collections import Counter
+
+from animation import Animator
+from board import BLANK, CELL_STYLE, Board, Cell
+from cache import digest, write_cache
+from constraints import Candidates, LetterIndex
+from dafsa import Dafsa
+from dictionary import (DictionaryLoader, download_words, fetch_lexicon, load_lexicon,
+                        open_lexicon, read_json_cache, revalidate_lexicon)
+from lexicon import ALPHABET, Lexicon, encode_words
+from patterns import load_matrix
+from scoring import decode_pattern, score, score_batch
+from solver import Solver
+from synthetic import reference_check_guess, synthetic_words
+
+
+def measure(func, repeat=5):
+    """Лучшее время одного вызова func в секундах"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+@contextlib.contextmanager
+def local_server(files):
+    """Локальный HTTP-сервер, отдающий файлы {имя: байты}.
+
+    Возвращает базовый URL; заменяет GitHub при проверке загрузки словаря.
+    """
+    with tempfile.TemporaryDirectory() as root:
+        for name, data in files.items():
+            with open(os.path.join(root, name), "wb") as f:
+                f.write(data)
+
+        class Handler(http.server.SimpleHTTPRequestHandler):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, directory=root, **kwargs)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            yield f"http://127.0.0.1:{server.server_address[1]}"
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+@contextlib.contextmanager
+def stalled_server(delay=10.0):
+    """Сервер, который отправляет заголовки и зависает: имитация застрявшей загрузки"""
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Length", "1000000")
+            self.end_headers()
+            time.sleep(delay)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/words.txt"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def dictionary_file(count, seed=0):
+    """Текст словаря в формате источников: по слову на строке"""
+    rng = random.Random(seed)
+    words = synthetic_words(count, 5, seed) + [
+        "".join(rng.choice(ALPHABET) for _ in range(rng.randint(3, 12)))
+        for _ in range(count * 4)
+    ]
+    rng.shuffle(words)
+    return "\n".join(w.upper() if i % 7 == 0 else w for i, w in enumerate(words)).encode("utf-8")
+
+
+def bench_download():
+    """Потоковая загрузка словаря с локального сервера: время и пик памяти"""
+    for count in (10_000, 100_000):
+        files = {"a.txt": dictionary_file(count, seed=1), "b.txt": dictionary_file(count, seed=2)}
+        size = sum(len(data) for data in files.values())
+        with local_server(files) as base:
+            urls = [f"{base}/a.txt", f"{base}/b.txt"]
+            tracemalloc.start()
+            start = time.perf_counter()
+            words = download_words(urls)
+            elapsed = time.perf_counter() - start
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        print(f"{size / 2**20:6.1f} МБ: {len(words)} слов за {elapsed * 1000:7.1f} мс, "
+              f"пик памяти сверх результата {(peak - current) / 2**20:5.2f} МБ")
+
+
+STARTUP_JSON = """
+import json, time
+from benchmark import peak_rss_kb
+
+start = time.perf_counter()
+from lexicon import Lexicon
+with open({path!r}, encoding="utf-8") as f:
+    shards = json.load(f)
+lexicon = Lexicon(word for words in shards.values() for word in words)
+lexicon.random_answer(5)
+print(time.perf_counter() - start, peak_rss_kb())
+"""
+
+STARTUP_BINARY = """
+import time
+from benchmark import peak_rss_kb
+
+start = time.perf_counter()
+from cache import open_cache
+lexicon = open_cache({path!r})
+lexicon.random_answer(5)
+print(time.perf_counter() - start, peak_rss_kb())
+"""
+
+
+def peak_rss_kb():
+    """Пиковый RSS текущего процесса в КБ.
+
+    ru_maxrss на Linux наследуется от родителя через fork, поэтому сначала
+    берётся VmHWM из /proc, который сбрасывается при exec.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def drop_page_cache(path):
+    """Вытеснение файла из страничного кэша ОС для «холодного» запуска"""
+    with open(path, "rb") as f:
+        os.fsync(f.fileno())
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+
+
+def run_startup(code, path):
+    """Время загрузки словаря (мс) и пиковый RSS (МБ) в отдельном процессе"""
+    output = subprocess.run([sys.executable, "-c", code.format(path=path)],
+                            cwd=os.path.dirname(os.path.abspath(__file__)),
+                            capture_output=True, text=True, check=True).stdout
+    seconds, rss_kb = output.split()
+    return float(seconds) * 1000, int(rss_kb) / 1024
+
+
+def bench_cache():
+    """Запуск с JSON-кэшем против двоичного: холодный и тёплый старт"""
+    lexicon = Lexicon(word for length in range(4, 11)
+                      for word in synthetic_words(30_000, length, seed=length))
+    with tempfile.TemporaryDirectory() as root:
+        json_path = os.path.join(root, "words.json")
+        binary_path = os.path.join(root, "words.bin")
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump({str(n): list(lexicon.words(n)) for n in lexicon.lengths()}, f, ensure_ascii=False)
+        write_cache(binary_path, lexicon)
+        for name, code, path in (("JSON", STARTUP_JSON, json_path),
+                                 ("двоичный", STARTUP_BINARY, binary_path)):
+            drop_page_cache(path)
+            cold = run_startup(code, path)
+            warm = run_startup(code, path)
+            print(f"{name:>9} ({os.path.getsize(path) / 2**20:4.1f} МБ): "
+                  f"холодный {cold[0]:7.1f} мс / {cold[1]:5.1f} МБ, "
+                  f"тёплый {warm[0]:7.1f} мс / {warm[1]:5.1f} МБ")
+
+
+@contextlib.contextmanager
+def source_server(sources):
+    """Изменяемый источник словаря {путь: байты} с ETag и режимом обрыва.
+
+    Возвращает (базовый URL, server); server.truncate = True обрывает
+    ответы на середине, server.requests считает ответы по статусам.
+    """
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            data = sources.get(self.path)
+            if data is None:
+                self.send_error(404)
+                return
+            etag = f'"{digest(data).hex()}"'
+            if self.headers.get("If-None-Match") == etag:
+                server.requests[304] += 1
+                self.send_response(304)
+                self.end_headers()
+                return
+            server.requests[200] += 1
+            self.send_response(200)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data[:len(data) // 2] if server.truncate else data)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.truncate = False
+    server.requests = Counter()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}", server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def bench_revalidate():
+    """Кэш и проверка обновлений на локальном источнике: свежий, изменённый, обрыв, сбой"""
+    sources = {"/a.txt": dictionary_file(20_000, seed=1), "/b.txt": dictionary_file(20_000, seed=2)}
+    with source_server(sources) as (base, server), tempfile.TemporaryDirectory() as root:
+        urls = [f"{base}/a.txt", f"{base}/b.txt"]
+        cache_file = os.path.join(root, "words.bin")
+
+        def timed(func):
+            start = time.perf_counter()
+            result = func()
+            return result, (time.perf_counter() - start) * 1000
+
+        def report(name, result, elapsed):
+            state = "обновлён" if result is not None else "оставлен прежний"
+            print(f"{name:>22}: {elapsed:7.1f} мс, кэш {state}, "
+                  f"ответов 200/304: {server.requests[200]}/{server.requests[304]}, "
+                  f"в кэше {len(open_lexicon(cache_file, []))} слов")
+            server.requests.clear()
+
+        report("первая загрузка", *timed(lambda: fetch_lexicon(cache_file, urls)))
+        stale, elapsed = timed(lambda: open_lexicon(cache_file, []))
+        print(f"{'старый кэш до проверки':>22}: {elapsed:7.1f} мс, {len(stale)} слов")
+        report("без изменений", *timed(lambda: revalidate_lexicon(cache_file, urls)))
+
+        sources["/b.txt"] += "\nновоеслово".encode("utf-8")
+        server.truncate = True
+        report("обрыв ответа", *timed(lambda: revalidate_lexicon(cache_file, urls)))
+        server.truncate = False
+        report("источник изменён", *timed(lambda: revalidate_lexicon(cache_file, urls)))
+
+    # Сервер уже остановлен
+    with tempfile.TemporaryDirectory() as root:
+        cache_file = os.path.join(root, "words.bin")
+        write_cache(cache_file, Lexicon(synthetic_words(1000, 5)),
+                    {"sources": {url: {"etag": '"x"'} for url in urls}})
+        result, elapsed = timed(lambda: revalidate_lexicon(cache_file, urls))
+        print(f"{'сервер недоступен':>22}: {elapsed:7.1f} мс, кэш "
+              f"{'обновлён' if result is not None else 'оставлен прежний'}, "
+              f"в кэше {len(open_lexicon(cache_file, []))} слов")
+
+
+def bench_startup():
+    """Запуск без кэша при зависшем источнике: до первого кадра и до игры"""
+    from engine import Game
+    with stalled_server() as url, tempfile.TemporaryDirectory() as root:
+        cache_file = os.path.join(root, "words.bin")
+        start = time.perf_counter()
+        load_lexicon(cache_file, [url], json_caches=[])
+        blocking = time.perf_counter() - start
+
+        start = time.perf_counter()
+        loader = DictionaryLoader(cache_file, [url]).start()
+        lexicon = Lexicon(synthetic_words(30, 5))
+        Game(lexicon, 5, index=LetterIndex(lexicon.words(5)))
+        background = time.perf_counter() - start
+        print(f"до начала игры: блокирующая загрузка {blocking * 1000:7.1f} мс, "
+              f"фоновая {background * 1000:5.2f} мс (загрузка завершена: {loader.ready()})")
+
+        try:
+            root_window = tk.Tk()
+        except tk.TclError:
+            print("первый кадр: нет дисплея, замер пропущен")
+            return
+        import importlib
+        wordle = importlib.import_module("wordle")
+        wordle.open_lexicon = lambda: None
+        wordle.DictionaryLoader = lambda **options: DictionaryLoader(cache_file, [url], **options)
+        view = wordle.WordleGame(root_window)
+        while view.time_to_first_frame is None:
+            root_window.update()
+        print(f"первый кадр wordle.py: {view.time_to_first_frame * 1000:.1f} мс")
+        root_window.destroy()
+
+
+def bench_scoring():
+    """Скорость оценки: исходная проверка против score_batch (сверка — tests/test_scoring.py)"""
+    targets = synthetic_words(20_000, 5)
+    codes = encode_words(targets)
+    encoded = [codes[i:i + 5] for i in range(0, len(codes), 5)]
+    guesses = targets[:20]
+    reference = measure(lambda: [reference_check_guess(g, t) for g in guesses[:2] for t in targets], repeat=1)
+    batch_str = measure(lambda: [score_batch(g, targets) for g in guesses], repeat=1)
+    batch_codes = measure(lambda: [score_batch(encode_words([g]), encoded) for g in guesses], repeat=1)
+    pairs = len(targets)
+    print(f"исходная проверка {pairs * 2 / reference / 1e6:5.2f} млн пар/с, "
+          f"score_batch по строкам {pairs * len(guesses) / batch_str / 1e6:5.2f} млн пар/с, "
+          f"по кодам {pairs * len(guesses) / batch_codes / 1e6:5.2f} млн пар/с")
+
+
+def bench_patterns():
+    """Сборка матрицы шаблонов в пуле процессов и чтение строк из неё"""
+    for length, count in ((5, 2_000), (6, 2_000)):
+        lexicon = Lexicon(synthetic_words(count, length, seed=length))
+        with tempfile.TemporaryDirectory() as root:
+            start = time.perf_counter()
+            matrix = load_matrix(lexicon, length, root)
+            build = time.perf_counter() - start
+            rows = measure(lambda: [sum(matrix.row(i)) for i in range(0, count, 10)])
+            size = os.path.getsize(matrix_path_in(root))
+            del matrix
+        print(f"{length} букв, {count} слов: сборка {build:5.2f} с "
+              f"({count * count / build / 1e6:4.2f} млн пар/с), файл {size / 2**20:5.1f} МБ, "
+              f"строка {rows / (count // 10) * 1e6:6.1f} мкс")
+
+
+def matrix_path_in(directory):
+    """Единственный файл матрицы в каталоге"""
+    return next(os.path.join(directory, name) for name in os.listdir(directory))
+
+
+def bench_constraints():
+    """Сужение кандидатов битсетами против перебора всех слов"""
+    for size in (10_000, 100_000):
+        words = synthetic_words(size, 5)
+        start = time.perf_counter()
+        index = LetterIndex(words)
+        build = time.perf_counter() - start
+        guess, target = words[1], words[size // 2]
+        pattern = score(guess, target)
+
+        def update():
+            candidates = Candidates(index)
+            candidates.update(guess, pattern)
+            return candidates.count()
+
+        bitset = measure(update)
+        rescan = measure(lambda: sum(score(guess, w) == pattern for w in words), repeat=1)
+        print(f"{size:>8} слов: индекс {build * 1000:6.0f} мс, попытка {bitset * 1e6:7.1f} мкс "
+              f"(перебор {rescan * 1000:6.1f} мс)")
+
+
+def bench_solver():
+    """Время подсказки при разном числе оставшихся кандидатов"""
+    for length in (5, 6):
+        index = LetterIndex(synthetic_words(20_000, length, seed=length))
+        with tempfile.TemporaryDirectory() as root:
+            openers_file = os.path.join(root, "openers.json")
+            solver = Solver(index, openers_file=openers_file)
+            start = time.perf_counter()
+            solver.opener()
+            first = time.perf_counter() - start
+            cached = measure(lambda: Solver(index, openers_file=openers_file).opener())
+            print(f"{length} букв: первая попытка {first * 1000:7.0f} мс, из файла {cached * 1000:5.1f} мс")
+            rng = random.Random(length)
+            for size in (10, 100, 1_000, 10_000, len(index.words) - 1):
+                candidates = Candidates(index)
+                candidates.mask = sum(1 << i for i in rng.sample(range(len(index.words)), size))
+                solver._memo.clear()
+                start = time.perf_counter()
+                solver.best_guess(candidates)
+                print(f"{size:>8} кандидатов: {(time.perf_counter() - start) * 1000:6.1f} мс")
+
+
+ENGINE_IMPORT = """
+import time
+start = time.perf_counter()
+import engine
+elapsed = time.perf_counter() - start
+print(elapsed)
+"""
+
+
+def bench_engine():
+    """Импорт игровой логики и память на одну партию"""
+    output = subprocess.run([sys.executable, "-c", ENGINE_IMPORT],
+                            cwd=os.path.dirname(os.path.abspath(__file__)),
+                            capture_output=True, text=True, check=True).stdout
+    print(f"импорт engine: {float(output) * 1000:5.1f} мс")
+
+    from engine import Game
+    lexicon = Lexicon(synthetic_words(10_000, 5))
+    words = lexicon.words(5)
+    index = LetterIndex(words)
+    rng = random.Random(0)
+    count = 10_000
+    tracemalloc.start()
+    games = []
+    for _ in range(count):
+        game = Game(lexicon, 5, index=index, rng=rng)
+        for guess in rng.sample(words, 3):
+            game.current = guess
+            game.submit()
+        games.append(game)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"партия после 3 попыток: {current / count:6.0f} байт")
+
+
+class HeadlessRoot:
+    """Минимальный цикл событий с after/after_cancel вместо Tk"""
+
+    def __init__(self):
+        self._timers = []
+        self._counter = 0
+
+    def after(self, delay, callback):
+        self._counter += 1
+        heapq.heappush(self._timers, (time.monotonic() + delay / 1000, self._counter, callback))
+        return self._counter
+
+    def after_cancel(self, after_id):
+        self._timers = [timer for timer in self._timers if timer[1] != after_id]
+        heapq.heapify(self._timers)
+
+    def run(self):
+        while self._timers:
+            due, _, callback = heapq.heappop(self._timers)
+            time.sleep(max(0.0, due - time.monotonic()))
+            callback()
+
+
+class HeadlessCell:
+    """Виджет, который только считает вызовы config"""
+
+    calls = 0
+
+    def config(self, **options):
+        HeadlessCell.calls += 1
+
+    def grid_configure(self, **options):
+        HeadlessCell.calls += 1
+
+
+def bench_animation():
+    """Кадры анимаций без дисплея: опоздание, стоимость кадра, объединение вызовов"""
+    root = HeadlessRoot()
+    animator = Animator(root)
+    rows = [[HeadlessCell() for _ in range(6)] for _ in range(6)]
+    end = 0
+    for row in rows:
+        end = animator.reveal(row, ["green"] * 6, start=end)
+    end = animator.flash(rows[-1], "green", start=end)
+    animator.shake(rows[0])
+    animator.shake(rows[0], start=5)  # попадает в те же кадры, что и первая тряска
+    scheduled = 6 * 6 + 6 * 6 + 2 * 6 * 6
+    start = time.perf_counter()
+    root.run()
+    elapsed = time.perf_counter() - start
+    lateness = sorted(frame[0] for frame in animator.frames)
+    cost = sorted(frame[1] for frame in animator.frames)
+    print(f"{len(animator.frames)} кадров за {elapsed * 1000:.0f} мс (план {end} мс), "
+          f"опоздание p50 {lateness[len(lateness) // 2]:.2f} мс / max {lateness[-1]:.2f} мс, "
+          f"кадр max {cost[-1]:.3f} мс, вызовов config {HeadlessCell.calls} из {scheduled}")
+
+
+def rebuild_grid(root, rows, cols):
+    """Прежний способ смены экрана: уничтожение всех виджетов и новая сетка"""
+    for widget in root.winfo_children():
+        widget.destroy()
+    frame = tk.Frame(root)
+    frame.pack()
+    for row in range(rows):
+        for col in range(cols):
+            tk.Label(frame, **CELL_STYLE, **BLANK).grid(row=row, column=col, padx=3, pady=3)
+
+
+def bench_board():
+    """Новая партия и смена длины: пересоздание сетки против пула клеток"""
+    # Без дисплея: сколько вызовов config нужно, чтобы очистить поле после партии
+    rows = [[Cell(HeadlessCell(), BLANK) for _ in range(5)] for _ in range(6)]
+    for cell in rows[0] + rows[1] + rows[2]:
+        cell.config(text="А", bg="#6aaa64", fg="white")
+    Cell.updates = 0
+    for row in rows:
+        for cell in row:
+            cell.config(**BLANK)
+    print(f"очистка поля после трёх попыток: {Cell.updates} вызовов config из {6 * 5}")
+
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        print("пересоздание виджетов: нет дисплея, замер пропущен")
+        return
+    lengths = [5, 6] * 10
+    start = time.perf_counter()
+    for length in lengths:
+        rebuild_grid(root, 6, length)
+        root.update()
+    rebuild = (time.perf_counter() - start) / len(lengths)
+    for widget in root.winfo_children():
+        widget.destroy()
+
+    board = Board(root, 6, 5)
+    board.frame.pack()
+    start = time.perf_counter()
+    for length in lengths:
+        board.fill(0, "столбы"[:length])
+        board.resize(6, length)
+        root.update()
+    pooled = (time.perf_counter() - start) / len(lengths)
+    print(f"смена длины: пересоздание {rebuild * 1000:6.2f} мс, пул клеток {pooled * 1000:6.2f} мс")
+    root.destroy()
+
+
+def bench_multi():
+    """Несколько полей: оценка попытки по всем словам и перерисовка по числу полей"""
+    from engine import MultiGame
+    words = synthetic_words(5_000, 6, seed=5)
+    lexicon = Lexicon(words)
+    lexicon.automaton(6)
+    guesses = words[:200]
+    for count in (1, 4, 8, 16, 64):
+        targets = words[-count:]
+        loop_time = measure(lambda: [[reference_check_guess(g, t) for t in targets]
+                                     for g in guesses], repeat=3) / len(guesses)
+        batch_time = measure(lambda: [score_batch(g, targets) for g in guesses]) / len(guesses)
+
+        # Перерисовка без дисплея: клетки считают вызовы config, анимация идёт кадрами
+        game = MultiGame(lexicon, 6, count, targets=targets)
+        rows = [[[Cell(HeadlessCell(), BLANK) for _ in range(6)] for _ in range(game.max_attempts)]
+                for _ in range(count)]
+        root = HeadlessRoot()
+        animator = Animator(root)
+
+        def on_event(event, payload):
+            if event == "letter_added":
+                row, col, letter = payload
+                for number, board in enumerate(game.boards):
+                    if not board.finished:
+                        rows[number][row][col].config(text=letter)
+            elif event == "board_event" and payload[1] == "guess_scored":
+                number, _, result = payload
+                animator.reveal(rows[number][result.row], decode_pattern(result.pattern, 6))
+
+        game.subscribe(on_event)
+        HeadlessCell.calls = 0
+        start = time.perf_counter()
+        for letter in guesses[0]:
+            game.add_letter(letter)
+        game.submit()
+        submit_time = time.perf_counter() - start
+        root.run()
+        cost = max(frame[1] for frame in animator.frames)
+        print(f"{count:>3} полей: оценка циклом {loop_time * 1e6:8.1f} мкс, score_batch "
+              f"{batch_time * 1e6:7.1f} мкс; ввод и отправка {submit_time * 1000:6.2f} мс, "
+              f"вызовов config {HeadlessCell.calls}, кадр max {cost:.3f} мс")
+
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        print("перерисовка в Tk: нет дисплея, замер пропущен")
+        return
+    import importlib
+    view_module = importlib.import_module("wordle_multi")
+    view_module.open_lexicon = lambda: lexicon
+    view = view_module.MultiWordleGame(root)
+    view.count.set(16)
+    view.word_length.set(6)
+    view.new_game()
+    root.update()
+    start = time.perf_counter()
+    for letter in guesses[0]:
+        view.game.add_letter(letter)
+    view.game.submit()
+    root.update()
+    typed = time.perf_counter() - start
+    while view.animator.busy():
+        root.update()
+    cost = sorted(frame[1] for frame in view.animator.frames)
+    print(f"16 полей по 6 букв в Tk: ввод и отправка {typed * 1000:.1f} мс, "
+          f"кадр p50 {cost[len(cost) // 2]:.2f} мс / max {cost[-1]:.2f} мс")
+    root.destroy()
+
+
+def bench_adversarial():
+    """Режим Absurdle: разбиение всего словаря по шаблонам на первой попытке"""
+    from engine import AdversarialGame
+    from partition import Partitioner
+    lexicon = open_lexicon()
+    if lexicon is not None and all(map(lexicon.words, (5, 6))):
+        print("словарь из кэша")
+        lists = {length: lexicon.words(length) for length in (5, 6)}
+    else:
+        print("кэша нет: синтетические списки размера полного словаря")
+        lists = {5: synthetic_words(15_000, 5, seed=7), 6: synthetic_words(25_000, 6, seed=8)}
+    lists[7] = synthetic_words(100_000, 7, seed=9)  # запас по размеру
+    for length, words in lists.items():
+        start = time.perf_counter()
+        partitioner = Partitioner(words)
+        build_time = time.perf_counter() - start
+        guesses = words[::max(1, len(words) // 20)][:20]
+        loop_time = measure(lambda: [Counter(score_batch(g, words)) for g in guesses],
+                            repeat=1) / len(guesses)
+        lanes_time = measure(lambda: [partitioner.counts(partitioner.patterns(g))
+                                      for g in guesses]) / len(guesses)
+
+        game = AdversarialGame(Lexicon(words), length, partitioner=partitioner)
+        turns = []
+        for guess in guesses[:game.max_attempts]:
+            start = time.perf_counter()
+            game.check(guess)
+            turns.append((time.perf_counter() - start) * 1000)
+        print(f"{length} букв, {len(words):>6} слов: Partitioner {build_time * 1000:6.1f} мс; "
+              f"первая попытка score_batch+Counter {loop_time * 1000:6.2f} мс, "
+              f"дорожки {lanes_time * 1000:5.2f} мс; ходы партии "
+              + " ".join(f"{t:.2f}" for t in turns) + f" мс, осталось {len(game.remaining())}")
+
+
+METRICS_SESSION = """
+import metrics
+from cache import open_cache, write_cache
+from dictionary import download_words
+from lexicon import Lexicon
+
+with metrics.session():
+    lexicon = Lexicon(download_words({urls!r}))
+    write_cache({path!r}, lexicon)
+    open_cache({path!r}).words(5)
+"""
+
+
+def bench_metrics():
+    """Замеры этапов: цена выключенных и включённых хуков, сеанс с дампом и cProfile"""
+    import pstats
+    import metrics
+
+    def phase():
+        pass
+
+    metrics.disable()
+    calls = 100_000
+    bare = measure(lambda: [phase() for _ in range(calls)]) / calls
+    disabled = {
+        "record": measure(lambda: [metrics.record("bench", 0.0) for _ in range(calls)]) / calls,
+        "span": measure(lambda: [metrics.span("bench") for _ in range(calls)]) / calls,
+    }
+    metrics.enable(size=1000)
+    wrapped = metrics.timed("bench")(phase)
+    enabled = measure(lambda: [wrapped() for _ in range(calls)]) / calls - bare
+    metrics.disable()
+    for name, cost in disabled.items():
+        print(f"выключено: {name} {cost * 1e9:5.0f} нс на вызов")
+    print(f"включено: timed добавляет {enabled * 1e9:5.0f} нс к вызову")
+
+    files = {"a.txt": dictionary_file(100_000, seed=1), "b.txt": dictionary_file(100_000, seed=2)}
+    with local_server(files) as base, tempfile.TemporaryDirectory() as root:
+        dump, profile = os.path.join(root, "metrics.prom"), os.path.join(root, "session.prof")
+        env = dict(os.environ, **{metrics.ENV_METRICS: dump, metrics.ENV_PROFILE: profile})
+        code = METRICS_SESSION.format(urls=[f"{base}/a.txt", f"{base}/b.txt"],
+                                      path=os.path.join(root, "words.bin"))
+        subprocess.run([sys.executable, "-c", code], env=env, check=True,
+                       cwd=os.path.dirname(os.path.abspath(__file__)))
+        with open(dump, encoding="utf-8") as f:
+            print(f.read(), end="")
+        print("cProfile, самые долгие функции:")
+        pstats.Stats(profile).sort_stats("cumulative").print_stats(5)
+
+
+def bench_gamelog():
+    """Журнал партий: дописывание, открытие и статистика по миллионам записей"""
+    from engine import Game
+    from gamelog import HEADER, MAGIC, RECORD, VERSION, GameLog, pack_game
+    lexicon = Lexicon(synthetic_words(5_000, 5, seed=4))
+    words = lexicon.words(5)
+    rng = random.Random(0)
+    games = []
+    for _ in range(1_000):
+        game = Game(lexicon, 5, rng=rng)
+        while not game.finished:
+            game.current = game.target if rng.random() < 0.25 else rng.choice(words)
+            game.submit()
+        games.append(game)
+    block = b"".join(pack_game(game, 60.0) for game in games)
+
+    with tempfile.TemporaryDirectory() as root:
+        log = GameLog(os.path.join(root, "games.log"))
+        append = measure(lambda: log.append(games[0], 60.0), repeat=20)
+        print(f"дописывание партии: {append * 1e6:6.1f} мкс")
+        for count in (100_000, 1_000_000, 3_000_000):
+            with open(log.path, "wb") as f:
+                f.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+                for _ in range(count // len(games)):
+                    f.write(block)
+            opened = measure(lambda: log.records(), repeat=3)
+            summary = measure(lambda: log.stats(hardest=0), repeat=3)
+            full = measure(lambda: log.stats(), repeat=3)
+            print(f"{count:>9} партий ({count * RECORD.size / 2**20:5.0f} МБ): открытие "
+                  f"{opened * 1000:5.2f} мс, побед, серии и распределение "
+                  f"{summary * 1000:6.1f} мс, с трудными словами {full * 1000:6.0f} мс")
+
+
+def bench_lengths():
+    """Режимы 4–10 букв: первая смена режима и память по мере загрузки шардов"""
+    from backup_words import LENGTHS
+    from cache import open_cache
+    from engine import Game
+    words = [w for length in LENGTHS for w in synthetic_words(20_000, length, seed=length)]
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, "words.bin")
+        write_cache(path, Lexicon(words))
+        start = time.perf_counter()
+        lexicon = open_cache(path)
+        counted = all(map(lexicon.count, LENGTHS))
+        opened = time.perf_counter() - start
+        print(f"открытие и проверка всех длин без декодирования: {opened * 1000:5.2f} мс, "
+              f"шарды есть: {counted}")
+        # В потоке Tk при смене режима только декодируется шард и создаётся
+        # партия; индекс и автомат строятся в фоне
+        switches = {}
+        for length in LENGTHS:
+            start = time.perf_counter()
+            Game(lexicon, length)
+            first = time.perf_counter() - start
+            start = time.perf_counter()
+            index = LetterIndex(lexicon.words(length))
+            lexicon.automaton(length)
+            switches[length] = (first, time.perf_counter() - start,
+                                measure(lambda: Game(lexicon, length, index=index)))
+
+        # Память отдельным проходом: tracemalloc замедляет сборку индексов
+        tracemalloc.start()
+        lexicon = open_cache(path)
+        base = tracemalloc.get_traced_memory()[0]
+        indexes = {}
+        for length in LENGTHS:
+            indexes[length] = LetterIndex(lexicon.words(length))
+            current = tracemalloc.get_traced_memory()[0]
+            first, background, repeat = switches[length]
+            print(f"{length:2} букв: первая смена режима {first * 1000:6.1f} мс "
+                  f"(в фоне ещё {background * 1000:6.1f} мс), повторная {repeat * 1000:6.3f} мс, "
+                  f"загружено {(current - base) / 2**20:5.1f} МБ")
+        tracemalloc.stop()
+
+
+def bench_lexicon():
+    """Проверка слова в словаре: список против Lexicon"""
+    for size in (1_000, 10_000, 100_000):
+        words = synthetic_words(size, 5)
+        lexicon = Lexicon(words)
+        probes = words[::max(1, size // 100)] + synthetic_words(100, 5, seed=1)
+
+        list_time = measure(lambda: [p in words for p in probes], repeat=3)
+        lexicon_time = measure(lambda: [lexicon.contains(p) for p in probes])
+        print(f"{size:>8} слов: список {list_time / len(probes) * 1e6:9.2f} мкс, "
+              f"Lexicon {lexicon_time / len(probes) * 1e6:6.3f} мкс")
+
+
+def allocated(build):
+    """Результат build() и объём выделенной под него памяти (байты)"""
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def bench_dafsa():
+    """Словарь как список, множество и DAFSA: память, проверка слова и префикса"""
+    for size in (10_000, 100_000):
+        source = synthetic_words(size, 6, seed=3)
+        words, list_bytes = allocated(lambda: ["".join(word) for word in source])
+        word_set, set_bytes = allocated(lambda: set(["".join(word) for word in source]))
+        prefixes, prefix_bytes = allocated(
+            lambda: {word[:k] for word in source for k in range(1, 7)})
+        automaton, dafsa_bytes = allocated(lambda: Dafsa(source))
+        build = measure(lambda: Dafsa(source), repeat=1)
+        print(f"{size:>7} слов: список {list_bytes / 2**20:5.1f} МБ, множество "
+              f"{set_bytes / 2**20:5.1f} МБ, множество префиксов {prefix_bytes / 2**20:5.1f} МБ, "
+              f"DAFSA {dafsa_bytes / 2**20:5.2f} МБ ({automaton.nodes()} узлов, "
+              f"постройка {build * 1000:.0f} мс)")
+
+        probes = source[::max(1, size // 200)] + synthetic_words(200, 6, seed=4)
+        starts = [probe[:3] for probe in probes]
+
+        def list_prefix(prefix):
+            i = bisect.bisect_left(words, prefix)
+            return i < len(words) and words[i].startswith(prefix)
+
+        rows = [
+            ("список", lambda: [p in words for p in probes[:20]], 20,
+             lambda: [list_prefix(p) for p in starts], "bisect"),
+            ("множество", lambda: [p in word_set for p in probes], len(probes),
+             lambda: [p in prefixes for p in starts], "префиксы"),
+            ("DAFSA", lambda: [automaton.contains(p) for p in probes], len(probes),
+             lambda: [automaton.has_prefix(p) for p in starts], ""),
+        ]
+        for name, lookup, count, prefix_lookup, note in rows:
+            lookup_time = measure(lookup, repeat=3) / count
+            prefix_time = measure(prefix_lookup) / len(starts)
+            print(f"  {name:>10}: слово {lookup_time * 1e6:9.3f} мкс, "
+                  f"префикс {prefix_time * 1e6:6.3f} мкс {note}")
+
+
+BENCHMARKS = {
+    "lexicon": bench_lexicon,
+    "dafsa": bench_dafsa,
+    "download": bench_download,
+    "cache": bench_cache,
+    "startup": bench_startup,
+    "revalidate": bench_revalidate,
+    "scoring": bench_scoring,
+    "patterns": bench_patterns,
+    "constraints": bench_constraints,
+    "solver": bench_solver,
+    "engine": bench_engine,
+    "animation": bench_animation,
+    "board": bench_board,
+    "multi": bench_multi,
+    "adversarial": bench_adversarial,
+    "metrics": bench_metrics,
+    "gamelog": bench_gamelog,
+    "lengths": bench_lengths,
+}
+
+
+# Набор метрик для сравнения с базовой линией. Каждая функция возвращает
+# {метрика: секунды}; базовая линия — такой же словарь в BASELINE_FILE.
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+THRESHOLD = 0.25
+SUITE_SIZES = (1_000, 10_000, 100_000)
+LARGE_SIZES = (1_000_000,)
+
+
+@contextlib.contextmanager
+def virtual_display():
+    """Дисплей для замеров Tk: текущий, а без него — Xvfb, если он установлен.
+
+    Возвращает имя дисплея или None, если дисплея нет.
+    """
+    if os.environ.get("DISPLAY"):
+        yield os.environ["DISPLAY"]
+        return
+    if shutil.which("Xvfb") is None:
+        yield None
+        return
+    display = f":{random.randint(100, 999)}"
+    server = subprocess.Popen(["Xvfb", display, "-screen", "0", "1024x768x24", "-nolisten", "tcp"],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.environ["DISPLAY"] = display
+    try:
+        for _ in range(50):
+            try:
+                tk.Tk().destroy()
+                break
+            except tk.TclError:
+                time.sleep(0.1)
+        yield display
+    finally:
+        del os.environ["DISPLAY"]
+        server.terminate()
+        server.wait()
+
+
+def suite_scoring(sizes):
+    """Оценка попытки: одна пара через score и список целей через score_batch"""
+    targets = synthetic_words(20_000, 5)
+    guesses = synthetic_words(10, 5, seed=3, letters=ALPHABET[:8])
+    pairs = len(targets) * len(guesses)
+    return {
+        "score.pair": measure(lambda: [score(g, t) for g in guesses for t in targets],
+                              repeat=9) / pairs,
+        "score_batch.pair": measure(lambda: [score_batch(g, targets) for g in guesses],
+                                    repeat=9) / pairs,
+    }
+
+
+def suite_membership(sizes):
+    """Проверка попытки при отправке (Game.validate) на словарях разного размера"""
+    from engine import Game
+    results = {}
+    for size in sizes:
+        words = synthetic_words(size, 5)
+        lexicon = Lexicon(words)
+        game = Game(lexicon, 5, target=words[0])
+        probes = (words[::max(1, size // 500)] + synthetic_words(500, 5, seed=1)) * 10
+        game.validate(probes[0])  # автомат строится при первой проверке
+        results[f"validate.{size}"] = measure(lambda: [game.validate(p) for p in probes],
+                                              repeat=15) / len(probes)
+    return results
+
+
+def suite_load(sizes):
+    """Загрузка словаря: с локального сервера без кэша, из двоичного кэша и из JSON"""
+    results = {}
+    for size in sizes:
+        files = {"a.txt": dictionary_file(size, seed=1)}
+        with local_server(files) as base, tempfile.TemporaryDirectory() as root:
+            cache_file = os.path.join(root, "words.bin")
+            json_file = os.path.join(root, "words.json")
+            cold = measure(lambda: fetch_lexicon(cache_file, [f"{base}/a.txt"]), repeat=3)
+            warm = measure(lambda: open_lexicon(cache_file, []).random_answer(5), repeat=15)
+            lexicon = open_lexicon(cache_file, [])
+            with open(json_file, "w", encoding="utf-8") as f:
+                json.dump({length: list(lexicon.words(length)) for length in lexicon.lengths()},
+                          f, ensure_ascii=False)
+            parse = measure(lambda: read_json_cache(json_file), repeat=7)
+        results.update({f"load.cold.{size}": cold, f"load.warm.{size}": warm,
+                        f"json.parse.{size}": parse})
+    return results
+
+
+VIEW_IMPORT = """
+import importlib.util, time
+start = time.perf_counter()
+spec = importlib.util.spec_from_file_location("view", {path!r})
+spec.loader.exec_module(importlib.util.module_from_spec(spec))
+print(time.perf_counter() - start)
+"""
+
+VIEW_STARTUP = """
+import importlib.util, time
+start = time.perf_counter()
+import tkinter as tk
+spec = importlib.util.spec_from_file_location("view", {path!r})
+view = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(view)
+view.open_lexicon = lambda: None
+# Загрузчик без источников сразу завершается и не трогает сеть и кэш
+Loader = view.DictionaryLoader
+view.DictionaryLoader = lambda **options: Loader(urls=[], **options)
+root = tk.Tk()
+game = view.WordleGame(root)
+while game.time_to_first_frame is None:
+    root.update()
+print(time.perf_counter() - start)
+root.destroy()
+"""
+
+
+def run_view(code, name):
+    """Время (с), которое печатает code для файла игры name в отдельном процессе"""
+    directory = os.path.dirname(os.path.abspath(__file__))
+    path = os.path.join(directory, name)
+    output = subprocess.run([sys.executable, "-c", code.format(path=path)], cwd=directory,
+                            capture_output=True, text=True, check=True).stdout
+    return float(output.split()[-1])
+
+
+def suite_startup(sizes):
+    """Импорт и запуск до первого кадра обоих вариантов игры"""
+    results = {}
+    for name in ("wordle.py", "wordle_5-6.py"):
+        results[f"import.{name}"] = min(run_view(VIEW_IMPORT, name) for _ in range(3))
+        if os.environ.get("DISPLAY"):
+            results[f"startup.{name}"] = min(run_view(VIEW_STARTUP, name) for _ in range(3))
+    return results
+
+
+def suite_board(sizes):
+    """Построение поля 6 × 5 и смена длины слова в Tk"""
+    if not os.environ.get("DISPLAY"):
+        return {}
+    root = tk.Tk()
+
+    def build():
+        board = Board(root, 6, 5)
+        board.frame.pack()
+        root.update()
+        board.frame.destroy()
+
+    board = Board(root, 6, 5)
+    board.frame.pack()
+
+    def resize():
+        for length in (6, 5):
+            board.resize(6, length)
+            root.update()
+
+    results = {"board.build": measure(build), "board.resize": measure(resize) / 2}
+    root.destroy()
+    return results
+
+
+SUITE = (suite_scoring, suite_membership, suite_load, suite_startup, suite_board)
+
+
+def run_suite(sizes, rounds):
+    """Все метрики набора, лучшее из rounds прогонов; без дисплея метрики Tk пропускаются.
+
+    Прогоны целиком повторяются, чтобы случайная нагрузка на машину в один
+    момент не выглядела как регрессия.
+    """
+    results = {}
+    with virtual_display() as display:
+        if display is None:
+            print("нет дисплея и Xvfb: замеры Tk пропущены")
+        for _ in range(rounds):
+            for suite in SUITE:
+                for name, seconds in suite(sizes).items():
+                    results[name] = min(seconds, results.get(name, seconds))
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Печать метрик и отличий от базовой линии; возвращает список регрессий"""
+    regressions = []
+    for name, seconds in results.items():
+        line = f"{name:<28} {seconds * 1e6:12.3f} мкс"
+        if name in baseline:
+            change = seconds / baseline[name] - 1
+            line += f"  {change:+7.1%}"
+            if change > threshold:
+                line += "  РЕГРЕССИЯ"
+                regressions.append(name)
+        print(line)
+    return regressions
+
+
+def suite_main(save, threshold, large, rounds):
+    sizes = SUITE_SIZES + (LARGE_SIZES if large else ())
+    results = run_suite(sizes, rounds)
+    baseline = {}
+    if os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE, encoding="utf-8") as f:
+            saved = json.load(f)
+        if saved.get("python") != sys.version.split()[0]:
+            print(f"базовая линия снята на Python {saved.get('python')}: сравнение приблизительное")
+        baseline = saved["metrics"]
+    regressions = compare(results, baseline, threshold)
+    if save:
+        with open(BASELINE_FILE, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "metrics": results}, f, indent=1)
+        print(f"базовая линия сохранена в {BASELINE_FILE}")
+    elif regressions:
+        print(f"медленнее базовой линии больше чем на {threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Замеры производительности игры")
+    parser.add_argument("names", nargs="*", help="отдельные замеры (по умолчанию все): "
+                        + ", ".join(BENCHMARKS))
+    parser.add_argument("--suite", action="store_true",
+                        help="набор метрик со сравнением с базовой линией")
+    parser.add_argument("--save", action="store_true", help="сохранить метрики как базовую линию")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help="допустимое замедление относительно базовой линии (доля)")
+    parser.add_argument("--rounds", type=int, default=3, help="число прогонов набора")
+    parser.add_argument("--large", action="store_true",
+                        help="добавить синтетический словарь из миллиона слов")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"нет замеров: {', '.join(unknown)}")
+    if args.suite:
+        return suite_main(args.save, args.threshold, args.large, args.rounds)
+    with virtual_display():
+        for name in args.names or BENCHMARKS:
+            print(f"== {name}")
+            BENCHMARKS[name]()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
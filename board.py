@@ -0,0 +1,99 @@
+"""Игровое поле с переиспользуемыми клетками
+
+Клетки создаются один раз и хранятся в пуле: при смене длины слова
+лишние убираются из сетки через grid_remove, недостающие добавляются, а
+при новой игре поле не пересоздаётся. Каждая клетка помнит свои текст и
+цвета, поэтому config вызывается только для того, что действительно
+изменилось. Animator работает с клетками Cell так же, как с виджетами.
+"""
+import tkinter as tk
+
+BLANK = {"text": "", "bg": "white", "fg": "black"}
+CELL_STYLE = {"width": 3, "height": 1, "font": ("Arial", 20),
+              "relief": "solid", "borderwidth": 1}
+PAD = 3
+
+
+class Cell:
+    """Клетка поля: виджет и последние применённые к нему параметры.
+
+    updates — общее число вызовов config у виджетов (для замеров).
+    """
+
+    __slots__ = ("widget", "state", "position")
+    updates = 0
+
+    def __init__(self, widget, state):
+        self.widget = widget
+        self.state = dict(state)
+        self.position = None
+
+    def config(self, **options):
+        """Применение только изменившихся параметров; возвращает их число"""
+        changed = {key: value for key, value in options.items()
+                   if self.state.get(key) != value}
+        if changed:
+            Cell.updates += 1
+            self.widget.config(**changed)
+            self.state.update(changed)
+        return len(changed)
+
+    configure = config
+
+    def grid_configure(self, **options):
+        self.widget.grid_configure(**options)
+
+
+class Board:
+    """Сетка rows × cols клеток внутри frame.
+
+    cells — видимые клетки по строкам; font и pad задают размер клеток,
+    например для полей поменьше в режиме нескольких слов.
+    """
+
+    def __init__(self, parent, rows, cols, bg="#f0f0f0", font=CELL_STYLE["font"], pad=PAD):
+        self.frame = tk.Frame(parent, bg=bg)
+        self.font = font
+        self.pad = pad
+        self.pool = []
+        self.cells = []
+        self.rows = 0
+        self.cols = 0
+        self.resize(rows, cols)
+
+    def resize(self, rows, cols):
+        """Новый размер поля; все видимые клетки очищаются"""
+        self.clear()
+        if (rows, cols) == (self.rows, self.cols):
+            return
+        while len(self.pool) < rows * cols:
+            widget = tk.Label(self.frame, **dict(CELL_STYLE, font=self.font), **BLANK)
+            self.pool.append(Cell(widget, dict(BLANK, font=self.font)))
+        for i, cell in enumerate(self.pool):
+            position = divmod(i, cols) if i < rows * cols else None
+            if position != cell.position:
+                if position is None:
+                    cell.widget.grid_remove()
+                else:
+                    cell.widget.grid(row=position[0], column=position[1],
+                                     padx=self.pad, pady=self.pad)
+                cell.position = position
+        self.cells = [self.pool[r * cols:(r + 1) * cols] for r in range(rows)]
+        self.rows, self.cols = rows, cols
+
+    def set_font(self, font):
+        """Другой шрифт клеток; меняются только клетки со старым шрифтом"""
+        self.font = font
+        for cell in self.pool:
+            cell.config(font=font)
+
+    def clear(self):
+        """Очистка поля: меняются только заполненные или окрашенные клетки"""
+        for row in self.cells:
+            for cell in row:
+                cell.config(**BLANK)
+
+    def fill(self, row, word, **colors):
+        """Запись слова в строку row"""
+        for cell, letter in zip(self.cells[row], word):
+            cell.config(text=letter.upper(), **colors)
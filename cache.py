@@ -0,0 +1,149 @@
+"""Двоичный кэш словаря
+
+Формат файла (числа в little-endian):
+  заголовок       b"WRDL", версия (H), число шардов (H), контрольная сумма (16 байт),
+                  размер метаданных (I)
+  таблица шардов  длина слова (B), число слов (I), смещение (I), контрольная сумма шарда (16 байт)
+  метаданные      JSON в UTF-8, например валидаторы HTTP источников
+  данные          слова каждого шарда подряд, по байту на букву (см. lexicon.encode_words)
+
+Контрольная сумма в заголовке покрывает таблицу шардов и метаданные. Файл
+записывается во временный и переименовывается, поэтому сбой во время
+записи оставляет прежний кэш целым. При открытии читаются только заголовок
+и таблица, а шард читается и декодируется при первом обращении к словам
+его длины. Между чтениями файл не держится открытым, чтобы фоновая
+проверка обновлений могла заменить его и в Windows.
+"""
+import hashlib
+import json
+import os
+import struct
+
+import metrics
+from lexicon import Lexicon, decode_words, encode_words
+
+MAGIC = b"WRDL"
+VERSION = 2
+HEADER = struct.Struct("<4sHH16sI")
+ENTRY = struct.Struct("<BII16s")
+
+
+class CacheError(Exception):
+    """Файл кэша повреждён или записан в другом формате"""
+
+
+def digest(data):
+    """Контрольная сумма блока данных"""
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+@metrics.timed("cache.write")
+def write_cache(path, lexicon, metadata=None):
+    """Атомарная запись словаря и метаданных (словарь JSON) в двоичный кэш"""
+    lengths = lexicon.lengths()
+    shards = [encode_words(lexicon.words(length)) for length in lengths]
+    meta = json.dumps(metadata or {}, ensure_ascii=False).encode("utf-8")
+    offset = HEADER.size + ENTRY.size * len(lengths) + len(meta)
+    table = []
+    for length, data in zip(lengths, shards):
+        table.append(ENTRY.pack(length, len(data) // length, offset, digest(data)))
+        offset += len(data)
+    checksum = digest(b"".join(table) + meta)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, len(lengths), checksum, len(meta)))
+            f.writelines(table)
+            f.write(meta)
+            f.writelines(shards)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def read_header(f):
+    """Таблица шардов {длина: (число слов, смещение, сумма)} и метаданные.
+
+    Читаются только заголовок, таблица и метаданные. Проверяются версия
+    формата, контрольная сумма и то, что шарды целиком помещаются в файл,
+    так что обрезанный кэш отвергается сразу.
+    """
+    size = os.fstat(f.fileno()).st_size
+    head = f.read(HEADER.size)
+    if len(head) < HEADER.size:
+        raise CacheError("Файл кэша слишком короткий")
+    magic, version, count, checksum, meta_size = HEADER.unpack(head)
+    if magic != MAGIC or version != VERSION:
+        raise CacheError("Неизвестный формат кэша")
+    block = f.read(ENTRY.size * count + meta_size)
+    if len(block) < ENTRY.size * count + meta_size:
+        raise CacheError("Таблица шардов обрезана")
+    if digest(block) != checksum:
+        raise CacheError("Неверная контрольная сумма кэша")
+    table = {}
+    for i in range(count):
+        length, words, offset, shard_sum = ENTRY.unpack_from(block, ENTRY.size * i)
+        if length == 0 or offset + words * length > size:
+            raise CacheError(f"Шард {length} выходит за пределы файла")
+        table[length] = (words, offset, shard_sum)
+    try:
+        metadata = json.loads(block[ENTRY.size * count:] or b"{}")
+    except ValueError:
+        raise CacheError("Метаданные кэша повреждены")
+    return table, metadata
+
+
+def read_metadata(path):
+    """Метаданные из заголовка кэша без чтения слов"""
+    with open(path, "rb") as f:
+        return read_header(f)[1]
+
+
+def read_shard(path, length):
+    """Слова одного шарда; проверяется его контрольная сумма.
+
+    Таблица перечитывается из файла, поэтому если кэш успели заменить
+    новым, шард берётся из нового. Повреждённый кэш удаляется, чтобы
+    следующая загрузка собрала его из источников заново, а не сочла
+    свежим по валидаторам из заголовка.
+    """
+    with open(path, "rb") as f:
+        table, _ = read_header(f)
+        if length not in table:
+            return []
+        words, offset, shard_sum = table[length]
+        f.seek(offset)
+        data = f.read(words * length)
+    if digest(data) != shard_sum:
+        os.remove(path)
+        raise CacheError("Неверная контрольная сумма шарда")
+    return decode_words(data, length)
+
+
+@metrics.timed("cache.open")
+def open_cache(path):
+    """Словарь из двоичного кэша с ленивой загрузкой шардов.
+
+    Шард, который не удалось прочитать (повреждён или файл удалён),
+    считается пустым, поэтому наличие слов проверяется через words(),
+    а не count(): число слов берётся из таблицы без чтения шарда.
+    """
+    path = os.path.abspath(path)
+    with open(path, "rb") as f:
+        table, _ = read_header(f)
+
+    def loader(length):
+        @metrics.timed("cache.shard")
+        def load():
+            try:
+                return read_shard(path, length)
+            except (OSError, CacheError) as e:
+                print(f"Шард словаря из {length} букв не прочитан: {e}")
+                return []
+        return load
+
+    shards = {length: (words, loader(length)) for length, (words, _, _) in table.items()}
+    return Lexicon.from_shards(shards)
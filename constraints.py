@@ -0,0 +1,101 @@
+"""Отбор возможных ответов по результатам попыток
+
+Слова одной длины нумеруются в порядке lexicon.words(length), а множества
+слов хранятся как целые числа-битсеты: бит i установлен, если слово i
+входит в множество. После каждой попытки множество кандидатов сужается
+пересечением с несколькими заранее построенными битсетами, без перебора
+самих слов.
+"""
+from scoring import GRAY, GREEN
+
+
+def _bitset(positions, size):
+    bits = bytearray((size + 7) // 8)
+    for i in positions:
+        bits[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(bits, "little")
+
+
+class LetterIndex:
+    """Битсеты слов одной длины: по буквам на позициях и по числу букв.
+
+    Строится один раз для списка слов и разделяется между играми.
+    """
+
+    def __init__(self, words):
+        self.words = tuple(words)
+        self.length = len(self.words[0]) if self.words else 0
+        self.word_index = {word: i for i, word in enumerate(self.words)}
+        size = len(self.words)
+
+        position = {}  # (позиция, буква) -> номера слов с этой буквой на позиции
+        at_least = {}  # (буква, k) -> номера слов, где буква встречается не менее k раз
+        for i, word in enumerate(self.words):
+            counts = {}
+            for pos, letter in enumerate(word):
+                position.setdefault((pos, letter), []).append(i)
+                counts[letter] = counts.get(letter, 0) + 1
+            for letter, count in counts.items():
+                for k in range(1, count + 1):
+                    at_least.setdefault((letter, k), []).append(i)
+        self.position = {key: _bitset(ids, size) for key, ids in position.items()}
+        self.at_least = {key: _bitset(ids, size) for key, ids in at_least.items()}
+        self.all = (1 << size) - 1
+
+    def decode(self, mask):
+        """Слова, биты которых установлены в mask"""
+        words = []
+        data = mask.to_bytes((len(self.words) + 7) // 8, "little")
+        for byte_index, byte in enumerate(data):
+            while byte:
+                low = byte & -byte
+                words.append(self.words[(byte_index << 3) + low.bit_length() - 1])
+                byte ^= low
+        return words
+
+
+class Candidates:
+    """Множество ответов, согласующихся со всеми сделанными попытками"""
+
+    def __init__(self, index):
+        self.index = index
+        self.mask = index.all
+
+    def update(self, guess, pattern):
+        """Сужение множества по попытке и её шаблону оценки (см. scoring)"""
+        index = self.index
+        mask = self.mask
+        marked = {}
+        has_gray = set()
+        for pos, letter in enumerate(guess):
+            pattern, mark = divmod(pattern, 3)
+            with_letter = index.position.get((pos, letter), 0)
+            if mark == GREEN:
+                mask &= with_letter
+            else:
+                mask &= ~with_letter
+            if mark == GRAY:
+                has_gray.add(letter)
+            else:
+                marked[letter] = marked.get(letter, 0) + 1
+        for letter in set(guess):
+            count = marked.get(letter, 0)
+            if count:
+                mask &= index.at_least.get((letter, count), 0)
+            if letter in has_gray:
+                # Серая отметка означает, что других таких букв в слове нет
+                mask &= ~index.at_least.get((letter, count + 1), 0)
+        self.mask = mask
+
+    def count(self):
+        """Сколько ответов ещё возможно"""
+        return self.mask.bit_count()
+
+    def is_consistent(self, word):
+        """Может ли слово быть ответом при известных подсказках"""
+        i = self.index.word_index.get(word)
+        return i is not None and bool(self.mask >> i & 1)
+
+    def words(self):
+        """Оставшиеся возможные ответы"""
+        return self.index.decode(self.mask)
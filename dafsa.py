@@ -0,0 +1,106 @@
+"""Минимальный ациклический автомат (DAFSA) для слов одной длины
+
+Автомат строится по отсортированным словам алгоритмом Дацюка: одинаковые
+окончания слов сливаются в общие узлы, поэтому узлов намного меньше, чем
+букв в словаре. Все слова одной длины, так что конечный узел один —
+тот, в который приводит последняя буква. Готовый автомат хранится в трёх
+плоских массивах:
+
+  labels   строка из букв всех рёбер, по узлам подряд
+  targets  номер узла, в который ведёт каждое ребро
+  first    номер первого ребра каждого узла (first[n + 1] — конец рёбер узла n)
+
+Проверка слова и префикса проходит по одному ребру на букву: ребро с
+нужной буквой ищется в labels через str.find в пределах узла.
+"""
+from array import array
+
+
+class Dafsa:
+    """Слова одной длины; узел 0 — начальный"""
+
+    __slots__ = ("length", "size", "labels", "targets", "first")
+
+    def __init__(self, words):
+        words = sorted(words)
+        self.length = len(words[0]) if words else 0
+        self.size = len(words)
+        edges = [{}]     # узел -> {буква: узел}
+        register = {}    # рёбра узла -> узел, которым представлены такие окончания
+        path = [0]       # узлы вдоль последнего добавленного слова
+        previous = ""
+        for word in words:
+            common = 0
+            while common < len(previous) and word[common] == previous[common]:
+                common += 1
+            self._minimize(edges, register, path, previous, common)
+            for letter in word[common:]:
+                edges.append({})
+                edges[path[-1]][letter] = len(edges) - 1
+                path.append(len(edges) - 1)
+            previous = word
+        self._minimize(edges, register, path, previous, 0)
+
+        # Перенумерация достижимых узлов в порядке обхода и упаковка рёбер
+        numbers = {0: 0}
+        order = [0]
+        for node in order:
+            for target in edges[node].values():
+                if target not in numbers:
+                    numbers[target] = len(order)
+                    order.append(target)
+        labels = []
+        self.targets = array("I")
+        self.first = array("I", [0])
+        for node in order:
+            for letter, target in sorted(edges[node].items()):
+                labels.append(letter)
+                self.targets.append(numbers[target])
+            self.first.append(len(labels))
+        self.labels = "".join(labels)
+
+    @staticmethod
+    def _minimize(edges, register, path, word, down_to):
+        """Замена узлов пути глубже down_to равными им узлами из register"""
+        for depth in range(len(path) - 1, down_to, -1):
+            node = path.pop()
+            key = tuple(sorted(edges[node].items()))
+            if key in register:
+                edges[path[-1]][word[depth - 1]] = register[key]
+            else:
+                register[key] = node
+
+    def _walk(self, text):
+        """Узел, в который приводит text, или -1"""
+        if not self.size:
+            return -1
+        labels, targets, first = self.labels, self.targets, self.first
+        node = 0
+        for letter in text:
+            i = labels.find(letter, first[node], first[node + 1])
+            if i < 0:
+                return -1
+            node = targets[i]
+        return node
+
+    def contains(self, word):
+        """Есть ли слово в автомате"""
+        return len(word) == self.length and self._walk(word) >= 0
+
+    __contains__ = contains
+
+    def has_prefix(self, prefix):
+        """Начинается ли с prefix хотя бы одно слово"""
+        return len(prefix) <= self.length and self._walk(prefix) >= 0
+
+    def nodes(self):
+        """Число узлов автомата"""
+        return len(self.first) - 1
+
+    def nbytes(self):
+        """Размер массивов автомата в байтах"""
+        return (len(self.labels.encode("utf-16-le")) + self.targets.itemsize * len(self.targets)
+                + self.first.itemsize * len(self.first))
+
+    def __len__(self):
+        return self.size
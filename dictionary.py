@@ -0,0 +1,340 @@
+"""Загрузка словаря из открытых источников"""
+import codecs
+import http.client
+import json
+import os
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+from cache import CacheError, open_cache, read_metadata, write_cache
+from lexicon import Lexicon
+
+SOURCES = [
+    "https://raw.githubusercontent.com/danakt/russian-words/master/russian.txt",
+    "https://raw.githubusercontent.com/Harrix/Russian-Nouns/main/dist/russian_nouns.txt"
+]
+TIMEOUT = 3
+CHUNK_SIZE = 64 * 1024
+MIN_LENGTH = 4
+MAX_LENGTH = 10
+CACHE_FILE = "wordle_words.bin"
+# Кэши прежних версий, переносимые в двоичный формат
+JSON_CACHES = [
+    "wordle_words.json",
+    "wordle_words_cache.json",
+    "wordle_words_5.json",
+    "wordle_words_6.json"
+]
+
+_RUSSIAN_WORD = re.compile(r'[а-яё]+')
+# Ошибки, при которых источник считается недоступным
+FETCH_ERRORS = (OSError, ValueError, http.client.HTTPException)
+
+
+def iter_lines(stream, chunk_size=CHUNK_SIZE):
+    """Построчное чтение потока байт в UTF-8.
+
+    Файл читается кусками по chunk_size байт, поэтому в памяти одновременно
+    находится только текущий кусок и незаконченная строка.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    tail = ""
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        lines = (tail + decoder.decode(chunk)).split("\n")
+        tail = lines.pop()
+        yield from lines
+    tail += decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def word_pattern(min_length=MIN_LENGTH, max_length=MAX_LENGTH):
+    """Регулярное выражение для слов из min_length..max_length русских букв"""
+    return re.compile(fr'\b[а-яё]{{{min_length},{max_length}}}\b')
+
+
+class _ResponseStream:
+    """Поток ответа: сообщает о числе прочитанных байт и замечает обрыв.
+
+    HTTPResponse.read(size) и read1 при разрыве соединения просто
+    возвращают b"", поэтому прочитанное сверяется с Content-Length.
+    waited — сколько секунд ушло на ожидание данных из сети.
+    """
+
+    def __init__(self, response, callback=None):
+        self.response = response
+        self.callback = callback
+        self.total = int(response.headers.get("Content-Length") or 0)
+        self.read_bytes = 0
+        self.waited = 0.0
+
+    def read(self, size):
+        # read1 возвращает уже пришедшие данные, не дожидаясь полного куска
+        start = time.perf_counter()
+        chunk = self.response.read1(size)
+        self.waited += time.perf_counter() - start
+        if not chunk and self.read_bytes < self.total:
+            raise http.client.IncompleteRead(b"", self.total - self.read_bytes)
+        self.read_bytes += len(chunk)
+        if self.callback is not None:
+            self.callback(self.read_bytes, self.total)
+        return chunk
+
+
+def fetch_source(url, pattern, validators=None, timeout=TIMEOUT, chunk_size=CHUNK_SIZE,
+                 progress=None):
+    """Слова одного источника и его валидаторы {"etag": ..., "last_modified": ...}.
+
+    С validators запрос условный: если источник не изменился, вместо слов
+    возвращается None. progress(прочитано, всего) вызывается после каждого
+    куска; «всего» равно 0, если сервер не сообщил размер. Недоступность
+    источника и обрыв ответа на середине пробрасываются как FETCH_ERRORS:
+    обрезанная последняя строка могла бы дать несуществующее слово.
+    """
+    request = urllib.request.Request(url)
+    if validators:
+        if validators.get("etag"):
+            request.add_header("If-None-Match", validators["etag"])
+        if validators.get("last_modified"):
+            request.add_header("If-Modified-Since", validators["last_modified"])
+    words = set()
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            connected = time.perf_counter() - start
+            stream = _ResponseStream(response, progress)
+            for line in iter_lines(stream, chunk_size):
+                words.update(pattern.findall(line.lower()))
+            headers = response.headers
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and validators:
+            metrics.record("fetch.network", time.perf_counter() - start)
+            return None, validators
+        raise
+    # Всё, кроме ожидания сети, — разбор строк и поиск слов регулярным выражением
+    network = connected + stream.waited
+    metrics.record("fetch.network", network)
+    metrics.record("fetch.extract", time.perf_counter() - start - network)
+    validators = {"etag": headers.get("ETag"), "last_modified": headers.get("Last-Modified")}
+    return words, validators
+
+
+def fetch_words(url, pattern, timeout=TIMEOUT, chunk_size=CHUNK_SIZE, progress=None):
+    """Слова, найденные в одном источнике; пустое множество, если он недоступен"""
+    try:
+        return fetch_source(url, pattern, None, timeout, chunk_size, progress)[0]
+    except FETCH_ERRORS:
+        return set()
+
+
+def download_sources(urls=SOURCES, validators=None, timeout=TIMEOUT, chunk_size=CHUNK_SIZE,
+                     progress=None):
+    """Параллельная загрузка источников: {url: (слова или None, валидаторы)}.
+
+    validators — {url: валидаторы} для условных запросов. Недоступный
+    источник даёт вместо пары исключение из FETCH_ERRORS.
+    progress(url, прочитано, всего) сообщает о ходе загрузки каждого источника.
+    """
+    pattern = word_pattern()
+    validators = validators or {}
+
+    def fetch(url):
+        callback = (lambda read, total: progress(url, read, total)) if progress else None
+        try:
+            return fetch_source(url, pattern, validators.get(url), timeout, chunk_size, callback)
+        except FETCH_ERRORS as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=len(urls) or 1) as pool:
+        return dict(zip(urls, pool.map(fetch, urls)))
+
+
+def download_words(urls=SOURCES, timeout=TIMEOUT, chunk_size=CHUNK_SIZE, progress=None):
+    """Параллельная загрузка из всех источников слов всех поддерживаемых длин.
+
+    Источники разбираются за один проход, раскладка по длинам — в Lexicon.
+    Недоступные источники пропускаются.
+    """
+    words = set()
+    for result in download_sources(urls, None, timeout, chunk_size, progress).values():
+        if not isinstance(result, Exception):
+            words.update(result[0])
+    return words
+
+
+@metrics.timed("cache.json")
+def read_json_cache(path):
+    """Слова из JSON-кэша прежних версий или None, если его нет или он повреждён.
+
+    Понимает и общий кэш {длина: [слова]}, и простой список слов.
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            data = [word for words in data.values() for word in words]
+        return [word for word in data if isinstance(word, str) and _RUSSIAN_WORD.fullmatch(word)]
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def save_cache(lexicon, cache_file=CACHE_FILE, sources=None):
+    """Сохранение словаря в двоичный кэш вместе с валидаторами источников"""
+    try:
+        write_cache(cache_file, lexicon, {"sources": sources or {}})
+    except OSError as e:
+        print(f"Ошибка сохранения словаря: {e}")
+
+
+def open_lexicon(cache_file=CACHE_FILE, json_caches=JSON_CACHES):
+    """Словарь из локальных кэшей без обращения к сети или None.
+
+    Если двоичного кэша нет, он собирается из JSON-кэшей прежних версий.
+    """
+    try:
+        return open_cache(cache_file)
+    except CacheError as e:
+        print(f"Кэш словаря не прочитан: {e}")
+    except OSError:
+        pass
+    words = []
+    for path in json_caches:
+        words.extend(read_json_cache(path) or ())
+    if not words:
+        return None
+    lexicon = Lexicon(words)
+    save_cache(lexicon, cache_file)
+    return lexicon
+
+
+def fetch_lexicon(cache_file=CACHE_FILE, urls=SOURCES, progress=None):
+    """Словарь из источников; удачная загрузка сохраняется в кэш"""
+    words = set()
+    sources = {}
+    for url, result in download_sources(urls, progress=progress).items():
+        if not isinstance(result, Exception):
+            words.update(result[0])
+            sources[url] = result[1]
+    lexicon = Lexicon(words)
+    if len(lexicon):
+        save_cache(lexicon, cache_file, sources)
+    return lexicon
+
+
+def revalidate_lexicon(cache_file=CACHE_FILE, urls=SOURCES, progress=None):
+    """Проверка, не изменились ли источники сохранённого кэша.
+
+    Возвращает новый словарь, если хотя бы один источник изменился, и None,
+    если кэш свежий или проверить его не удалось (тогда прежний кэш
+    продолжает использоваться). Неизменившиеся источники при обновлении
+    загружаются заново: в кэше хранится только объединённый словарь.
+    """
+    try:
+        sources = read_metadata(cache_file).get("sources", {})
+    except (OSError, CacheError):
+        sources = {}
+    if set(sources) != set(urls):
+        # Кэш собран из другого набора источников или без валидаторов
+        lexicon = fetch_lexicon(cache_file, urls, progress)
+        return lexicon if len(lexicon) else None
+
+    results = download_sources(urls, sources, progress=progress)
+    failed = [url for url, result in results.items() if isinstance(result, Exception)]
+    if failed:
+        print(f"Не удалось проверить обновления словаря: {', '.join(failed)}")
+        return None
+    if all(words is None for words, _ in results.values()):
+        return None
+    unchanged = [url for url, (words, _) in results.items() if words is None]
+    results.update(download_sources(unchanged, progress=progress))
+    if any(isinstance(result, Exception) for result in results.values()):
+        return None
+    lexicon = Lexicon(word for words, _ in results.values() for word in words)
+    save_cache(lexicon, cache_file, {url: validators for url, (_, validators) in results.items()})
+    return lexicon
+
+
+def load_lexicon(cache_file=CACHE_FILE, urls=SOURCES, json_caches=JSON_CACHES):
+    """Словарь всех длин из кэша, а при его отсутствии — из источников.
+
+    Если загрузить ничего не удалось, возвращается пустой Lexicon.
+    """
+    lexicon = open_lexicon(cache_file, json_caches)
+    if lexicon is None:
+        lexicon = fetch_lexicon(cache_file, urls)
+    return lexicon
+
+
+def read_lexicon(path=None):
+    """Словарь из текстового файла (по слову на строке) или из обычного кэша"""
+    if not path:
+        return load_lexicon()
+    with open(path, encoding="utf-8") as f:
+        return Lexicon(f)
+
+
+class DictionaryLoader:
+    """Загрузка словаря из источников в фоновом потоке.
+
+    Интерфейс не ждёт поток, а периодически опрашивает fraction() и ready().
+    prepare(lexicon) выполняется в том же потоке после загрузки, например
+    для построения индексов; его результат доступен как prepared. При
+    revalidate=True проверяются обновления уже сохранённого кэша: если
+    источники не изменились, lexicon остаётся None.
+    """
+
+    def __init__(self, cache_file=CACHE_FILE, urls=SOURCES, prepare=None, revalidate=False):
+        self.cache_file = cache_file
+        self.urls = urls
+        self.prepare = prepare
+        self.revalidate = revalidate
+        self.lexicon = None
+        self.prepared = None
+        self._progress = {}
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+        return self
+
+    def _run(self):
+        try:
+            if self.revalidate:
+                lexicon = revalidate_lexicon(self.cache_file, self.urls, self._on_progress)
+            else:
+                lexicon = fetch_lexicon(self.cache_file, self.urls, self._on_progress)
+            if lexicon is None:
+                return
+            if len(lexicon) and self.prepare is not None:
+                self.prepared = self.prepare(lexicon)
+            self.lexicon = lexicon
+        except Exception as e:
+            print(f"Ошибка загрузки словаря: {e}")
+        finally:
+            self._done.set()
+
+    def _on_progress(self, url, read, total):
+        with self._lock:
+            self._progress[url] = (read, total)
+
+    def fraction(self):
+        """Доля загруженного от 0 до 1 (по источникам с известным размером)"""
+        with self._lock:
+            read = sum(r for r, total in self._progress.values() if total)
+            total = sum(total for _, total in self._progress.values())
+        return min(1.0, read / total) if total else 0.0
+
+    def ready(self):
+        """Завершена ли загрузка (успешно или нет)"""
+        return self._done.is_set()
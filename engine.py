@@ -0,0 +1,351 @@
+"""Игровая логика без интерфейса
+
+Модуль не зависит от tkinter, сети и файлов: представление подписывается
+на события игры через Game.subscribe и только отображает их.
+"""
+import random
+
+from collections import Counter
+
+from constraints import Candidates
+from partition import Partitioner
+from scoring import score, score_batch, winning_pattern
+
+# События, которые получают подписчики: listener(событие, данные)
+LETTER_ADDED = "letter_added"      # (строка, столбец, буква)
+LETTER_DELETED = "letter_deleted"  # (строка, столбец)
+GUESS_REJECTED = "guess_rejected"  # GuessResult
+GUESS_SCORED = "guess_scored"      # GuessResult
+GAME_WON = "game_won"              # GuessResult
+GAME_LOST = "game_lost"            # GuessResult
+PREFIX_CHECKED = "prefix_checked"  # (строка, может ли набранное стать словом)
+BOARD_EVENT = "board_event"        # MultiGame: (номер поля, событие поля, данные)
+
+# Причины, по которым попытка не принята
+WRONG_LENGTH = "wrong_length"
+UNKNOWN_WORD = "unknown_word"
+INCONSISTENT = "inconsistent"
+GAME_OVER = "game_over"
+
+# AdversarialGame: до скольких слов кандидаты хранятся списком, а не дорожками
+SMALL_GROUP = 256
+
+
+class GuessResult:
+    """Итог отправки попытки"""
+
+    __slots__ = ("guess", "row", "pattern", "rejected")
+
+    def __init__(self, guess, row, pattern=None, rejected=None):
+        self.guess = guess
+        self.row = row
+        self.pattern = pattern
+        self.rejected = rejected
+
+    def message(self, length):
+        """Текст отказа для игрока"""
+        return {
+            WRONG_LENGTH: f"Слово должно быть из {length} букв!",
+            UNKNOWN_WORD: "Такого слова нет в словаре!",
+            INCONSISTENT: "В сложном режиме слово должно учитывать все подсказки!",
+            GAME_OVER: "Игра уже закончена",
+        }.get(self.rejected, "")
+
+
+class Game:
+    """Состояние одной партии.
+
+    lexicon — lexicon.Lexicon, index — constraints.LetterIndex для слов
+    нужной длины (без него не считаются кандидаты и недоступен сложный режим).
+    """
+
+    __slots__ = ("lexicon", "length", "max_attempts", "target", "guesses",
+                 "patterns", "current", "hard_mode", "candidates", "finished",
+                 "_listeners")
+
+    def __init__(self, lexicon, length=5, max_attempts=6, target=None, index=None,
+                 hard_mode=False, rng=random):
+        self.lexicon = lexicon
+        self.length = length
+        self.max_attempts = max_attempts
+        self.target = target or lexicon.random_answer(length, rng)
+        self.guesses = []
+        self.patterns = []
+        self.current = ""
+        self.hard_mode = hard_mode
+        self.candidates = Candidates(index) if index is not None else None
+        self.finished = False
+        self._listeners = []
+
+    def subscribe(self, listener):
+        """Подписка на события игры"""
+        self._listeners.append(listener)
+
+    def _emit(self, event, payload):
+        for listener in self._listeners:
+            listener(event, payload)
+
+    @property
+    def attempts(self):
+        """Число принятых попыток"""
+        return len(self.guesses)
+
+    @property
+    def won(self):
+        return bool(self.patterns) and self.patterns[-1] == winning_pattern(self.length)
+
+    def use_lexicon(self, lexicon, index=None):
+        """Замена словаря посреди партии, например после фоновой загрузки.
+
+        Загаданное слово не меняется, а кандидаты пересчитываются по новому
+        индексу с учётом уже сделанных попыток.
+        """
+        self.lexicon = lexicon
+        if index is not None:
+            self.candidates = Candidates(index)
+            for guess, pattern in zip(self.guesses, self.patterns):
+                self.candidates.update(guess, pattern)
+
+    def add_letter(self, letter):
+        """Добавление буквы в текущую попытку"""
+        if self.finished or len(self.current) >= self.length:
+            return False
+        self.current += letter
+        self._emit(LETTER_ADDED, (self.attempts, len(self.current) - 1, letter))
+        self._emit(PREFIX_CHECKED, (self.attempts, self.prefix_valid()))
+        return True
+
+    def delete_letter(self):
+        """Удаление последней буквы"""
+        if self.finished or not self.current:
+            return False
+        self.current = self.current[:-1]
+        self._emit(LETTER_DELETED, (self.attempts, len(self.current)))
+        self._emit(PREFIX_CHECKED, (self.attempts, self.prefix_valid()))
+        return True
+
+    def prefix_valid(self):
+        """Может ли набранная часть попытки продолжиться до слова из словаря"""
+        return (self.target.startswith(self.current)
+                or self.lexicon.has_prefix(self.current, self.length))
+
+    def check(self, guess):
+        """Шаблон оценки слова относительно загаданного (см. scoring)"""
+        return score(guess, self.target)
+
+    def validate(self, guess):
+        """Причина, по которой попытка не принимается, или None"""
+        if self.finished:
+            return GAME_OVER
+        if len(guess) != self.length:
+            return WRONG_LENGTH
+        if guess == self.target:
+            return None  # Загаданное слово принимается, даже если словарь уже заменён
+        if not self.lexicon.contains(guess):
+            return UNKNOWN_WORD
+        if (self.hard_mode and self.candidates is not None
+                and not self.candidates.is_consistent(guess)):
+            return INCONSISTENT
+        return None
+
+    def submit(self):
+        """Отправка текущей попытки"""
+        guess = self.current
+        result = GuessResult(guess, self.attempts, rejected=self.validate(guess))
+        if result.rejected:
+            self._emit(GUESS_REJECTED, result)
+            return result
+        return self.record(guess, self.check(guess))
+
+    def record(self, guess, pattern):
+        """Учёт принятой попытки с уже посчитанным шаблоном оценки"""
+        result = GuessResult(guess, self.attempts, pattern)
+        self.guesses.append(guess)
+        self.patterns.append(result.pattern)
+        self.current = ""
+        if self.candidates is not None:
+            self.candidates.update(guess, result.pattern)
+        self._emit(GUESS_SCORED, result)
+
+        if result.pattern == winning_pattern(self.length):
+            self.finished = True
+            self._emit(GAME_WON, result)
+        elif self.attempts >= self.max_attempts:
+            self.finished = True
+            self._emit(GAME_LOST, result)
+        return result
+
+
+class MultiGame:
+    """Одни и те же попытки против нескольких загаданных слов (Quordle, Octordle).
+
+    Каждое поле — отдельная Game со своим загаданным словом и кандидатами,
+    но ввод общий, а попытка оценивается по всем неотгаданным словам одним
+    вызовом score_batch. События полей пересылаются подписчикам как
+    BOARD_EVENT; GAME_WON — все слова отгаданы, GAME_LOST — попытки кончились.
+    """
+
+    __slots__ = ("lexicon", "length", "max_attempts", "boards", "current", "guesses",
+                 "finished", "_listeners")
+
+    def __init__(self, lexicon, length=5, count=4, max_attempts=None, targets=None,
+                 index=None, rng=random):
+        self.lexicon = lexicon
+        self.length = length
+        # Как в Quordle и Octordle: на каждое дополнительное слово по попытке
+        self.max_attempts = max_attempts or count + 5
+        if targets is None:
+            pool = lexicon.words(length)
+            targets = rng.sample(pool, min(count, len(pool)))
+        self.boards = [Game(lexicon, length, self.max_attempts, target=target, index=index)
+                       for target in targets]
+        self.current = ""
+        self.guesses = []
+        self.finished = False
+        self._listeners = []
+        for number, board in enumerate(self.boards):
+            board.subscribe(lambda event, payload, number=number:
+                            self._emit(BOARD_EVENT, (number, event, payload)))
+
+    def subscribe(self, listener):
+        """Подписка на события игры"""
+        self._listeners.append(listener)
+
+    def _emit(self, event, payload):
+        for listener in self._listeners:
+            listener(event, payload)
+
+    @property
+    def attempts(self):
+        """Число принятых попыток"""
+        return len(self.guesses)
+
+    @property
+    def won(self):
+        return all(board.won for board in self.boards)
+
+    def use_lexicon(self, lexicon, index=None):
+        """Замена словаря посреди партии (см. Game.use_lexicon)"""
+        self.lexicon = lexicon
+        for board in self.boards:
+            board.use_lexicon(lexicon, index)
+
+    def active(self):
+        """Поля, слово которых ещё не отгадано"""
+        return [board for board in self.boards if not board.finished]
+
+    def add_letter(self, letter):
+        """Добавление буквы в текущую попытку всех полей"""
+        if self.finished or len(self.current) >= self.length:
+            return False
+        self.current += letter
+        self._emit(LETTER_ADDED, (self.attempts, len(self.current) - 1, letter))
+        self._emit(PREFIX_CHECKED, (self.attempts, self.prefix_valid()))
+        return True
+
+    def delete_letter(self):
+        """Удаление последней буквы"""
+        if self.finished or not self.current:
+            return False
+        self.current = self.current[:-1]
+        self._emit(LETTER_DELETED, (self.attempts, len(self.current)))
+        self._emit(PREFIX_CHECKED, (self.attempts, self.prefix_valid()))
+        return True
+
+    def prefix_valid(self):
+        """Может ли набранная часть попытки продолжиться до слова из словаря"""
+        return (any(board.target.startswith(self.current) for board in self.boards)
+                or self.lexicon.has_prefix(self.current, self.length))
+
+    def submit(self):
+        """Отправка текущей попытки во все неотгаданные поля"""
+        guess = self.current
+        result = GuessResult(guess, self.attempts)
+        if self.finished:
+            result.rejected = GAME_OVER
+        elif len(guess) != self.length:
+            result.rejected = WRONG_LENGTH
+        elif (not self.lexicon.contains(guess)
+              and all(board.target != guess for board in self.boards)):
+            result.rejected = UNKNOWN_WORD
+        if result.rejected:
+            self._emit(GUESS_REJECTED, result)
+            return result
+
+        active = self.active()
+        self.guesses.append(guess)
+        self.current = ""
+        for board, pattern in zip(active, score_batch(guess, [b.target for b in active])):
+            board.record(guess, pattern)
+        if self.won:
+            self.finished = True
+            self._emit(GAME_WON, result)
+        elif self.attempts >= self.max_attempts:
+            self.finished = True
+            self._emit(GAME_LOST, result)
+        return result
+
+
+class AdversarialGame(Game):
+    """Режим Absurdle: слово не загадывается заранее.
+
+    После каждой попытки оставшиеся слова делятся на группы по шаблону
+    оценки, и игре засчитывается шаблон самой большой группы (при равенстве
+    — с меньшим числом подсказок). Слова загаданы все сразу, пока группа не
+    сократится до одного. Разбиение целого словаря считает
+    partition.Partitioner; его можно передать готовым, чтобы не строить
+    для каждой партии. target остаётся None до конца игры.
+    """
+
+    __slots__ = ("partitioner", "_lanes", "_words")
+
+    def __init__(self, lexicon, length=5, max_attempts=6, partitioner=None, index=None,
+                 hard_mode=False):
+        super().__init__(lexicon, length, max_attempts, index=index, hard_mode=hard_mode)
+        self.target = None
+        self.partitioner = partitioner or Partitioner(lexicon.words(length))
+        self._lanes = self.partitioner.all  # оставшиеся слова, пока их много
+        self._words = None                  # они же списком, когда их мало
+
+    def remaining(self):
+        """Слова, которые всё ещё могут оказаться загаданными"""
+        if self._words is None:
+            return self.partitioner.decode(self._lanes)
+        return list(self._words)
+
+    def prefix_valid(self):
+        return self.lexicon.has_prefix(self.current, self.length)
+
+    def check(self, guess):
+        """Шаблон самой большой группы оставшихся слов; группа становится ими"""
+        if self._words is None:
+            patterns = self.partitioner.patterns(guess)
+            counts = self.partitioner.counts(patterns, self._lanes)
+        else:
+            patterns = score_batch(guess, self._words)
+            counts = Counter(patterns)
+        pattern = max(counts, key=lambda p: (counts[p], -_hints(p)))
+        if self._words is not None:
+            self._words = [w for w, p in zip(self._words, patterns) if p == pattern]
+        else:
+            self._lanes = self.partitioner.select(patterns, pattern, self._lanes)
+            if counts[pattern] <= SMALL_GROUP:
+                self._words = self.partitioner.decode(self._lanes)
+        return pattern
+
+    def record(self, guess, pattern):
+        # Слово «загадывается» только в конце: отгаданное или любое из оставшихся
+        if pattern == winning_pattern(self.length):
+            self.target = guess
+        elif self.attempts + 1 >= self.max_attempts:
+            self.target = (self.remaining() or [guess])[0]
+        return super().record(guess, pattern)
+
+
+def _hints(pattern):
+    """Сумма отметок шаблона: зелёная — две подсказки, жёлтая — одна"""
+    total = 0
+    while pattern:
+        pattern, mark = divmod(pattern, 3)
+        total += mark
+    return total
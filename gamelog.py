@@ -0,0 +1,221 @@
+"""Журнал сыгранных партий: двоичный файл только для дописывания
+
+Формат файла (числа в little-endian):
+  заголовок  b"WLOG", версия (H), размер записи (H)
+  записи     по RECORD.size байт на партию, в порядке окончания партий
+
+Запись партии:
+  время окончания (I, секунды Unix), длительность (I, мс),
+  шаблоны оценки попыток (6 × H), режим (B, флаги MODE_*), длина слова (B),
+  число попыток (B), лимит попыток (B), загаданное слово (10 байт),
+  «отгадано за» (B, 0 — проигрыш), попытки (6 × 10 байт), резерв (B)
+
+Слова хранятся кодами букв (см. lexicon.encode_words) и добиваются байтом
+PAD. Записи одной ширины, поэтому файл не нужно разбирать при открытии:
+он отображается в память, а статистика считается срезами с шагом в
+запись — один срез даёт столбец, например все «отгадано за» подряд, и
+дальше с ним работают методы bytes на C. Загаданное слово и «отгадано за»
+стоят рядом, так что пара (слово, итог) каждой партии — один срез.
+
+Недописанная при сбое запись в конце файла не читается и затирается
+следующей партией.
+"""
+import mmap
+import os
+import struct
+import time
+from collections import Counter
+
+from lexicon import decode_words, encode_words
+
+MAGIC = b"WLOG"
+VERSION = 1
+HEADER = struct.Struct("<4sHH")
+MAX_LENGTH = 10
+MAX_GUESSES = 6
+PAD = 0xFF
+RECORD = struct.Struct(f"<II{MAX_GUESSES}HBBBB{MAX_LENGTH}sB{MAX_GUESSES * MAX_LENGTH}sx")
+# Смещения столбцов внутри записи
+TARGET = RECORD.size - 1 - MAX_GUESSES * MAX_LENGTH - 1 - MAX_LENGTH
+SOLVED_IN = TARGET + MAX_LENGTH
+LOG_FILE = "wordle_games.log"
+HARDEST_MIN_GAMES = 3
+
+MODE_HARD = 1
+MODE_ADVERSARIAL = 2
+
+
+class LogError(Exception):
+    """Файл не является журналом партий"""
+
+
+def _pad(word):
+    return encode_words([word]).ljust(MAX_LENGTH, bytes([PAD]))
+
+
+def pack_game(game, duration, mode=0, finished_at=None):
+    """Запись законченной партии engine.Game"""
+    if game.length > MAX_LENGTH or game.attempts > MAX_GUESSES:
+        raise ValueError("Партия не помещается в запись журнала")
+    patterns = list(game.patterns) + [0] * (MAX_GUESSES - game.attempts)
+    guesses = b"".join(_pad(guess) for guess in game.guesses)
+    return RECORD.pack(int(finished_at if finished_at is not None else time.time()),
+                       min(int(duration * 1000), 0xFFFFFFFF), *patterns,
+                       mode, game.length, game.attempts, game.max_attempts,
+                       _pad(game.target), game.attempts if game.won else 0,
+                       guesses.ljust(MAX_GUESSES * MAX_LENGTH, bytes([PAD])))
+
+
+def unpack_game(record):
+    """Словарь с полями записи (для просмотра отдельных партий)"""
+    fields = RECORD.unpack(record)
+    finished_at, duration, patterns = fields[0], fields[1], fields[2:2 + MAX_GUESSES]
+    mode, length, attempts, max_attempts, target, solved_in, guesses = fields[2 + MAX_GUESSES:]
+    return {
+        "finished_at": finished_at,
+        "duration": duration / 1000,
+        "mode": mode,
+        "length": length,
+        "max_attempts": max_attempts,
+        "target": decode_words(target[:length], length)[0],
+        "won": solved_in > 0,
+        "guesses": [decode_words(guesses[i * MAX_LENGTH:i * MAX_LENGTH + length], length)[0]
+                    for i in range(attempts)],
+        "patterns": list(patterns[:attempts]),
+    }
+
+
+class GameLog:
+    """Журнал партий в файле path; файл создаётся при первой записи"""
+
+    def __init__(self, path=LOG_FILE):
+        self.path = path
+
+    def append(self, game, duration, mode=0):
+        """Дописывание законченной партии"""
+        record = pack_game(game, duration, mode)
+        # Без O_BINARY Windows открывает дескриптор в текстовом режиме и
+        # заменяет \n на \r\n, сдвигая записи фиксированной ширины
+        flags = os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0)
+        with os.fdopen(os.open(self.path, flags, 0o644), "r+b") as f:
+            size = f.seek(0, os.SEEK_END)
+            f.seek(0)
+            if size < HEADER.size:
+                f.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+                size = HEADER.size
+            else:
+                self._check(f.read(HEADER.size))
+            # Хвост недописанной записи затирается
+            f.seek(size - (size - HEADER.size) % RECORD.size)
+            f.write(record)
+            f.truncate()
+
+    @staticmethod
+    def _check(header):
+        if len(header) < HEADER.size:
+            raise LogError("Заголовок журнала обрезан")
+        magic, version, record_size = HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            raise LogError("Неизвестный формат журнала")
+
+    def records(self):
+        """Файл, отображённый в память, и число целых записей в нём.
+
+        Запись номер i начинается с HEADER.size + i * RECORD.size. Если журнала
+        ещё нет, вместо файла пустые байты.
+        """
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return b"", 0
+        with f:
+            self._check(f.read(HEADER.size))
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return buffer, (len(buffer) - HEADER.size) // RECORD.size
+
+    def __len__(self):
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return 0
+        return max(0, size - HEADER.size) // RECORD.size
+
+    def game(self, number):
+        """Отдельная партия по номеру"""
+        buffer, count = self.records()
+        if not 0 <= number < count:
+            raise IndexError("Нет партии с таким номером")
+        start = HEADER.size + number * RECORD.size
+        return unpack_game(buffer[start:start + RECORD.size])
+
+    def stats(self, hardest=10):
+        """Сводка по всем партиям"""
+        return Stats(*self.records(), hardest)
+
+
+class Stats:
+    """Процент побед, серии, распределение попыток и самые трудные слова.
+
+    Всё считается по столбцам записей, без цикла по партиям, кроме подсчёта
+    пар (слово, итог) для самых трудных слов.
+    """
+
+    def __init__(self, buffer, count, hardest=10):
+        end = HEADER.size + count * RECORD.size
+        solved = buffer[HEADER.size + SOLVED_IN:end:RECORD.size]
+        self.games = count
+        self.distribution = {attempts: solved.count(attempts)
+                             for attempts in range(1, MAX_GUESSES + 1)}
+        self.wins = sum(self.distribution.values())
+        self.losses = self.games - self.wins
+        runs = solved.split(b"\x00")
+        self.max_streak = max(map(len, runs))
+        self.current_streak = len(runs[-1])
+        self.hardest = self._hardest(buffer, end, hardest) if hardest else []
+
+    @staticmethod
+    def _hardest(buffer, end, count):
+        """Слова с наибольшим средним числом попыток (проигрыш — лимит + 1).
+
+        Слова, сыгранные меньше HARDEST_MIN_GAMES раз, учитываются, только
+        если других нет.
+        """
+        outcomes = Counter(buffer[i:i + MAX_LENGTH + 1]
+                           for i in range(HEADER.size + TARGET, end, RECORD.size))
+        words = {}
+        for key, games in outcomes.items():
+            target, solved_in = key[:MAX_LENGTH], key[MAX_LENGTH]
+            total = words.setdefault(target, [0, 0, 0])
+            total[0] += games
+            total[1] += games * (solved_in or MAX_GUESSES + 1)
+            total[2] += games * (solved_in == 0)
+        frequent = [item for item in words.items() if item[1][0] >= HARDEST_MIN_GAMES]
+        ranked = sorted(frequent or words.items(),
+                        key=lambda item: (-item[1][1] / item[1][0], -item[1][0]))
+        result = []
+        for target, (games, attempts, losses) in ranked[:count]:
+            code = target.rstrip(bytes([PAD]))
+            result.append((decode_words(code, len(code))[0], games, attempts / games, losses))
+        return result
+
+    @property
+    def win_rate(self):
+        return self.wins / self.games if self.games else 0.0
+
+
+def main(argv=None):
+    import sys
+    argv = sys.argv[1:] if argv is None else argv
+    log = GameLog(argv[0] if argv else LOG_FILE)
+    start = time.perf_counter()
+    stats = log.stats()
+    elapsed = time.perf_counter() - start
+    print(f"Партий: {stats.games}, побед {stats.win_rate:.1%}, серия {stats.current_streak}, "
+          f"лучшая серия {stats.max_streak} ({elapsed * 1000:.0f} мс)")
+    for attempts, games in stats.distribution.items():
+        print(f"  {attempts}: {games}")
+    print("Труднее всего:", ", ".join(f"{word} ({mean:.1f})" for word, _, mean, _ in stats.hardest))
+
+
+if __name__ == "__main__":
+    main()
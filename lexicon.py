@@ -0,0 +1,155 @@
+"""Словарь игры с индексами по длине слова"""
+import random
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+
+from dafsa import Dafsa
+
+ALPHABET = "абвгдеёжзийклмнопрстуфхцчшщъыьэюя"
+
+# Код буквы — её индекс в ALPHABET. Перекодировка идёт через cp1251,
+# где каждая русская буква занимает ровно один байт.
+_CP1251_TO_CODE = bytearray(256)
+_CODE_TO_CP1251 = bytearray(256)
+for _code, _byte in enumerate(ALPHABET.encode("cp1251")):
+    _CP1251_TO_CODE[_byte] = _code
+    _CODE_TO_CP1251[_code] = _byte
+_CP1251_TO_CODE = bytes(_CP1251_TO_CODE)
+_CODE_TO_CP1251 = bytes(_CODE_TO_CP1251)
+
+
+def encode_words(words):
+    """Слова одной длины в виде байтов: по коду на букву, слова подряд"""
+    return "".join(words).encode("cp1251").translate(_CP1251_TO_CODE)
+
+
+def decode_words(data, length):
+    """Обратное к encode_words преобразование"""
+    text = bytes(data).translate(_CODE_TO_CP1251).decode("cp1251")
+    return [text[i:i + length] for i in range(0, len(text), length)]
+
+
+class Lexicon:
+    """Набор слов, разбитый по длинам.
+
+    Для каждой длины хранится отсортированный кортеж (равномерный выбор
+    загаданного слова и перебор), а при первой проверке слова строится
+    dafsa.Dafsa: проверка слова и префикса за время, пропорциональное длине
+    слова, при памяти в несколько раз меньше, чем у frozenset.
+    Пока автомат строится в другом потоке, слова и префиксы ищутся двоичным
+    поиском по кортежу, чтобы проверка не ждала построения.
+    Слова длин, загруженных из шардов, декодируются при первом обращении.
+    """
+
+    def __init__(self, words=()):
+        buckets = defaultdict(set)
+        for word in words:
+            word = word.strip().lower()
+            if word:
+                buckets[len(word)].add(word)
+        self._sorted = {length: tuple(sorted(b)) for length, b in buckets.items()}
+        self._automata = {}
+        self._shards = {}
+        self._building = set()
+        self._lock = threading.Lock()
+        self._shard_lock = threading.Lock()
+
+    @classmethod
+    def from_shards(cls, shards):
+        """Словарь с ленивой загрузкой по длинам.
+
+        shards — {длина: (число слов, функция, возвращающая отсортированные слова)}.
+        """
+        lexicon = cls()
+        lexicon._shards = dict(shards)
+        return lexicon
+
+    def _load(self, length):
+        # Шард могут запросить одновременно поток интерфейса и warm_up;
+        # отдельная блокировка не заставляет ждать построения автоматов
+        with self._shard_lock:
+            if length in self._shards:
+                count, loader = self._shards[length]
+                self._sorted[length] = tuple(loader())
+                del self._shards[length]
+
+    def automaton(self, length):
+        """Dafsa слов заданной длины; строится один раз, в том числе из фонового потока"""
+        automaton = self._automata.get(length)
+        if automaton is None:
+            with self._lock:
+                automaton = self._automata.get(length)
+                if automaton is None:
+                    self._building.add(length)
+                    try:
+                        automaton = Dafsa(self.words(length))
+                        self._automata[length] = automaton
+                    finally:
+                        self._building.discard(length)
+        return automaton
+
+    def warm_up(self, lengths):
+        """Построение автоматов в фоновом потоке, чтобы первая проверка их не ждала"""
+        lengths = [n for n in lengths if n not in self._automata]
+        self._building.update(lengths)
+
+        def build():
+            for n in lengths:
+                try:
+                    self.automaton(n)
+                finally:
+                    self._building.discard(n)
+
+        threading.Thread(target=build, daemon=True).start()
+
+    def _search(self, prefix, length):
+        """Есть ли слово длины length, начинающееся с prefix, двоичным поиском"""
+        words = self.words(length)
+        i = bisect_left(words, prefix)
+        return i < len(words) and words[i].startswith(prefix)
+
+    def _ready(self, length):
+        """Есть ли автомат; False, пока его строит другой поток"""
+        return length in self._automata or length not in self._building
+
+    def contains(self, word):
+        """Есть ли слово в словаре"""
+        if not self._ready(len(word)):
+            # Слово той же длины начинается с word, только если равно ему
+            return self._search(word, len(word))
+        return self.automaton(len(word)).contains(word)
+
+    __contains__ = contains
+
+    def has_prefix(self, prefix, length):
+        """Есть ли слово из length букв, начинающееся с prefix"""
+        if not self._ready(length):
+            return self._search(prefix, length)
+        return self.automaton(length).has_prefix(prefix)
+
+    def words(self, length):
+        """Отсортированные слова заданной длины"""
+        if length in self._shards:
+            self._load(length)
+        return self._sorted.get(length, ())
+
+    def random_answer(self, length, rng=random):
+        """Случайное слово заданной длины"""
+        pool = self.words(length)
+        if not pool:
+            raise ValueError(f"В словаре нет слов из {length} букв")
+        return rng.choice(pool)
+
+    def lengths(self):
+        """Длины слов, для которых есть хотя бы одно слово"""
+        return sorted(set(self._sorted) | set(self._shards))
+
+    def count(self, length):
+        """Количество слов заданной длины"""
+        if length in self._shards:
+            return self._shards[length][0]
+        return len(self._sorted.get(length, ()))
+
+    def __len__(self):
+        return sum(self.count(length) for length in self.lengths())
@@ -0,0 +1,183 @@
+"""Нагрузочный тест server.py
+
+Без --url сервер запускается в отдельном процессе на синтетическом словаре
+(или на --words). С --url нужен и --words — словарь этого сервера, иначе
+попытки были бы незнакомыми ему словами и ни одна партия не закончилась бы.
+Каждый клиент держит своё соединение и играет партии подряд: создаёт
+партию и отправляет случайные слова, пока она не закончится. В конце
+печатаются запросы в секунду, задержки (p50, p99, максимум), ответы по
+кодам и память на одну сессию.
+
+Пример: python loadtest.py --clients 500 --duration 10
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+
+from lexicon import Lexicon
+from server import Sessions
+from synthetic import synthetic_words
+
+
+class Client:
+    """Одно keep-alive соединение с сервером"""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = self.writer = None
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def request(self, method, path, payload=None):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8") if payload else b""
+        self.writer.write(f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                          f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body)
+        await self.writer.drain()
+        head = (await self.reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+        status = int(head[0].split(" ", 2)[1])
+        length = 0
+        for line in head[1:]:
+            name, _, value = line.partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value)
+        return status, json.loads(await self.reader.readexactly(length))
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+async def player(host, port, words, length, deadline, latencies, statuses, seed):
+    """Партии подряд до deadline; задержки и коды ответов копятся в общих списках"""
+    rng = random.Random(seed)
+    client = Client(host, port)
+    await client.connect()
+
+    async def timed(method, path, payload=None):
+        start = time.perf_counter()
+        status, data = await client.request(method, path, payload)
+        latencies.append(time.perf_counter() - start)
+        statuses[status] += 1
+        return status, data
+
+    try:
+        while time.perf_counter() < deadline:
+            status, game = await timed("POST", "/games", {"length": length})
+            if status != 201:
+                break  # Ошибка уже учтена в кодах ответов; клиент выбывает
+            while not game.get("finished") and time.perf_counter() < deadline:
+                status, data = await timed("POST", f"/games/{game['id']}/guesses",
+                                           {"guess": rng.choice(words)})
+                if status == 200:
+                    game = data
+    finally:
+        client.close()
+
+
+async def run_load(host, port, words, options):
+    latencies = []
+    statuses = Counter()
+    start = time.perf_counter()
+    deadline = start + options.duration
+    await asyncio.gather(*(player(host, port, words, options.length, deadline,
+                                  latencies, statuses, seed)
+                           for seed in range(options.clients)))
+    return latencies, statuses, time.perf_counter() - start
+
+
+def session_bytes(words, length, count=10_000):
+    """Память на одну сессию после двух попыток (без самого словаря)"""
+    sessions = Sessions(Lexicon(words))
+    rng = random.Random(0)
+    tracemalloc.start()
+    for _ in range(count):
+        _, game = sessions.create(length)
+        for guess in rng.sample(words, 2):
+            game.current = guess
+            game.submit()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current / count
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def start_server(words_file):
+    """server.py в отдельном процессе; возвращает процесс и порт"""
+    directory = os.path.dirname(os.path.abspath(__file__))
+    process = subprocess.Popen([sys.executable, os.path.join(directory, "server.py"),
+                                "--port", "0", "--words", words_file],
+                               cwd=directory, stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    if not line:
+        raise SystemExit("Сервер не запустился")
+    return process, int(line.rsplit(":", 1)[1])
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Нагрузочный тест server.py")
+    parser.add_argument("--url", help="адрес запущенного сервера, например http://127.0.0.1:8080")
+    parser.add_argument("--words", help="словарь сервера (по слову на строке) для попыток")
+    parser.add_argument("--dictionary-size", type=int, default=20_000,
+                        help="размер синтетического словаря, если --words не задан")
+    parser.add_argument("--clients", type=int, default=200, help="одновременных соединений")
+    parser.add_argument("--duration", type=float, default=10, help="длительность (с)")
+    parser.add_argument("--length", type=int, default=5)
+    options = parser.parse_args(argv)
+    if options.url and not options.words:
+        parser.error("с --url нужен --words: словарь сервера для попыток")
+    return options
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    with tempfile.TemporaryDirectory() as root:
+        if options.words:
+            with open(options.words, encoding="utf-8") as f:
+                words = [w for w in Lexicon(f).words(options.length)]
+            if not words:
+                raise SystemExit(f"В словаре нет слов из {options.length} букв")
+            words_file = options.words
+        else:
+            words = synthetic_words(options.dictionary_size, options.length)
+            words_file = os.path.join(root, "words.txt")
+            with open(words_file, "w", encoding="utf-8") as f:
+                f.write("\n".join(words))
+
+        process = None
+        if options.url:
+            host, port = options.url.split("//", 1)[-1].rstrip("/").rsplit(":", 1)
+            port = int(port)
+        else:
+            process, port = start_server(words_file)
+            host = "127.0.0.1"
+        try:
+            latencies, statuses, elapsed = asyncio.run(run_load(host, port, words, options))
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait()
+
+    latencies.sort()
+    print(f"{options.clients} клиентов, {elapsed:.1f} с: {len(latencies)} запросов, "
+          f"{len(latencies) / elapsed:8.0f} запросов/с")
+    print(f"задержка: p50 {percentile(latencies, 0.5) * 1000:6.2f} мс, "
+          f"p99 {percentile(latencies, 0.99) * 1000:6.2f} мс, max {latencies[-1] * 1000:6.2f} мс")
+    print("ответы:", ", ".join(f"{status}: {count}" for status, count in sorted(statuses.items())))
+    print(f"память на сессию: {session_bytes(words, options.length):.0f} байт")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""Замеры времени этапов игры по запросу
+
+Замеры включаются переменными окружения до запуска игры:
+
+  WORDLE_METRICS=путь   времена этапов пишутся в кольцевой буфер и при
+                        выходе сохраняются в файл: .prom или .txt — текст
+                        в формате Prometheus, иначе JSON
+  WORDLE_PROFILE=путь   весь сеанс идёт под cProfile, статистика
+                        сохраняется в файл для pstats или snakeviz
+
+Без WORDLE_METRICS декоратор timed возвращает функцию без изменений, а
+record и span сводятся к одной проверке, поэтому выключенные замеры
+почти ничего не стоят. Декоратор применяется при импорте модуля, так что
+enable нужно вызывать раньше, чем импортируются размеченные модули.
+"""
+import atexit
+import contextlib
+import cProfile
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+ENV_METRICS = "WORDLE_METRICS"
+ENV_PROFILE = "WORDLE_PROFILE"
+RING_SIZE = 1024
+
+_STARTED = time.perf_counter()
+
+
+class Recorder:
+    """Последние size замеров (этап, момент от запуска, длительность) и итоги по этапам"""
+
+    def __init__(self, size=RING_SIZE):
+        self.events = deque(maxlen=size)
+        self.totals = {}  # этап -> [число, сумма, максимум]
+        self._lock = threading.Lock()
+
+    def record(self, phase, seconds):
+        with self._lock:
+            self.events.append((phase, time.perf_counter() - _STARTED - seconds, seconds))
+            total = self.totals.get(phase)
+            if total is None:
+                self.totals[phase] = [1, seconds, seconds]
+            else:
+                total[0] += 1
+                total[1] += seconds
+                total[2] = max(total[2], seconds)
+
+    def to_json(self):
+        with self._lock:
+            return json.dumps({
+                "events": [{"phase": phase, "at": at, "seconds": seconds}
+                           for phase, at, seconds in self.events],
+                "phases": {phase: {"count": count, "seconds": total, "max": longest}
+                           for phase, (count, total, longest) in sorted(self.totals.items())},
+            }, ensure_ascii=False, indent=1)
+
+    def to_prometheus(self):
+        lines = ["# HELP wordle_phase_seconds Время этапов игры",
+                 "# TYPE wordle_phase_seconds summary"]
+        with self._lock:
+            totals = sorted(self.totals.items())
+        for phase, (count, total, _) in totals:
+            lines.append(f'wordle_phase_seconds_count{{phase="{phase}"}} {count}')
+            lines.append(f'wordle_phase_seconds_sum{{phase="{phase}"}} {total:.9f}')
+        lines += ["# HELP wordle_phase_seconds_max Самый долгий замер этапа",
+                  "# TYPE wordle_phase_seconds_max gauge"]
+        for phase, (_, _, longest) in totals:
+            lines.append(f'wordle_phase_seconds_max{{phase="{phase}"}} {longest:.9f}')
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path):
+        """Сохранение замеров; формат выбирается по расширению файла"""
+        prometheus = os.path.splitext(path)[1] in (".prom", ".txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus() if prometheus else self.to_json())
+
+
+RECORDER = None
+
+
+def enable(path=None, size=RING_SIZE):
+    """Включение замеров; с path они сохраняются в файл при выходе"""
+    global RECORDER
+    RECORDER = Recorder(size)
+    if path:
+        atexit.register(RECORDER.dump, path)
+    return RECORDER
+
+
+def disable():
+    global RECORDER
+    RECORDER = None
+
+
+def record(phase, seconds):
+    """Учёт уже измеренного времени этапа"""
+    if RECORDER is not None:
+        RECORDER.record(phase, seconds)
+
+
+def timed(phase):
+    """Декоратор: время каждого вызова функции как этап phase"""
+    def decorate(func):
+        recorder = RECORDER
+        if recorder is None:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                recorder.record(phase, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+@contextlib.contextmanager
+def _span(recorder, phase):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        recorder.record(phase, time.perf_counter() - start)
+
+
+_NO_SPAN = contextlib.nullcontext()
+
+
+def span(phase):
+    """Контекстный менеджер: время блока как этап phase"""
+    if RECORDER is None:
+        return _NO_SPAN
+    return _span(RECORDER, phase)
+
+
+@contextlib.contextmanager
+def session():
+    """Сеанс игры; с WORDLE_PROFILE он целиком идёт под cProfile"""
+    path = os.environ.get(ENV_PROFILE)
+    if not path:
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+
+
+if os.environ.get(ENV_METRICS):
+    enable(os.environ[ENV_METRICS])
@@ -0,0 +1,113 @@
+"""Разбиение слов по шаблонам оценки без перебора слов в Python
+
+Слова одной длины хранятся по столбцам: для каждой позиции — строка байт,
+где у каждого слова своя «дорожка» из LANE байт с кодом его буквы. Такая
+строка, прочитанная как одно большое целое, позволяет обрабатывать все
+слова сразу: bytes.translate отмечает совпадение буквы единицей в
+дорожке, а сложение, сдвиг и маски над целым работают со всеми дорожками
+одновременно, пока значения в них не переполняются.
+
+Из этих операций собирается шаблон оценки (см. scoring.score) для всех
+слов с той же обработкой повторов: жёлтая отметка ставится, если в слове
+букв больше, чем зелёных и предыдущих незелёных отметок этой буквы.
+Проверка «a ≥ b» в каждой дорожке — старший бит дорожки в a - b + HALF.
+"""
+from array import array
+from collections import Counter
+
+from lexicon import encode_words
+from scoring import POWERS, pattern_count
+
+# Код буквы в столбце — индекс в ALPHABET плюс один, ноль заполняет дорожку
+_SHIFT_CODES = bytes(min(code + 1, 255) for code in range(256))
+_EQUAL = [bytes(1 if byte == code else 0 for byte in range(256)) for code in range(256)]
+# Дорожки из 2 байт вмещают шаблоны до 9 букв, для 10 букв нужны 4 байта
+_TYPECODES = {2: "H", 4: "I" if array("I").itemsize == 4 else "L"}
+
+
+class Partitioner:
+    """Шаблоны одной попытки против всех слов списка сразу.
+
+    Множества слов задаются «дорожками»: целым с единицей в дорожке
+    каждого слова множества (all — все слова).
+    """
+
+    __slots__ = ("words", "length", "lane", "bits", "columns", "ones", "half",
+                 "all", "_counts")
+
+    def __init__(self, words):
+        self.words = tuple(words)
+        self.length = len(self.words[0]) if self.words else 0
+        self.lane = 2 if pattern_count(self.length) <= 1 << 15 else 4
+        self.bits = self.lane * 8
+        size = len(self.words)
+        codes = encode_words(self.words).translate(_SHIFT_CODES)
+        self.columns = []
+        for position in range(self.length):
+            column = bytearray(size * self.lane)
+            column[::self.lane] = codes[position::self.length]
+            self.columns.append(bytes(column))
+        lane_one = (1).to_bytes(self.lane, "little")
+        self.ones = int.from_bytes(lane_one * size, "little")
+        self.half = self.ones << (self.bits - 1)
+        self.all = self.ones
+        self._counts = {}  # код буквы -> число таких букв в каждом слове
+
+    def _equal(self, position, code):
+        """Дорожки слов с буквой code на позиции position"""
+        return int.from_bytes(self.columns[position].translate(_EQUAL[code]), "little")
+
+    def _count(self, code):
+        count = self._counts.get(code)
+        if count is None:
+            count = sum(self._equal(position, code) for position in range(self.length))
+            self._counts[code] = count
+        return count
+
+    def patterns(self, guess):
+        """Шаблоны guess против всех слов, по дорожке на слово"""
+        codes = encode_words((guess,)).translate(_SHIFT_CODES)
+        greens = [self._equal(position, code) for position, code in enumerate(codes)]
+        occurrences = {}
+        for position, code in enumerate(codes):
+            occurrences.setdefault(code, []).append(position)
+        ones, half, shift = self.ones, self.half, self.bits - 1
+        total = 0
+        for code, positions in occurrences.items():
+            count = self._count(code)
+            # Сколько букв нужно слову для жёлтой отметки: все зелёные этой буквы,
+            # предыдущие незелёные и ещё одна
+            need = sum(greens[position] for position in positions) + ones
+            for position in positions:
+                green = greens[position]
+                other = ones ^ green
+                yellow = other & ((count + half - need) >> shift) & ones
+                total += (2 * green + yellow) * POWERS[position]
+                need += other
+        return total
+
+    def counts(self, patterns, lanes=None):
+        """Размеры групп {шаблон: число слов} среди слов из lanes"""
+        data = array(_TYPECODES[self.lane])
+        if lanes is not None and lanes != self.all:
+            # Шаблоны слов вне множества заменяются значением, которого не бывает
+            sentinel = (1 << self.bits) - 1
+            patterns |= (self.ones ^ lanes) * sentinel
+            data.frombytes(patterns.to_bytes(len(self.words) * self.lane, "little"))
+            counts = Counter(data)
+            counts.pop(sentinel, None)
+            return counts
+        data.frombytes(patterns.to_bytes(len(self.words) * self.lane, "little"))
+        return Counter(data)
+
+    def select(self, patterns, pattern, lanes=None):
+        """Дорожки слов с шаблоном pattern (из lanes, если задано)"""
+        differs = ((patterns ^ (self.ones * pattern)) + self.half - self.ones) >> (self.bits - 1)
+        selected = self.ones ^ (differs & self.ones)
+        return selected if lanes is None else selected & lanes
+
+    def decode(self, lanes):
+        """Слова из множества lanes"""
+        data = array(_TYPECODES[self.lane])
+        data.frombytes(lanes.to_bytes(len(self.words) * self.lane, "little"))
+        return [word for word, flag in zip(self.words, data) if flag]
@@ -0,0 +1,125 @@
+"""Предрасчитанная матрица шаблонов «попытка × ответ»
+
+Для каждой длины слова матрица строится один раз по отсортированному списку
+lexicon.words(length) и хранится на диске: строка i — шаблоны оценки
+(см. scoring) попытки words[i] против всех слов. Имя файла содержит
+контрольную сумму списка слов, поэтому матрица пересобирается только при
+изменении словаря. Файл отображается в память и читается по строкам.
+
+Шаблоны 5 букв (243 значения) хранятся в uint8, а для 6 букв и длиннее
+(729 значений и больше) в uint16 с порядком байтов машины. Объём матрицы
+для N слов — N² байт для 5 букв и 2·N² байт для 6 букв:
+
+    слов      5 букв     6 букв
+    5 000     25 МБ      50 МБ
+    10 000    100 МБ     200 МБ
+    30 000    900 МБ     1.8 ГБ
+
+При сборке в памяти процесса держится только один блок строк.
+"""
+import glob
+import mmap
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from cache import digest
+from lexicon import encode_words
+from scoring import pattern_count, score_batch
+
+CHUNK_ROWS = 256
+
+_worker_words = None
+
+
+def itemsize(length):
+    """Размер одного шаблона в байтах"""
+    return 1 if pattern_count(length) <= 256 else 2
+
+
+def matrix_path(words, length, directory="."):
+    """Путь к файлу матрицы для данного списка слов"""
+    checksum = digest(encode_words(words)).hex()
+    return os.path.join(directory, f"wordle_patterns_{length}_{checksum}.bin")
+
+
+def _init_worker(codes, length):
+    global _worker_words
+    _worker_words = [codes[i:i + length] for i in range(0, len(codes), length)]
+
+
+def _build_rows(start, stop, size):
+    rows = array("B" if size == 1 else "H")
+    for guess in _worker_words[start:stop]:
+        rows.fromlist(score_batch(guess, _worker_words).tolist())
+    return rows.tobytes()
+
+
+def build_matrix(words, length, path, workers=None, chunk_rows=CHUNK_ROWS):
+    """Сборка матрицы блоками строк в пуле процессов.
+
+    Файл пишется под временным именем и переименовывается в конце, так что
+    прерванная сборка не оставляет неполной матрицы.
+    """
+    codes = encode_words(words)
+    size = itemsize(length)
+    tmp_path = path + ".tmp"
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(codes, length)) as pool:
+        starts = range(0, len(words), chunk_rows)
+        chunks = pool.map(_build_rows, starts,
+                          [start + chunk_rows for start in starts],
+                          [size] * len(starts))
+        with open(tmp_path, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+    os.replace(tmp_path, path)
+
+
+class PatternMatrix:
+    """Матрица шаблонов, отображённая в память"""
+
+    def __init__(self, path, words, length):
+        self.words = tuple(words)
+        self.length = length
+        self.index = {word: i for i, word in enumerate(self.words)}
+        size = len(self.words)
+        with open(path, "rb") as f:
+            if size:
+                self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self._view = memoryview(self._buffer).cast("B" if itemsize(length) == 1 else "H")
+            else:
+                self._view = memoryview(array("H"))
+        if len(self._view) != size * size:
+            raise ValueError(f"Матрица {path} не соответствует словарю")
+
+    def row(self, guess):
+        """Шаблоны попытки против всех слов (по индексу или самому слову)"""
+        i = self.index[guess] if isinstance(guess, str) else guess
+        size = len(self.words)
+        return self._view[i * size:(i + 1) * size]
+
+    def pattern(self, guess, answer):
+        """Шаблон одной пары слов"""
+        i = self.index[guess] if isinstance(guess, str) else guess
+        j = self.index[answer] if isinstance(answer, str) else answer
+        return self._view[i * len(self.words) + j]
+
+
+def load_matrix(lexicon, length, directory=".", workers=None):
+    """Матрица шаблонов для слов заданной длины; собирается, если её нет.
+
+    Матрицы этой длины для прежних версий словаря удаляются.
+    """
+    words = lexicon.words(length)
+    path = matrix_path(words, length, directory)
+    if not os.path.exists(path):
+        for stale in glob.glob(os.path.join(directory, f"wordle_patterns_{length}_*.bin")):
+            os.remove(stale)
+        build_matrix(words, length, path, workers)
+    try:
+        return PatternMatrix(path, words, length)
+    except ValueError:
+        os.remove(path)
+        build_matrix(words, length, path, workers)
+        return PatternMatrix(path, words, length)
@@ -0,0 +1,99 @@
+"""Оценка попыток в виде чисел-шаблонов
+
+Отметка каждой буквы — 0 (серая), 1 (жёлтая) или 2 (зелёная), а вся оценка
+попытки кодируется числом в троичной записи: отметка i-й буквы умножается
+на 3**i. Для слов до 10 букв шаблон помещается в 16 бит.
+"""
+from array import array
+
+GRAY, YELLOW, GREEN = 0, 1, 2
+COLORS = ("gray", "yellow", "green")
+POWERS = tuple(3 ** i for i in range(16))
+GREEN_WEIGHTS = tuple(GREEN * power for power in POWERS)
+PATTERN_TYPECODE = "H"
+
+
+def pattern_count(length):
+    """Число различных шаблонов для слов заданной длины"""
+    return 3 ** length
+
+
+def winning_pattern(length):
+    """Шаблон полностью угаданного слова"""
+    return pattern_count(length) - 1
+
+
+def score(guess, target):
+    """Шаблон оценки guess относительно target.
+
+    Повторы букв обрабатываются как в исходной двухпроходной проверке:
+    сначала отмечаются точные совпадения, затем оставшиеся буквы загаданного
+    слова раздаются жёлтыми отметками слева направо.
+    """
+    pattern = 0
+    remaining = {}
+    misses = []
+    for i, letter in enumerate(target):
+        if guess[i] == letter:
+            pattern += POWERS[i] * GREEN
+        else:
+            remaining[letter] = remaining.get(letter, 0) + 1
+            misses.append(i)
+    for i in misses:
+        letter = guess[i]
+        left = remaining.get(letter)
+        if left:
+            pattern += POWERS[i]
+            remaining[letter] = left - 1
+    return pattern
+
+
+def score_batch(guess, targets):
+    """Шаблоны одной попытки против N загаданных слов.
+
+    targets — последовательность слов (строк или байтов с кодами букв, см.
+    lexicon.encode_words). Возвращает array('H') длины N.
+    """
+    letters = set(guess)
+    patterns = array(PATTERN_TYPECODE)
+    append = patterns.append
+    if len(letters) < len(guess):
+        for target in targets:
+            # Без общих букв оценка всегда полностью серая
+            if letters.isdisjoint(target):
+                append(0)
+            else:
+                append(score(guess, target))
+        return patterns
+
+    # Без повторов в попытке буква не на месте жёлтая ровно тогда, когда
+    # она есть в загаданном слове: зелёным её там отметить негде
+    weights = tuple(zip(guess, GREEN_WEIGHTS, POWERS))
+    for target in targets:
+        if letters.isdisjoint(target):
+            append(0)
+            continue
+        pattern = 0
+        for (letter, green, yellow), other in zip(weights, target):
+            if letter == other:
+                pattern += green
+            elif letter in target:
+                pattern += yellow
+        append(pattern)
+    return patterns
+
+
+def score_matrix(guesses, targets):
+    """Шаблоны M попыток против N загаданных слов: список из M массивов"""
+    targets = list(targets)
+    return [score_batch(guess, targets) for guess in guesses]
+
+
+def decode_pattern(pattern, length):
+    """Цвета клеток для шаблона"""
+    colors = []
+    for _ in range(length):
+        pattern, mark = divmod(pattern, 3)
+        colors.append(COLORS[mark])
+    return colors
+
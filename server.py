@@ -0,0 +1,257 @@
+"""HTTP-сервер для многих игроков в одном процессе
+
+Словарь загружается один раз и общий для всех партий, а каждая партия —
+обычная engine.Game без кандидатов: те же выбор слова, проверка попытки
+и оценка, что и в окне игры, но всего несколько сотен байт на сессию.
+Сессии, к которым долго не обращались, вытесняются. Сервер написан на
+asyncio без сторонних библиотек и понимает HTTP/1.1 с keep-alive.
+
+API (тела запросов и ответов — JSON):
+  POST /games                {"length": 5}      новая партия: id, длина, число попыток
+  POST /games/<id>/guesses   {"guess": "столб"} оценка попытки: цвета букв и итог
+  GET  /games/<id>                              состояние партии
+  GET  /stats                                   число сессий и вытесненных
+
+Пример: python server.py --port 8080 --idle 600
+"""
+import argparse
+import asyncio
+import json
+import secrets
+import time
+from collections import OrderedDict
+
+from dictionary import read_lexicon
+from engine import Game
+from scoring import decode_pattern
+
+IDLE_TIMEOUT = 600
+MAX_BODY = 4096
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 413: "Payload Too Large", 422: "Unprocessable Entity"}
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class Session:
+    __slots__ = ("game", "seen")
+
+    def __init__(self, game, seen):
+        self.game = game
+        self.seen = seen
+
+
+class Sessions:
+    """Партии по id; порядок словаря — от давно не использованных к недавним.
+
+    Поэтому вытеснение просматривает только вытесняемые сессии и первую живую.
+    """
+
+    def __init__(self, lexicon, idle=IDLE_TIMEOUT, max_attempts=6, clock=time.monotonic):
+        self.lexicon = lexicon
+        self.idle = idle
+        self.max_attempts = max_attempts
+        self.clock = clock
+        self.sessions = OrderedDict()
+        self.evicted = 0
+
+    def create(self, length=5):
+        if not self.lexicon.words(length):
+            raise HttpError(400, f"В словаре нет слов из {length} букв")
+        session_id = secrets.token_urlsafe(9)
+        game = Game(self.lexicon, length, self.max_attempts)
+        self.sessions[session_id] = Session(game, self.clock())
+        return session_id, game
+
+    def get(self, session_id):
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise HttpError(404, "Партия не найдена или закончилась по таймауту")
+        session.seen = self.clock()
+        self.sessions.move_to_end(session_id)
+        return session.game
+
+    def evict(self):
+        """Удаление сессий, простаивающих дольше idle; возвращает их число"""
+        deadline = self.clock() - self.idle
+        count = 0
+        while self.sessions:
+            session_id, session = next(iter(self.sessions.items()))
+            if session.seen > deadline:
+                break
+            del self.sessions[session_id]
+            count += 1
+        self.evicted += count
+        return count
+
+    def __len__(self):
+        return len(self.sessions)
+
+
+def game_state(session_id, game):
+    """Состояние партии для ответа; загаданное слово — только после конца"""
+    state = {
+        "id": session_id,
+        "length": game.length,
+        "max_attempts": game.max_attempts,
+        "attempts": game.attempts,
+        "guesses": [{"guess": guess, "colors": decode_pattern(pattern, game.length)}
+                    for guess, pattern in zip(game.guesses, game.patterns)],
+        "finished": game.finished,
+        "won": game.won,
+    }
+    if game.finished:
+        state["target"] = game.target
+    return state
+
+
+class GameServer:
+    def __init__(self, sessions):
+        self.sessions = sessions
+
+    def route(self, method, path, body):
+        """(статус, JSON ответа) для запроса"""
+        parts = path.split("?", 1)[0].strip("/").split("/")
+        if parts == ["stats"] and method == "GET":
+            return 200, {"sessions": len(self.sessions), "evicted": self.sessions.evicted}
+        if parts[0] != "games" or len(parts) > 3:
+            raise HttpError(404, "Нет такого адреса")
+        if len(parts) == 1:
+            if method != "POST":
+                raise HttpError(405, "Новая партия создаётся запросом POST")
+            length = self.read_json(body).get("length", 5)
+            if not isinstance(length, int):
+                raise HttpError(400, "length должно быть числом")
+            session_id, game = self.sessions.create(length)
+            return 201, game_state(session_id, game)
+
+        session_id = parts[1]
+        game = self.sessions.get(session_id)
+        if len(parts) == 2:
+            if method != "GET":
+                raise HttpError(405, "Состояние партии читается запросом GET")
+            return 200, game_state(session_id, game)
+        if parts[2] != "guesses" or method != "POST":
+            raise HttpError(404, "Нет такого адреса")
+        guess = self.read_json(body).get("guess")
+        if not isinstance(guess, str):
+            raise HttpError(400, "Нужно поле guess со словом")
+        game.current = guess.strip().lower()
+        result = game.submit()
+        if result.rejected:
+            game.current = ""
+            return 422, {"error": result.rejected, "message": result.message(game.length)}
+        return 200, game_state(session_id, game)
+
+    @staticmethod
+    def read_json(body):
+        if not body:
+            return {}
+        try:
+            data = json.loads(body)
+        except ValueError:
+            raise HttpError(400, "Тело запроса — не JSON")
+        if not isinstance(data, dict):
+            raise HttpError(400, "Тело запроса должно быть объектом JSON")
+        return data
+
+    async def handle(self, reader, writer):
+        """Запросы одного соединения по очереди, пока клиент его не закроет"""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                keep_alive = False
+                try:
+                    lines = head.decode("latin-1").split("\r\n")
+                    method, path, version = lines[0].split(" ", 2)
+                    headers = {}
+                    for line in lines[1:]:
+                        name, _, value = line.partition(":")
+                        headers[name.strip().lower()] = value.strip()
+                    length = int(headers.get("content-length") or 0)
+                    if length > MAX_BODY:
+                        raise HttpError(413, "Слишком большое тело запроса")
+                    body = await reader.readexactly(length) if length else b""
+                    keep_alive = (version == "HTTP/1.1"
+                                  and headers.get("connection", "").lower() != "close")
+                    status, payload = self.route(method, path, body.decode("utf-8", "replace"))
+                except HttpError as e:
+                    status, payload = e.status, {"error": status_name(e.status), "message": str(e)}
+                except ValueError:
+                    status, payload = 400, {"error": status_name(400), "message": "Неверный запрос"}
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                writer.write(response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+    async def sweep(self, interval):
+        """Периодическое вытеснение простаивающих сессий"""
+        while True:
+            await asyncio.sleep(interval)
+            self.sessions.evict()
+
+
+def status_name(status):
+    return REASONS[status].lower().replace(" ", "_")
+
+
+def response(status, payload, keep_alive):
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    head = (f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode("latin-1") + body
+
+
+async def serve(options, lexicon):
+    sessions = Sessions(lexicon, options.idle)
+    game_server = GameServer(sessions)
+    server = await asyncio.start_server(game_server.handle, options.host, options.port,
+                                        backlog=options.backlog)
+    host, port = server.sockets[0].getsockname()[:2]
+    print(f"Сервер слушает http://{host}:{port}", flush=True)
+    sweeper = asyncio.create_task(game_server.sweep(max(1, min(options.idle / 4, 30))))
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        sweeper.cancel()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP-сервер Wordle для многих игроков")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080, help="0 — любой свободный порт")
+    parser.add_argument("--words", help="текстовый словарь вместо кэша игры")
+    parser.add_argument("--idle", type=float, default=IDLE_TIMEOUT,
+                        help="через сколько секунд простоя партия вытесняется")
+    parser.add_argument("--backlog", type=int, default=1024)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    lexicon = read_lexicon(options.words)
+    if not len(lexicon):
+        raise SystemExit("Словарь не загружен")
+    lexicon.warm_up(lexicon.lengths())
+    try:
+        asyncio.run(serve(options, lexicon))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
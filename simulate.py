@@ -0,0 +1,163 @@
+"""Пакетная симуляция партий
+
+Каждое слово словаря (или случайная выборка) загадывается по очереди, а
+стратегия отгадывает его по обычным правилам engine.Game. Партии
+раздаются пулу процессов блоками. Каждый процесс читает из кэша словаря
+только шард нужной длины, а матрица шаблонов (--matrix) отображается в
+память, поэтому её страницы общие. Результат не зависит от числа
+процессов при одинаковом --seed.
+
+Пример: python simulate.py --length 5 --sample 2000 --strategy entropy
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from constraints import LetterIndex
+from dictionary import read_lexicon
+from engine import Game
+from patterns import load_matrix
+from solver import Solver
+
+STRATEGIES = ("entropy", "candidate", "first")
+CHUNK_SIZE = 100
+
+_worker = None
+
+
+class Player:
+    """Словарь и стратегия одного процесса"""
+
+    def __init__(self, options):
+        self.options = options
+        self.lexicon = read_lexicon(options.words)
+        self.index = LetterIndex(self.lexicon.words(options.length))
+        self.solver = None
+        if options.strategy == "entropy":
+            matrix = load_matrix(self.lexicon, options.length) if options.matrix else None
+            self.solver = Solver(self.index, matrix)
+
+    def choose(self, game, rng):
+        candidates = game.candidates
+        if self.solver is not None:
+            return self.solver.best_guess(candidates, game.hard_mode)
+        words = candidates.words()
+        if self.options.strategy == "first":
+            return words[0]
+        return rng.choice(words)
+
+    def play(self, number, target):
+        """Одна партия: число попыток (0 при проигрыше) и сами попытки"""
+        rng = random.Random(f"{self.options.seed}:{number}")
+        game = Game(self.lexicon, self.options.length, self.options.max_attempts,
+                    target=target, index=self.index)
+        while not game.finished:
+            game.current = self.choose(game, rng)
+            game.submit()
+        return target, game.attempts if game.won else 0, game.guesses
+
+
+def _init_worker(options):
+    global _worker
+    _worker = Player(options)
+
+
+def _play_chunk(chunk):
+    return [_worker.play(number, target) for number, target in chunk]
+
+
+def select_targets(lexicon, options):
+    """Загадываемые слова: все или детерминированная выборка"""
+    words = lexicon.words(options.length)
+    if options.sample and options.sample < len(words):
+        words = random.Random(options.seed).sample(words, options.sample)
+    return list(enumerate(words))
+
+
+def run(options, out=sys.stdout):
+    """Симуляция с выводом промежуточных итогов; возвращает сводку"""
+    lexicon = read_lexicon(options.words)
+    targets = select_targets(lexicon, options)
+    if not targets:
+        raise SystemExit(f"В словаре нет слов из {options.length} букв")
+    if options.strategy == "entropy":
+        # Общие для всех процессов данные готовятся заранее и сохраняются в файлы
+        index = LetterIndex(lexicon.words(options.length))
+        if options.matrix:
+            load_matrix(lexicon, options.length, workers=options.workers)
+        Solver(index).opener()
+
+    chunks = [targets[i:i + CHUNK_SIZE] for i in range(0, len(targets), CHUNK_SIZE)]
+    distribution = Counter()
+    worst = []
+    played = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=options.workers, initializer=_init_worker,
+                             initargs=(options,)) as pool:
+        for results in pool.map(_play_chunk, chunks):
+            for target, attempts, guesses in results:
+                distribution[attempts] += 1
+                worst.append((attempts or options.max_attempts + 1, target, guesses))
+            worst = sorted(worst, key=lambda item: (-item[0], item[1]))[:options.worst]
+            played += len(results)
+            elapsed = time.perf_counter() - start
+            print(f"{played}/{len(targets)} партий, {played / elapsed:8.1f} партий/с, "
+                  f"выиграно {1 - distribution[0] / played:6.1%}", file=out, flush=True)
+
+    elapsed = time.perf_counter() - start
+    wins = played - distribution[0]
+    summary = {
+        "length": options.length,
+        "strategy": options.strategy,
+        "seed": options.seed,
+        "games": played,
+        "win_rate": wins / played,
+        "mean_guesses": sum(n * c for n, c in distribution.items() if n) / wins if wins else None,
+        "distribution": {str(n): distribution[n] for n in sorted(distribution)},
+        "games_per_second": played / elapsed,
+        "worst": [{"target": target, "guesses": guesses} for _, target, guesses in worst],
+    }
+    print(f"Выиграно {summary['win_rate']:.2%} из {played}, "
+          f"{summary['games_per_second']:.1f} партий/с", file=out)
+    for n in sorted(distribution):
+        label = "не отгадано" if n == 0 else f"{n} попыток"
+        print(f"  {label:>12}: {distribution[n]}", file=out)
+    print("Труднее всего:", ", ".join(item["target"] for item in summary["worst"]), file=out)
+    return summary
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Симуляция партий Wordle")
+    parser.add_argument("--length", type=int, default=5, help="длина слова")
+    parser.add_argument("--strategy", choices=STRATEGIES, default="entropy",
+                        help="entropy — подсказки solver, candidate — случайный "
+                             "возможный ответ, first — первый возможный ответ")
+    parser.add_argument("--sample", type=int, default=0,
+                        help="сколько слов загадать (по умолчанию все)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-attempts", type=int, default=6)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="число процессов (по умолчанию по числу ядер)")
+    parser.add_argument("--words", help="текстовый словарь вместо кэша игры")
+    parser.add_argument("--matrix", action="store_true",
+                        help="использовать предрасчитанную матрицу шаблонов")
+    parser.add_argument("--worst", type=int, default=10, help="сколько худших слов показать")
+    parser.add_argument("--history", help="файл JSON Lines, куда дописывается сводка")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    summary = run(options)
+    if options.history:
+        summary["timestamp"] = time.time()
+        with open(options.history, "a", encoding="utf-8") as f:
+            f.write(json.dumps(summary, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    main()
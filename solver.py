@@ -0,0 +1,162 @@
+"""Подбор следующей попытки по ожидаемой информации
+
+Попытка оценивается энтропией распределения шаблонов (см. scoring) по
+оставшимся кандидатам: чем равномернее она делит кандидатов на группы,
+тем больше бит информации даст ответ. Чтобы укладываться примерно
+в 100 мс на полном словаре:
+
+* точно считаются только самые перспективные попытки по частотам букв
+  (не больше GUESS_LIMIT), а число пар «попытка × кандидат» ограничено
+  PAIR_BUDGET;
+* шаблоны считаются пачкой через score_batch или берутся из матрицы
+  patterns.PatternMatrix, если она загружена;
+* лучший ответ для уже встречавшегося множества кандидатов запоминается,
+  а первая попытка для каждой длины и версии словаря считается в фоне
+  (warm_up) и сохраняется в файл.
+"""
+import heapq
+import json
+import math
+import os
+import random
+import threading
+from collections import Counter
+
+from cache import digest
+from lexicon import encode_words
+from scoring import score_batch
+
+PAIR_BUDGET = 30_000
+GUESS_LIMIT = 300
+OPENER_BUDGET = 1_000_000
+MEMO_SIZE = 1_000
+OPENERS_FILE = "wordle_openers.json"
+# Первые попытки разных длин могут считаться в нескольких потоках сразу
+_openers_lock = threading.Lock()
+
+
+def entropy(counts, total):
+    """Энтропия в битах распределения размеров групп"""
+    return math.log2(total) - sum(c * math.log2(c) for c in counts) / total
+
+
+class Solver:
+    """Подсказки для слов одной длины (по constraints.LetterIndex)"""
+
+    def __init__(self, index, matrix=None, budget=PAIR_BUDGET, openers_file=OPENERS_FILE):
+        self.index = index
+        self.matrix = matrix
+        self.budget = budget
+        self.openers_file = openers_file
+        self._memo = {}
+        self._opener = None
+        self._opener_lock = threading.Lock()
+        # Повторная буква новой информации почти не даёт, поэтому для
+        # ранжирования у каждого слова берутся только различные буквы
+        self._letters = [(word, tuple(set(word))) for word in index.words]
+
+    def expected_information(self, guess, words):
+        """Сколько бит в среднем даст попытка guess при кандидатах words"""
+        if self.matrix is not None:
+            row = self.matrix.row(guess)
+            patterns = map(row.__getitem__, map(self.index.word_index.__getitem__, words))
+        else:
+            patterns = score_batch(guess, words)
+        return entropy(Counter(patterns).values(), len(words))
+
+    def rank_guesses(self, words, mask, limit, hard_mode=False):
+        """Самые перспективные попытки по частотам букв среди кандидатов.
+
+        В сложном режиме попытками могут быть только сами кандидаты: слово,
+        противоречащее подсказкам, игра не примет. mask — битсет тех же
+        слов в constraints.LetterIndex.
+        """
+        # Сколько кандидатов содержит букву: пересечение с битсетом буквы
+        presence = Counter({letter: (mask & bits).bit_count()
+                            for (letter, k), bits in self.index.at_least.items() if k == 1})
+        candidates = set(words)
+        get = presence.__getitem__
+
+        def weight(item):
+            word, letters = item
+            return sum(map(get, letters)) + (0.5 if word in candidates else 0)
+
+        pool = self._letters
+        if hard_mode:
+            pool = [item for item in pool if item[0] in candidates]
+        return [word for word, _ in heapq.nlargest(limit, pool, key=weight)]
+
+    def best_guess(self, candidates, hard_mode=False):
+        """Попытка с наибольшей ожидаемой информацией для constraints.Candidates"""
+        key = (candidates.mask, hard_mode)
+        if key in self._memo:
+            return self._memo[key]
+        if candidates.mask == self.index.all:
+            # До первой попытки подсказок нет, и сложный режим ничего не меняет
+            guess = self.opener()
+        else:
+            guess = self._search(candidates.words(), candidates.mask, self.budget,
+                                 hard_mode=hard_mode)
+        if len(self._memo) >= MEMO_SIZE:
+            self._memo.clear()
+        self._memo[key] = guess
+        return guess
+
+    def _search(self, words, mask, budget, rng=None, hard_mode=False):
+        if len(words) <= 2:
+            return words[0] if words else None
+        sample = words
+        if len(words) * 8 > budget:
+            # Энтропию оцениваем по случайной выборке кандидатов
+            sample = (rng or random.Random(len(words))).sample(words, budget // 8)
+        candidates = set(words)
+        best, best_score = None, -1.0
+        limit = max(1, min(budget // len(sample), GUESS_LIMIT))
+        for guess in self.rank_guesses(words, mask, limit, hard_mode):
+            value = self.expected_information(guess, sample)
+            # При равной информации лучше слово, которое может оказаться ответом
+            if guess in candidates:
+                value += 1 / len(words)
+            if value > best_score:
+                best, best_score = guess, value
+        return best
+
+    def warm_up(self):
+        """Расчёт первой попытки в фоновом потоке, чтобы подсказка его не ждала"""
+        threading.Thread(target=self.opener, daemon=True).start()
+        return self
+
+    def opener(self):
+        """Первая попытка; считается один раз для каждой версии словаря"""
+        with self._opener_lock:
+            if self._opener is None:
+                self._opener = self._find_opener()
+        return self._opener
+
+    def _find_opener(self):
+        length = str(self.index.length)
+        checksum = digest(encode_words(self.index.words)).hex()
+        saved = self._read_openers().get(length)
+        if saved and saved.get("checksum") == checksum:
+            return saved["word"]
+
+        word = self._search(list(self.index.words), self.index.all, OPENER_BUDGET,
+                            random.Random(0))
+        with _openers_lock:
+            openers = self._read_openers()
+            openers[length] = {"checksum": checksum, "word": word}
+            try:
+                with open(self.openers_file, 'w', encoding='utf-8') as f:
+                    json.dump(openers, f, ensure_ascii=False)
+            except OSError as e:
+                print(f"Ошибка сохранения первой попытки: {e}")
+        return word
+
+    def _read_openers(self):
+        if not os.path.exists(self.openers_file):
+            return {}
+        try:
+            with open(self.openers_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
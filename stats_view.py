@@ -0,0 +1,48 @@
+"""Окно статистики по журналу партий (gamelog)"""
+import tkinter as tk
+from tkinter import messagebox
+
+from gamelog import MAX_GUESSES, LogError
+
+BAR_WIDTH = 30  # Ширина самой длинной полосы распределения в символах
+
+
+def show_stats(root, log, bg="#f0f0f0"):
+    """Окно со сводкой: побед, серии, распределение попыток, трудные слова.
+
+    Если журнал не читается, вместо окна показывается сообщение и
+    возвращается None.
+    """
+    try:
+        stats = log.stats()
+    except (OSError, LogError) as e:
+        messagebox.showwarning("Ошибка", f"Журнал партий не прочитан: {e}")
+        return None
+    window = tk.Toplevel(root, bg=bg)
+    window.title("Статистика")
+
+    summary = (f"Партий: {stats.games}   Побед: {stats.win_rate:.0%}\n"
+               f"Серия: {stats.current_streak}   Лучшая серия: {stats.max_streak}")
+    tk.Label(window, text=summary, font=("Arial", 12), bg=bg).pack(padx=20, pady=10)
+
+    tk.Label(window, text="Распределение попыток", font=("Arial", 11, "bold"),
+             bg=bg).pack()
+    bars = tk.Frame(window, bg=bg)
+    bars.pack(padx=20, pady=5)
+    most = max(stats.distribution.values()) or 1
+    for attempts in range(1, MAX_GUESSES + 1):
+        games = stats.distribution[attempts]
+        tk.Label(bars, text=str(attempts), font=("Arial", 10), bg=bg).grid(row=attempts, column=0)
+        tk.Label(bars, text=str(games), anchor="e", font=("Arial", 9), fg="white",
+                 bg="#6aaa64" if games else "#787c7e",
+                 width=max(2, games * BAR_WIDTH // most)).grid(row=attempts, column=1,
+                                                              sticky="w", pady=1)
+
+    if stats.hardest:
+        hardest = ", ".join(f"{word.upper()} ({mean:.1f})"
+                            for word, _, mean, _ in stats.hardest[:5])
+        tk.Label(window, text=f"Труднее всего: {hardest}", font=("Arial", 10),
+                 wraplength=300, bg=bg).pack(padx=20, pady=10)
+    tk.Button(window, text="Закрыть", command=window.destroy,
+              bg="#d3d6da").pack(pady=(0, 10))
+    return window
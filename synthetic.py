@@ -0,0 +1,35 @@
+"""Синтетические словари и исходная проверка попытки для замеров и тестов"""
+import random
+
+from lexicon import ALPHABET
+
+
+def synthetic_words(count, length, seed=0, letters=ALPHABET):
+    """Случайные «слова» для проверки масштабирования.
+
+    С несколькими letters буквы в словах часто повторяются, что проверяет
+    все ветви оценки. Слов не больше, чем различных строк из letters.
+    """
+    rng = random.Random(seed)
+    count = min(count, len(letters) ** length)
+    words = set()
+    while len(words) < count:
+        words.add("".join(rng.choice(letters) for _ in range(length)))
+    return sorted(words)
+
+
+def reference_check_guess(guess, target):
+    """Исходная двухпроходная проверка из WordleGame.check_guess"""
+    feedback = []
+    target_list = list(target)
+    for i in range(len(guess)):
+        if guess[i] == target[i]:
+            feedback.append("green")
+            target_list[i] = None
+        else:
+            feedback.append("gray")
+    for i in range(len(guess)):
+        if feedback[i] != "green" and guess[i] in target_list:
+            feedback[i] = "yellow"
+            target_list[target_list.index(guess[i])] = None
+    return feedback
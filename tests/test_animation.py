@@ -0,0 +1,121 @@
+"""Анимации без дисплея: кадры на виртуальных часах вместо главного цикла Tk"""
+import heapq
+
+from animation import REVEAL_STEP, SHAKE_OFFSETS, Animator
+
+
+class VirtualRoot:
+    """after/after_cancel с виртуальным временем в мс; run() проматывает его"""
+
+    def __init__(self):
+        self.now = 0.0
+        self._timers = []
+        self._counter = 0
+
+    def clock(self):
+        return self.now / 1000
+
+    def after(self, delay, callback):
+        self._counter += 1
+        heapq.heappush(self._timers, (self.now + delay, self._counter, callback))
+        return self._counter
+
+    def after_cancel(self, after_id):
+        self._timers = [timer for timer in self._timers if timer[1] != after_id]
+        heapq.heapify(self._timers)
+
+    def run(self, until=None):
+        while self._timers and (until is None or self._timers[0][0] <= until):
+            due, _, callback = heapq.heappop(self._timers)
+            self.now = max(self.now, due)
+            callback()
+        if until is not None:
+            self.now = max(self.now, until)
+
+
+class Cell:
+    """Клетка, запоминающая вызовы с моментом (мс)"""
+
+    def __init__(self, root):
+        self.root = root
+        self.calls = []
+
+    def config(self, **options):
+        self.calls.append((self.root.now, "config", options))
+
+    def grid_configure(self, **options):
+        self.calls.append((self.root.now, "grid_configure", options))
+
+
+def make(count=5):
+    root = VirtualRoot()
+    return root, Animator(root, clock=root.clock), [Cell(root) for _ in range(count)]
+
+
+def test_reveal_is_tile_by_tile():
+    root, animator, cells = make()
+    end = animator.reveal(cells, ["green", "gray", "yellow", "gray", "green"])
+    assert animator.busy() and not any(cell.calls for cell in cells)
+    root.run()
+    for i, cell in enumerate(cells):
+        [(moment, method, options)] = cell.calls
+        assert abs(moment - i * REVEAL_STEP) <= animator.frame_ms
+    assert cells[2].calls[0][2] == {"bg": "yellow"}
+    assert end == len(cells) * REVEAL_STEP and not animator.busy()
+
+
+def test_changes_in_one_frame_are_batched():
+    root, animator, cells = make()
+    animator.shake(cells)
+    animator.shake(cells, start=5)  # те же кадры, что и первая тряска
+    root.run()
+    for cell in cells:
+        assert len(cell.calls) == len(SHAKE_OFFSETS)
+    # Каждый кадр — одно изменение на клетку
+    assert all(changed == len(cells) for _, _, changed in animator.frames)
+
+
+def test_input_is_handled_between_frames():
+    root, animator, cells = make()
+    animator.flash(cells, "green")
+    typed = []
+    root.after(100, lambda: typed.append(root.now))
+    root.run(until=100)
+    assert typed == [100] and animator.busy()
+    root.run()
+    assert cells[0].calls[-1][2] == {"bg": "green"}
+
+
+def test_callbacks_run_after_the_frame_changes():
+    root, animator, cells = make(1)
+    animator.schedule(50, cells[0], bg="green")
+    animator.call_later(50, lambda: cells[0].calls.append((root.now, "callback", {})))
+    root.run()
+    assert [method for _, method, _ in cells[0].calls] == ["config", "callback"]
+
+
+def test_frame_timing_is_recorded():
+    root, animator, cells = make()
+    animator.reveal(cells, ["green"] * len(cells))
+    root.run()
+    assert len(animator.frames) == len(cells)
+    late, cost, changed = animator.frames[0]
+    assert late == 0 and cost >= 0 and changed == 1
+
+
+def test_clear_cancels_pending_changes():
+    root, animator, cells = make()
+    animator.reveal(cells, ["green"] * len(cells))
+    root.run(until=REVEAL_STEP)
+    animator.clear()
+    root.run()
+    assert sum(len(cell.calls) for cell in cells) == 2
+
+
+def test_shake_never_uses_negative_padding():
+    root, animator, cells = make(2)
+    for pad in (0, 1, 3):
+        animator.shake(cells, pad=pad)
+        root.run()
+    paddings = [options["padx"] for cell in cells for _, _, options in cell.calls]
+    assert paddings and all(min(padx) >= 0 for padx in paddings)
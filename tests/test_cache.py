@@ -0,0 +1,146 @@
+"""Двоичный кэш и проверка обновлений на локальном источнике"""
+import hashlib
+import http.server
+import threading
+from collections import Counter
+
+import pytest
+
+from cache import ENTRY, HEADER, CacheError, open_cache, read_metadata, write_cache
+from dictionary import fetch_lexicon, load_lexicon, open_lexicon, revalidate_lexicon
+from engine import Game
+from lexicon import Lexicon
+from synthetic import synthetic_words
+
+
+def test_round_trip_decodes_shards_lazily(tmp_path):
+    words = synthetic_words(300, 5) + synthetic_words(200, 7, seed=1)
+    path = str(tmp_path / "words.bin")
+    write_cache(path, Lexicon(words), {"sources": {"a": {"etag": '"1"'}}})
+    lexicon = open_cache(path)
+    assert lexicon.lengths() == [5, 7] and lexicon.count(7) == 200
+    assert lexicon.words(5) == tuple(sorted(synthetic_words(300, 5)))
+    assert read_metadata(path) == {"sources": {"a": {"etag": '"1"'}}}
+
+
+def test_cache_can_be_replaced_while_in_use(tmp_path):
+    path = str(tmp_path / "words.bin")
+    write_cache(path, Lexicon(["столб", "ветер"]))
+    lexicon = open_cache(path)
+    loaded = open_cache(path)
+    assert loaded.words(5) == ("ветер", "столб")
+    write_cache(path, Lexicon(["масло"]))
+    # Прочитанный шард остаётся, непрочитанный берётся из нового кэша
+    assert loaded.words(5) == ("ветер", "столб")
+    assert lexicon.words(5) == ("масло",)
+
+
+def test_damaged_files(tmp_path):
+    path = tmp_path / "words.bin"
+    write_cache(str(path), Lexicon(synthetic_words(300, 5) + synthetic_words(300, 6)))
+    data = path.read_bytes()
+    truncated = tmp_path / "truncated.bin"
+    truncated.write_bytes(data[:len(data) // 2])
+    with pytest.raises(CacheError):
+        open_cache(str(truncated))
+    assert open_lexicon(str(truncated), []) is None
+    # Испорченный шард считается пустым, а кэш удаляется
+    damaged = tmp_path / "damaged.bin"
+    damaged.write_bytes(data[:-1] + bytes([data[-1] ^ 1]))
+    lexicon = open_cache(str(damaged))
+    assert len(lexicon.words(5)) == 300 and lexicon.count(6) == 300
+    assert lexicon.words(6) == () and not damaged.exists()
+    # Недописанный временный файл прежний кэш не задевает
+    (tmp_path / "words.bin.1.tmp").write_bytes(data[:100])
+    assert len(open_lexicon(str(path), [])) == 600
+
+
+@pytest.fixture
+def source():
+    """Изменяемый источник {путь: байты} с ETag; truncate обрывает ответы"""
+    sources = {}
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            data = sources.get(self.path)
+            if data is None:
+                self.send_error(404)
+                return
+            etag = f'"{hashlib.md5(data).hexdigest()}"'
+            if self.headers.get("If-None-Match") == etag:
+                server.requests[304] += 1
+                self.send_response(304)
+                self.end_headers()
+                return
+            server.requests[200] += 1
+            self.send_response(200)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data[:len(data) // 2] if server.truncate else data)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.truncate = False
+    server.requests = Counter()
+    server.sources = sources
+    server.base = f"http://127.0.0.1:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_revalidation(source, tmp_path):
+    source.sources["/a.txt"] = "\n".join(synthetic_words(500, 5, seed=1)).encode("utf-8")
+    source.sources["/b.txt"] = "\n".join(synthetic_words(500, 6, seed=2)).encode("utf-8")
+    urls = [f"{source.base}/a.txt", f"{source.base}/b.txt"]
+    cache_file = str(tmp_path / "words.bin")
+
+    assert len(fetch_lexicon(cache_file, urls)) == 1000
+    assert set(read_metadata(cache_file)["sources"]) == set(urls)
+
+    source.requests.clear()
+    assert revalidate_lexicon(cache_file, urls) is None
+    assert source.requests == {304: 2}
+
+    # Обрыв ответа: обновление не применяется, прежний кэш остаётся
+    source.sources["/b.txt"] += "\nновоеслово".encode("utf-8")
+    source.truncate = True
+    assert revalidate_lexicon(cache_file, urls) is None
+    assert not open_lexicon(cache_file, []).contains("новоеслово")
+
+    source.truncate = False
+    assert revalidate_lexicon(cache_file, urls).contains("новоеслово")
+    assert open_lexicon(cache_file, []).contains("новоеслово")
+
+    # Сервер недоступен
+    source.shutdown()
+    source.server_close()
+    assert revalidate_lexicon(cache_file, urls) is None
+    assert len(open_lexicon(cache_file, [])) == 1001
+
+
+def test_damaged_shard_is_fetched_again(source, tmp_path):
+    source.sources["/a.txt"] = "\n".join(synthetic_words(500, 5, seed=1)).encode("utf-8")
+    urls = [f"{source.base}/a.txt"]
+    path = tmp_path / "words.bin"
+    fetch_lexicon(str(path), urls)
+    data = bytearray(path.read_bytes())
+    # Первый шард — пятибуквенный
+    offset = ENTRY.unpack_from(data, HEADER.size)[2]
+    data[offset] ^= 1
+    path.write_bytes(data)
+
+    lexicon = open_lexicon(str(path), [])
+    assert lexicon.count(5) == 500 and lexicon.words(5) == ()
+    with pytest.raises(ValueError):
+        Game(lexicon, 5)
+    # Окна в этом случае идут по пути без кэша: полная загрузка из источников
+    assert open_lexicon(str(path), []) is None
+    assert revalidate_lexicon(str(path), urls).count(5) == 500
+    game = Game(load_lexicon(str(path), urls, []), 5)
+    game.current = game.target
+    assert game.submit().pattern and game.won
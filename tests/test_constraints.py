@@ -0,0 +1,34 @@
+"""Сужение кандидатов битсетами против перебора всех слов"""
+import random
+
+import pytest
+
+from constraints import Candidates, LetterIndex
+from lexicon import ALPHABET
+from scoring import score
+from synthetic import synthetic_words
+
+
+def brute_force(words, history):
+    return [word for word in words
+            if all(score(guess, word) == pattern for guess, pattern in history)]
+
+
+@pytest.mark.parametrize("length,letters", [(5, 6), (5, 33), (6, 8)])
+def test_candidates_match_brute_force(length, letters):
+    rng = random.Random(length * letters)
+    words = synthetic_words(500, length, length * letters, ALPHABET[:letters])
+    index = LetterIndex(words)
+    for _ in range(30):
+        target = rng.choice(words)
+        candidates = Candidates(index)
+        history = []
+        for guess in rng.sample(words, 4):
+            pattern = score(guess, target)
+            candidates.update(guess, pattern)
+            history.append((guess, pattern))
+            expected = brute_force(words, history)
+            assert candidates.words() == expected
+            assert candidates.count() == len(expected)
+            assert candidates.is_consistent(target)
+        assert not candidates.is_consistent("нетслова")
@@ -0,0 +1,61 @@
+"""DAFSA против множества слов и множества префиксов на всех строках"""
+import itertools
+import random
+import threading
+
+import pytest
+
+import lexicon as lexicon_module
+from dafsa import Dafsa
+from lexicon import Lexicon
+
+
+@pytest.mark.parametrize("length,letters,count", [(5, "абвг", 300), (6, "аеоу", 1500), (4, "ёжзи", 5)])
+def test_every_string_and_prefix(length, letters, count):
+    rng = random.Random(length)
+    every = ["".join(p) for p in itertools.product(letters, repeat=length)]
+    words = set(rng.sample(every, min(count, len(every))))
+    automaton = Dafsa(words)
+    assert len(automaton) == len(words)
+    assert automaton.nodes() < len(words) * length
+    for word in every:
+        assert automaton.contains(word) == (word in words), word
+    prefixes = {word[:k] for word in words for k in range(length + 1)}
+    for k in range(length + 1):
+        for prefix in map("".join, itertools.product(letters + "я", repeat=k)):
+            assert automaton.has_prefix(prefix) == (prefix in prefixes), prefix
+    assert not automaton.contains(next(iter(words)) + "а")
+
+
+def test_empty():
+    automaton = Dafsa([])
+    assert not automaton.contains("слово") and len(automaton) == 0
+
+
+def test_lexicon_checks_use_the_automaton():
+    lexicon = Lexicon(["столб", "ствол", "масло", "дерево"])
+    assert "ствол" in lexicon and "стол" not in lexicon and "дерево" in lexicon
+    assert lexicon.has_prefix("ст", 5) and not lexicon.has_prefix("ст", 6)
+    assert lexicon.has_prefix("дер", 6) and not lexicon.has_prefix("мас", 6)
+
+
+def test_lexicon_checks_do_not_wait_for_warm_up(monkeypatch):
+    release = threading.Event()
+    waited = []
+
+    class SlowDafsa(Dafsa):
+        def __init__(self, words):
+            # Если проверка ждёт автомат, построение дождётся только тайм-аута
+            waited.append(release.wait(2))
+            super().__init__(words)
+
+    monkeypatch.setattr(lexicon_module, "Dafsa", SlowDafsa)
+    lexicon = Lexicon(["столб", "ствол", "масло"])
+    lexicon.warm_up([5])
+    # Пока автомат строится, ответы даёт двоичный поиск
+    checks = lambda: ("ствол" in lexicon, "стола" in lexicon, lexicon.has_prefix("ст", 5),
+                      lexicon.has_prefix("сп", 5), lexicon.has_prefix("", 5))
+    assert checks() == (True, False, True, False, True)
+    release.set()
+    lexicon.automaton(5)
+    assert checks() == (True, False, True, False, True) and waited == [True]
@@ -0,0 +1,97 @@
+"""Игровая логика без дисплея: события, отказы, импорт и память на партию"""
+import os
+import random
+import subprocess
+import sys
+import tracemalloc
+
+from constraints import LetterIndex
+from engine import (GAME_LOST, GAME_OVER, GAME_WON, GUESS_REJECTED, GUESS_SCORED,
+                    INCONSISTENT, LETTER_ADDED, UNKNOWN_WORD, WRONG_LENGTH, Game)
+from lexicon import Lexicon
+from scoring import score
+from synthetic import synthetic_words
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORDS = ["масло", "молот", "слова", "сосна", "столб", "ствол"]
+
+
+def play(game, *guesses):
+    results = []
+    for guess in guesses:
+        for letter in guess:
+            game.add_letter(letter)
+        results.append(game.submit())
+    return results
+
+
+def test_events_of_a_won_game():
+    lexicon = Lexicon(WORDS)
+    game = Game(lexicon, 5, target="столб", index=LetterIndex(lexicon.words(5)))
+    events = []
+    game.subscribe(lambda event, payload: events.append(event))
+    scored, won = play(game, "ствол", "столб")
+    assert scored.pattern == score("ствол", "столб") and scored.row == 0
+    assert won.row == 1 and game.won and game.finished
+    assert events.count(LETTER_ADDED) == 10
+    assert [e for e in events if e in (GUESS_SCORED, GAME_WON)] == [GUESS_SCORED, GUESS_SCORED, GAME_WON]
+    assert play(game, "масло")[0].rejected == GAME_OVER
+
+
+def test_rejected_guesses_do_not_use_attempts():
+    lexicon = Lexicon(WORDS + ["абвгд"])
+    game = Game(lexicon, 5, target="масло", index=LetterIndex(lexicon.words(5)), hard_mode=True)
+    events = []
+    game.subscribe(lambda event, payload: events.append(event))
+    assert play(game, "мас")[0].rejected == WRONG_LENGTH
+    game.current = ""
+    assert play(game, "ёжики")[0].rejected == UNKNOWN_WORD
+    game.current = ""
+    play(game, "сосна")
+    # Подсказки исключают «абвгд»: в нём нет ни с, ни о
+    assert play(game, "абвгд")[0].rejected == INCONSISTENT
+    assert game.attempts == 1 and events.count(GUESS_REJECTED) == 3
+
+
+def test_lost_game():
+    lexicon = Lexicon(WORDS)
+    game = Game(lexicon, 5, max_attempts=2, target="масло")
+    lost = []
+    game.subscribe(lambda event, payload: event == GAME_LOST and lost.append(payload))
+    play(game, "столб", "ствол")
+    assert game.finished and not game.won and lost[0].row == 1
+
+
+IMPORT_ENGINE = """
+import sys, time
+start = time.perf_counter()
+import engine
+print(time.perf_counter() - start, *(m for m in ("tkinter", "urllib", "json") if m in sys.modules))
+"""
+
+
+def test_engine_import_is_light():
+    output = subprocess.run([sys.executable, "-c", IMPORT_ENGINE], cwd=ROOT,
+                            capture_output=True, text=True, check=True).stdout.split()
+    assert output[1:] == []
+    assert float(output[0]) < 1.0
+
+
+def test_memory_per_game():
+    lexicon = Lexicon(synthetic_words(10_000, 5))
+    words = lexicon.words(5)
+    index = LetterIndex(words)
+    rng = random.Random(0)
+    count = 2_000
+    tracemalloc.start()
+    games = []
+    for _ in range(count):
+        game = Game(lexicon, 5, index=index, rng=rng)
+        for guess in rng.sample(words, 3):
+            game.current = guess
+            game.submit()
+        games.append(game)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Основная часть — битсет кандидатов на 10 000 слов (1,25 КБ)
+    assert current / count < 3_000
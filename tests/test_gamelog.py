@@ -0,0 +1,99 @@
+"""Журнал партий: запись, восстановление после сбоя и статистика против перебора"""
+import pytest
+
+from engine import Game
+from gamelog import (HARDEST_MIN_GAMES, HEADER, MAX_GUESSES, MODE_ADVERSARIAL, MODE_HARD,
+                     RECORD, GameLog, LogError, pack_game, unpack_game)
+from lexicon import Lexicon
+
+WORDS = ["масло", "молот", "слова", "сосна", "столб", "ствол", "дерево", "берёза"]
+LEXICON = Lexicon(WORDS)
+
+
+def finished(target, *guesses, max_attempts=MAX_GUESSES):
+    game = Game(LEXICON, len(target), max_attempts, target=target)
+    for guess in guesses:
+        game.current = guess
+        game.submit()
+    return game
+
+
+def won_in(attempts, target="столб"):
+    """Партия, отгаданная с попытки attempts; 0 — проигрыш"""
+    others = [w for w in WORDS if len(w) == 5 and w != target]
+    if not attempts:
+        return finished(target, *(others * 2)[:MAX_GUESSES])
+    return finished(target, *others[:attempts - 1], target)
+
+
+def test_pack_round_trip():
+    game = finished("берёза", "дерево", "берёза")
+    record = pack_game(game, 12.345, MODE_HARD | MODE_ADVERSARIAL, finished_at=1_700_000_000)
+    assert len(record) == RECORD.size
+    assert unpack_game(record) == {
+        "finished_at": 1_700_000_000, "duration": 12.345,
+        "mode": MODE_HARD | MODE_ADVERSARIAL, "length": 6, "max_attempts": MAX_GUESSES,
+        "target": "берёза", "won": True, "guesses": ["дерево", "берёза"],
+        "patterns": game.patterns,
+    }
+    lost = unpack_game(pack_game(won_in(0), 1.0))
+    assert not lost["won"] and len(lost["guesses"]) == MAX_GUESSES
+
+
+def test_torn_tail_is_overwritten(tmp_path):
+    log = GameLog(str(tmp_path / "games.log"))
+    assert len(log) == 0 and log.stats().games == 0
+    log.append(won_in(2), 1.0)
+    with open(log.path, "ab") as f:
+        f.write(b"\n" * (RECORD.size // 2))
+    assert len(log) == 1
+    log.append(won_in(3, "масло"), 1.0)
+    assert (tmp_path / "games.log").stat().st_size == HEADER.size + 2 * RECORD.size
+    assert [log.game(i)["target"] for i in range(2)] == ["столб", "масло"]
+    with pytest.raises(IndexError):
+        log.game(2)
+
+
+def test_foreign_file_is_rejected(tmp_path):
+    path = tmp_path / "games.log"
+    path.write_bytes(b"not a log at all")
+    with pytest.raises(LogError):
+        GameLog(str(path)).stats()
+
+
+@pytest.mark.parametrize("outcomes", [
+    [1, 2, 0, 3, 3, 4, 0, 6, 5],
+    [2, 2, 0, 0, 1],
+    [0],
+    [4, 4, 4],
+])
+def test_stats_match_brute_force(tmp_path, outcomes):
+    log = GameLog(str(tmp_path / "games.log"))
+    for attempts in outcomes:
+        log.append(won_in(attempts), 1.0)
+    stats = log.stats()
+    assert stats.games == len(outcomes)
+    assert stats.wins == sum(1 for a in outcomes if a) and stats.losses == outcomes.count(0)
+    assert stats.distribution == {a: outcomes.count(a) for a in range(1, MAX_GUESSES + 1)}
+    streaks, streak = [], 0
+    for attempts in outcomes:
+        streak = streak + 1 if attempts else 0
+        streaks.append(streak)
+    assert stats.current_streak == streaks[-1] and stats.max_streak == max(streaks)
+
+
+def test_hardest_words(tmp_path):
+    log = GameLog(str(tmp_path / "games.log"))
+    # Пока ни одно слово не сыграно HARDEST_MIN_GAMES раз, учитываются все
+    log.append(won_in(2, "масло"), 1.0)
+    log.append(won_in(0, "сосна"), 1.0)
+    log.append(won_in(1, "столб"), 1.0)
+    assert [word for word, *_ in log.stats().hardest] == ["сосна", "масло", "столб"]
+    assert log.stats().hardest[0] == ("сосна", 1, MAX_GUESSES + 1, 1)
+    # Слово, сыгранное достаточно раз, вытесняет редкие, даже более трудные
+    for _ in range(HARDEST_MIN_GAMES):
+        log.append(won_in(3, "масло"), 1.0)
+    hardest = log.stats().hardest
+    assert [word for word, *_ in hardest] == ["масло"]
+    games, mean = hardest[0][1], hardest[0][2]
+    assert games == HARDEST_MIN_GAMES + 1 and mean == (2 + 3 * HARDEST_MIN_GAMES) / games
@@ -0,0 +1,65 @@
+"""Замеры этапов: выключенные хуки почти бесплатны, включённые пишут буфер и дампы"""
+import json
+import pstats
+import timeit
+
+import pytest
+
+import metrics
+
+
+@pytest.fixture(autouse=True)
+def restore():
+    recorder = metrics.RECORDER
+    yield
+    metrics.RECORDER = recorder
+
+
+def phase():
+    pass
+
+
+def test_disabled_hooks_cost_under_a_microsecond():
+    metrics.disable()
+    assert metrics.timed("test")(phase) is phase
+    calls = 100_000
+    for hook in (lambda: metrics.record("test", 0.0), lambda: metrics.span("test")):
+        # Лучший из повторов, чтобы фоновая нагрузка не давала ложных срабатываний
+        cost = min(timeit.repeat(hook, number=calls, repeat=5)) / calls
+        assert cost < 1e-6
+
+
+def test_enabled_recorder_keeps_the_last_events_and_totals():
+    metrics.enable(size=10)
+    wrapped = metrics.timed("test.call")(phase)
+    for _ in range(25):
+        wrapped()
+    with metrics.span("test.block"):
+        pass
+    metrics.record("test.manual", 0.5)
+    recorder = metrics.RECORDER
+    assert len(recorder.events) == 10
+    assert recorder.totals["test.call"][0] == 25
+    assert recorder.totals["test.manual"] == [1, 0.5, 0.5]
+    data = json.loads(recorder.to_json())
+    assert data["phases"]["test.block"]["count"] == 1 and len(data["events"]) == 10
+    text = recorder.to_prometheus()
+    assert 'wordle_phase_seconds_count{phase="test.call"} 25' in text
+    assert 'wordle_phase_seconds_max{phase="test.manual"} 0.500000000' in text
+
+
+def test_dump_format_follows_extension(tmp_path):
+    recorder = metrics.enable()
+    metrics.record("test", 0.1)
+    recorder.dump(str(tmp_path / "m.prom"))
+    recorder.dump(str(tmp_path / "m.json"))
+    assert (tmp_path / "m.prom").read_text(encoding="utf-8").startswith("# HELP")
+    assert json.loads((tmp_path / "m.json").read_text(encoding="utf-8"))["phases"]["test"]
+
+
+def test_session_profiles_when_asked(tmp_path, monkeypatch):
+    path = str(tmp_path / "session.prof")
+    monkeypatch.setenv(metrics.ENV_PROFILE, path)
+    with metrics.session():
+        sum(range(1000))
+    assert pstats.Stats(path).total_calls > 0
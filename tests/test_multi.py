@@ -0,0 +1,94 @@
+"""Несколько загаданных слов (MultiGame) против оценки каждого слова по отдельности"""
+import random
+
+import pytest
+
+import engine
+from constraints import LetterIndex
+from engine import BOARD_EVENT, GAME_LOST, GAME_WON, UNKNOWN_WORD, MultiGame
+from lexicon import Lexicon
+from scoring import score
+from synthetic import synthetic_words
+
+
+def play(game, *guesses):
+    results = []
+    for guess in guesses:
+        game.current = guess
+        results.append(game.submit())
+    return results
+
+
+def brute_force(board, words):
+    """Шаблоны попыток поля и слова, согласные с ними, перебором"""
+    patterns = [score(guess, board.target) for guess in board.guesses]
+    candidates = [w for w in words
+                  if all(score(g, w) == p for g, p in zip(board.guesses, board.patterns))]
+    return patterns, candidates
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_boards_match_per_target_score(seed, monkeypatch):
+    words = synthetic_words(400, 5, seed=seed)
+    lexicon = Lexicon(words)
+    rng = random.Random(seed)
+    game = MultiGame(lexicon, 5, count=4, index=LetterIndex(words), rng=rng)
+    batches = []
+    score_batch = engine.score_batch
+    monkeypatch.setattr(engine, "score_batch",
+                        lambda guess, targets: batches.append(list(targets)) or score_batch(guess, targets))
+    # Загаданные слова вперемешку со случайными, чтобы поля отгадывались по одному
+    guesses = [w for target in rng.sample([b.target for b in game.boards], 4)
+               for w in (rng.choice(words), target)]
+    for number, guess in enumerate(guesses):
+        active = [b.target for b in game.active()]
+        play(game, guess)
+        # Один вызов на попытку и только по неотгаданным словам
+        assert batches[-1] == active and len(batches) == number + 1
+        for board in game.boards:
+            patterns, candidates = brute_force(board, words)
+            assert board.patterns == patterns
+            assert board.candidates.words() == candidates
+    # Отгаданное поле больше попыток не получает
+    for board in game.boards:
+        assert board.won and board.guesses[-1] == board.target
+        assert len(board.guesses) == guesses.index(board.target) + 1
+    assert game.won and game.finished
+
+
+def test_won_and_lost():
+    words = ["масло", "молот", "слова", "сосна", "столб", "ствол"]
+    lexicon = Lexicon(words)
+    events = []
+    game = MultiGame(lexicon, 5, targets=["столб", "масло"])
+    game.subscribe(lambda event, payload: events.append(event))
+    play(game, "столб", "масло")
+    assert game.won and events[-1] == GAME_WON and GAME_LOST not in events
+
+    events.clear()
+    game = MultiGame(lexicon, 5, max_attempts=2, targets=["столб", "масло"])
+    game.subscribe(lambda event, payload: events.append(event))
+    play(game, "столб", "сосна")
+    assert game.finished and not game.won and events[-1] == GAME_LOST
+    assert [b.won for b in game.boards] == [True, False]
+    # События полей пересылаются с номером поля
+    assert events.count(BOARD_EVENT) and GAME_WON not in events
+
+
+def test_target_outside_the_lexicon_is_accepted():
+    lexicon = Lexicon(["масло", "сосна"])
+    game = MultiGame(lexicon, 5, targets=["масло", "ёжики"])
+    assert play(game, "абвгд")[0].rejected == UNKNOWN_WORD
+    play(game, "ёжики", "масло")
+    assert game.won and game.attempts == 2
+
+
+def test_use_lexicon_replays_guesses():
+    words = synthetic_words(300, 5, seed=7)
+    game = MultiGame(Lexicon(words[:10]), 5, targets=words[:3])
+    play(game, words[5], words[0])
+    assert all(board.candidates is None for board in game.boards)
+    game.use_lexicon(Lexicon(words), LetterIndex(words))
+    for board in game.boards:
+        assert board.candidates.words() == brute_force(board, words)[1]
+    assert game.boards[0].won and not game.boards[1].finished
@@ -0,0 +1,61 @@
+"""Разбиение словаря по шаблонам и режим Absurdle против перебора"""
+import random
+from collections import Counter
+
+import pytest
+
+from engine import AdversarialGame
+from lexicon import ALPHABET, Lexicon
+from partition import Partitioner
+from scoring import score, winning_pattern
+from synthetic import synthetic_words
+
+
+@pytest.mark.parametrize("length,letters", [(4, 6), (5, 6), (5, 33), (6, 8), (10, 5)])
+def test_partitions_match_score(length, letters):
+    words = synthetic_words(600, length, length, ALPHABET[:letters])
+    partitioner = Partitioner(words)
+    rng = random.Random(1)
+    subset = set(rng.sample(words, len(words) // 3))
+    lanes = 0
+    for word in subset:
+        lanes |= partitioner.select(partitioner.patterns(word), winning_pattern(length))
+    assert partitioner.decode(lanes) == sorted(subset)
+
+    for guess in rng.sample(words, 15) + synthetic_words(5, length, 99, ALPHABET[:letters]):
+        expected = [score(guess, word) for word in words]
+        patterns = partitioner.patterns(guess)
+        assert partitioner.counts(patterns) == Counter(expected)
+        assert partitioner.counts(patterns, lanes) == \
+            Counter(p for p, word in zip(expected, words) if word in subset)
+        for pattern in set(expected):
+            assert partitioner.decode(partitioner.select(patterns, pattern)) == \
+                [word for word, p in zip(words, expected) if p == pattern]
+
+
+def hints(pattern):
+    """Число подсказок шаблона: зелёная отметка — две, жёлтая — одна"""
+    total = 0
+    while pattern:
+        pattern, mark = divmod(pattern, 3)
+        total += mark
+    return total
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_adversarial_game_matches_brute_force(seed):
+    # Больше SMALL_GROUP слов, чтобы партия прошла и дорожки, и список
+    words = synthetic_words(2_000, 5, seed, ALPHABET[:10])
+    game = AdversarialGame(Lexicon(words), 5)
+    remaining = list(words)
+    rng = random.Random(seed)
+    while not game.finished:
+        guess = rng.choice(remaining if rng.random() < 0.3 else words)
+        counts = Counter(score(guess, word) for word in remaining)
+        best = max(counts, key=lambda p: (counts[p], -hints(p)))
+        game.current = guess
+        assert game.submit().pattern == best
+        remaining = [word for word in remaining if score(guess, word) == best]
+        assert game.remaining() == remaining
+    assert game.target in remaining
+    assert all(score(g, game.target) == p for g, p in zip(game.guesses, game.patterns))
@@ -0,0 +1,28 @@
+"""Матрица шаблонов против score на всех парах"""
+import os
+
+from lexicon import Lexicon
+from patterns import PatternMatrix, build_matrix, load_matrix
+from scoring import score
+from synthetic import synthetic_words
+
+
+def test_matrix_matches_score(tmp_path):
+    words = synthetic_words(150, 5, seed=1)
+    path = str(tmp_path / "matrix.bin")
+    # Несколько блоков строк на двух процессах
+    build_matrix(words, 5, path, workers=2, chunk_rows=40)
+    matrix = PatternMatrix(path, words, 5)
+    for i, guess in enumerate(words):
+        assert list(matrix.row(guess)) == [score(guess, answer) for answer in words]
+        assert matrix.pattern(i, len(words) - 1) == score(guess, words[-1])
+
+
+def test_load_matrix_replaces_stale_version(tmp_path):
+    first = Lexicon(synthetic_words(60, 6, seed=2))
+    load_matrix(first, 6, str(tmp_path), workers=1)
+    second = Lexicon(synthetic_words(61, 6, seed=2))
+    matrix = load_matrix(second, 6, str(tmp_path), workers=1)
+    assert len(os.listdir(tmp_path)) == 1
+    words = second.words(6)
+    assert matrix.pattern(words[0], words[-1]) == score(words[0], words[-1])
@@ -0,0 +1,40 @@
+"""Сверка scoring с исходной проверкой WordleGame.check_guess"""
+import pytest
+
+from lexicon import ALPHABET, encode_words
+from scoring import decode_pattern, score, score_batch, score_matrix, winning_pattern
+from synthetic import reference_check_guess, synthetic_words
+
+# Слова из нескольких букв: частые повторы проверяют все ветви оценки
+LETTERS = ALPHABET[:5]
+
+
+@pytest.mark.parametrize("length", [4, 5, 6, 10])
+def test_score_matches_reference_on_all_pairs(length):
+    words = synthetic_words(150, length, length, LETTERS)
+    for guess in words:
+        for target in words:
+            assert decode_pattern(score(guess, target), length) == \
+                reference_check_guess(guess, target), (guess, target)
+
+
+@pytest.mark.parametrize("length", [5, 6])
+def test_score_batch_matches_score(length):
+    words = synthetic_words(150, length, length, LETTERS) + ["абвгдеёжзи"[:length], "клмнопрсту"[:length]]
+    codes = encode_words(words)
+    encoded = [codes[i:i + length] for i in range(0, len(codes), length)]
+    for guess, guess_codes in zip(words, encoded):
+        expected = [score(guess, target) for target in words]
+        assert list(score_batch(guess, words)) == expected
+        assert list(score_batch(guess_codes, encoded)) == expected
+
+
+def test_score_matrix_rows():
+    words = synthetic_words(40, 5, letters=LETTERS)
+    matrix = score_matrix(words, words)
+    assert [list(row) for row in matrix] == [[score(g, t) for t in words] for g in words]
+
+
+def test_winning_pattern():
+    assert score("столб", "столб") == winning_pattern(5)
+    assert decode_pattern(winning_pattern(6), 6) == ["green"] * 6
@@ -0,0 +1,28 @@
+"""Подсказки: сложный режим и сохранённая первая попытка"""
+import random
+
+from constraints import Candidates, LetterIndex
+from engine import Game
+from lexicon import Lexicon
+from solver import Solver
+from synthetic import synthetic_words
+
+
+def test_hard_mode_hints_are_accepted(tmp_path):
+    lexicon = Lexicon(synthetic_words(3_000, 5, seed=3))
+    index = LetterIndex(lexicon.words(5))
+    solver = Solver(index, openers_file=str(tmp_path / "openers.json"))
+    rng = random.Random(1)
+    for _ in range(20):
+        game = Game(lexicon, 5, index=index, hard_mode=True, rng=rng)
+        while not game.finished:
+            game.current = solver.best_guess(game.candidates, hard_mode=True)
+            assert not game.submit().rejected
+
+
+def test_opener_is_saved_per_dictionary_version(tmp_path):
+    openers_file = str(tmp_path / "openers.json")
+    index = LetterIndex(synthetic_words(500, 5, seed=4))
+    opener = Solver(index, openers_file=openers_file).warm_up().opener()
+    assert opener in index.word_index
+    assert Solver(index, openers_file=openers_file).best_guess(Candidates(index)) == opener
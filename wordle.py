@@ -1,78 +1,117 @@
+import threading
+import time
 import tkinter as tk
 from tkinter import messagebox
-import random
-from collections import defaultdict
-import re
-import urllib.request
-import os
-import json
+from animation import Animator
+from backup_words import backup_lexicon
+from board import Board
+from constraints import LetterIndex
+from dictionary import DictionaryLoader, open_lexicon
+from engine import (GAME_LOST, GAME_OVER, GAME_WON, GUESS_REJECTED, GUESS_SCORED,
+                    LETTER_ADDED, LETTER_DELETED, PREFIX_CHECKED, Game)
+from gamelog import MODE_HARD, GameLog, LogError
+import metrics
+from scoring import decode_pattern
+from stats_view import show_stats
+
+LOADER_POLL_MS = 100
+
+
+def build_index(lexicon):
+    """Индексы пятибуквенных слов; строятся в потоке загрузки словаря"""
+    lexicon.automaton(5)
+    return LetterIndex(lexicon.words(5))
+
 
 class WordleGame:
     def __init__(self, root):
+        self.started = time.perf_counter()
+        self.time_to_first_frame = None
         self.root = root
         self.root.title("Wordle на русском")
-        self.root.geometry("400x500")  # Более компактный размер
+        self.root.geometry("400x540")  # Более компактный размер
         self.root.resizable(False, False)
-        self.WORDS = self.load_words()
-        if not self.WORDS:
-            # Резервный список, если не удалось загрузить
-            self.WORDS = ["яблок", "столб", "речка", "ветер", "каска", "лампа",
-                         "метро", "норма", "океан", "пирог", "рубин", "салат",
-                         "танец", "улица", "фонарь", "хобби", "цветок", "штора",
-                         "щука", "эмаль", "юноша", "якорь"]
-            messagebox.showwarning("Внимание", "Используется локальный словарь")
+        # Сеть на старте не используется: без кэша игра начинается с
+        # резервным списком, а полный словарь загружается в фоне; сохранённый
+        # кэш используется сразу и проверяется на обновления тоже в фоне
+        self.lexicon = open_lexicon()
+        self.loader = DictionaryLoader(prepare=build_index, revalidate=True)
+        # Проверяются сами слова: повреждённый шард читается как пустой
+        if self.lexicon is None or not self.lexicon.words(5):
+            # Резервный список, пока словарь не загружен
+            self.lexicon = backup_lexicon([5])
+            self.loader = DictionaryLoader(prepare=build_index)
         
-        self.target_word = random.choice(self.WORDS).lower()
-        self.attempts = 0
-        self.max_attempts = 6
-        self.current_guess = ""
-        self.used_letters = defaultdict(set)
+        self.animator = Animator(self.root)
+        # Автомат и индекс строятся в фоне, чтобы не задерживать первый кадр;
+        # до их готовности партия идёт без подсчёта кандидатов
+        self.index = None
+        self.start_index()
+        self.game_log = GameLog()
+        self.new_game_state()
         
         self.setup_ui()
         self.center_window()
         self.root.focus_set()  # Устанавливаем фокус на окно
-        
-    def load_words(self):
-        """Загрузка словаря с кэшированием в локальный файл"""
-        cache_file = "wordle_words_cache.json"
-        
-        # Пробуем загрузить из кэша
-        if os.path.exists(cache_file):
-            try:
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except:
-                pass  # Если кэш поврежден, загрузим заново
-        
-        # Если кэша нет, загружаем из интернета
-        try:
-            urls = [
-                "https://raw.githubusercontent.com/danakt/russian-words/master/russian.txt",
-                "https://raw.githubusercontent.com/Harrix/Russian-Nouns/main/dist/russian_nouns.txt"
-            ]
-            
-            words = set()
-            
-            for url in urls:
-                try:
-                    with urllib.request.urlopen(url, timeout=3) as response:
-                        text = response.read().decode('utf-8')
-                        found_words = re.findall(r'\b[а-яё]{5}\b', text.lower())
-                        words.update(found_words)
-                except:
-                    continue
-            
-            if words:
-                # Сохраняем в кэш
-                with open(cache_file, 'w', encoding='utf-8') as f:
-                    json.dump(list(words), f, ensure_ascii=False)
-                return list(words)
-            
-        except Exception as e:
-            print(f"Ошибка загрузки словаря: {e}")
-        
-        return None
-
+        self.root.after_idle(self.first_frame_drawn)
+        self.loader.start()
+        self.root.after(LOADER_POLL_MS, self.poll_loader)
+    
+    def new_game_state(self):
+        """Новая партия без перезапуска окна"""
+        self.game = Game(self.lexicon, 5, 6, index=self.index)
+        self.game.subscribe(self.on_game_event)
+        self.game_started = time.monotonic()
+    
+    @metrics.timed("ui.new_game")
+    def new_game(self):
+        """Новая партия: поле очищается, виджеты не пересоздаются"""
+        self.animator.clear()
+        self.new_game_state()
+        self.board.clear()
+        self.update_candidates_label()
+        self.root.focus_set()
+    
+    def first_frame_drawn(self):
+        """Время от запуска до первой отрисовки окна (с)"""
+        self.time_to_first_frame = time.perf_counter() - self.started
+    
+    def start_index(self):
+        """Построение индекса текущего словаря в фоновом потоке"""
+        lexicon = self.lexicon
+        built = []
+        threading.Thread(target=lambda: built.append(build_index(lexicon)), daemon=True).start()
+        self.root.after(LOADER_POLL_MS, self.poll_index, lexicon, built)
+    
+    def poll_index(self, lexicon, built):
+        """Готовый индекс подключается к партии в потоке Tk"""
+        if lexicon is not self.lexicon:
+            return  # Словарь уже заменён загруженным вместе с его индексом
+        if not built:
+            self.root.after(LOADER_POLL_MS, self.poll_index, lexicon, built)
+            return
+        self.index = built[0]
+        self.game.use_lexicon(self.lexicon, self.index)
+        self.update_candidates_label()
+    
+    def poll_loader(self):
+        """Ход фоновой загрузки; готовый словарь подменяется в потоке Tk"""
+        if not self.loader.ready():
+            if not self.loader.revalidate:
+                self.status_label.config(
+                    text=f"Загрузка словаря: {self.loader.fraction():.0%}")
+            self.root.after(LOADER_POLL_MS, self.poll_loader)
+            return
+        loader, self.loader = self.loader, None
+        if loader.lexicon is None or not loader.lexicon.words(5):
+            if not loader.revalidate:
+                self.status_label.config(text="Используется локальный словарь")
+            return
+        self.lexicon = loader.lexicon
+        self.index = loader.prepared
+        self.game.use_lexicon(self.lexicon, self.index)
+        self.status_label.config(text="")
+        self.update_candidates_label()
         
     def center_window(self):
         self.root.update_idletasks()
@@ -82,6 +121,7 @@ class WordleGame:
         y = (self.root.winfo_screenheight() // 2) - (height // 2)
         self.root.geometry(f'+{x}+{y}')
     
+    @metrics.timed("ui.setup_ui")
     def setup_ui(self):
         bg_color = "#f0f0f0"
         self.root.config(bg=bg_color)
@@ -99,24 +139,24 @@ class WordleGame:
         controls_label.pack(pady=5)
         
         # Сетка для букв
-        self.grid_frame = tk.Frame(self.root, bg=bg_color)
-        self.grid_frame.pack(pady=10)
+        self.board = Board(self.root, 6, 5, bg=bg_color)
+        self.board.frame.pack(pady=10)
+        
+        # Сколько слов ещё подходит под подсказки
+        self.candidates_label = tk.Label(self.root, font=("Arial", 10), bg=bg_color)
+        self.candidates_label.pack()
+        self.update_candidates_label()
         
-        self.cells = []
-        for row in range(6):
-            row_cells = []
-            for col in range(5):
-                cell = tk.Label(self.grid_frame, text="", width=3, height=1, 
-                              font=("Arial", 20), 
-                              relief="solid", borderwidth=1,
-                              bg="white", fg="black")
-                cell.grid(row=row, column=col, padx=3, pady=3)
-                row_cells.append(cell)
-            self.cells.append(row_cells)
+        # Ход фоновой загрузки словаря
+        self.status_label = tk.Label(self.root, font=("Arial", 9), bg=bg_color, fg="#787c7e")
+        self.status_label.pack()
         
-        # Кнопки управления (можно использовать вместо клавиш)
+        # Кнопки управления (можно использовать вместо клавиш); в одну строку
+        # шириной 400 пикселей все четыре не помещаются
         control_frame = tk.Frame(self.root, bg=bg_color)
-        control_frame.pack(pady=10)
+        control_frame.pack(pady=(10, 5))
+        game_frame = tk.Frame(self.root, bg=bg_color)
+        game_frame.pack(pady=(0, 10))
         
         tk.Button(control_frame, text="Enter (Проверить)", width=15, height=1,
                  font=("Arial", 10), command=self.submit_guess,
@@ -126,6 +166,14 @@ class WordleGame:
                  font=("Arial", 10), command=self.delete_letter,
                  bg="#787c7e", fg="white").pack(side="left", padx=5)
         
+        tk.Button(game_frame, text="Новая игра", width=15, height=1,
+                 font=("Arial", 10), command=self.new_game,
+                 bg="#d3d6da").pack(side="left", padx=5)
+        
+        tk.Button(game_frame, text="Статистика", width=15, height=1,
+                 font=("Arial", 10), command=self.show_stats,
+                 bg="#d3d6da").pack(side="left", padx=5)
+        
         # Привязка клавиш
         self.root.bind("<Key>", self.handle_key_press)
     
@@ -155,90 +203,93 @@ class WordleGame:
     }
     
     def add_letter(self, letter):
-        if len(self.current_guess) < 5:
-            self.current_guess += letter
-            row = self.attempts
-            col = len(self.current_guess) - 1
-            self.cells[row][col].config(text=letter.upper())
+        self.game.add_letter(letter)
     
     def delete_letter(self):
-        if len(self.current_guess) > 0:
-            row = self.attempts
-            col = len(self.current_guess) - 1
-            self.cells[row][col].config(text="")
-            self.current_guess = self.current_guess[:-1]
+        self.game.delete_letter()
     
+    @metrics.timed("ui.submit_guess")
     def submit_guess(self):
-        if len(self.current_guess) != 5:
-            messagebox.showwarning("Ошибка", "Слово должно быть из 5 букв!")
-        
-        
-        feedback = self.check_guess()
-        self.update_colors(feedback)
-        
-        if self.current_guess == self.target_word:
-            self.highlight_win()
-            messagebox.showinfo("Победа!", f"Вы угадали слово {self.target_word.upper()} за {self.attempts + 1} попыток!")
-            self.root.destroy()
-            return
-        
-        self.attempts += 1
-        self.current_guess = ""
-        
-        if self.attempts >= self.max_attempts:
-            self.reveal_answer()
-            messagebox.showinfo("Конец игры", f"Загаданное слово: {self.target_word.upper()}")
+        self.game.submit()
+    
+    def on_game_event(self, event, payload):
+        """Отображение событий игры"""
+        if event == LETTER_ADDED:
+            row, col, letter = payload
+            self.board.cells[row][col].config(text=letter.upper())
+        elif event == LETTER_DELETED:
+            row, col = payload
+            self.board.cells[row][col].config(text="")
+        elif event == PREFIX_CHECKED:
+            row, valid = payload
+            # Буквы строки краснеют, как только с набранного не начинается ни одно слово
+            for cell in self.board.cells[row]:
+                cell.config(fg="black" if valid else "#d9534f")
+        elif event == GUESS_REJECTED:
+            # После последней строки, пока не показан итог, качать уже нечего
+            if payload.rejected != GAME_OVER and payload.row < len(self.board.cells):
+                self.animator.shake(self.board.cells[payload.row])
+            messagebox.showwarning("Ошибка", payload.message(5))
+        elif event == GUESS_SCORED:
+            self.reveal_end = self.update_colors(payload.row, decode_pattern(payload.pattern, 5))
+            self.update_candidates_label()
+        elif event == GAME_WON:
+            self.log_game()
+            end = self.highlight_win(payload.row, self.reveal_end)
+            self.animator.call_later(end, self.announce_win)
+        elif event == GAME_LOST:
+            self.log_game()
+            self.animator.call_later(self.reveal_end, self.announce_loss)
+    
+    def log_game(self):
+        """Запись законченной партии в журнал"""
+        mode = MODE_HARD if self.game.hard_mode else 0
+        try:
+            self.game_log.append(self.game, time.monotonic() - self.game_started, mode)
+        except (OSError, LogError) as e:
+            print(f"Партия не записана в журнал: {e}")
+    
+    def show_stats(self):
+        show_stats(self.root, self.game_log)
+    
+    def announce_win(self):
+        """Сообщение о победе после окончания анимации"""
+        messagebox.showinfo("Победа!", f"Вы угадали слово {self.game.target.upper()} за {self.game.attempts} попыток!")
+        self.offer_new_game()
+    
+    def announce_loss(self):
+        """Показ ответа после открытия последней строки"""
+        self.reveal_answer()
+        messagebox.showinfo("Конец игры", f"Загаданное слово: {self.game.target.upper()}")
+        self.offer_new_game()
+    
+    def offer_new_game(self):
+        if messagebox.askyesno("Wordle", "Сыграть ещё раз?"):
+            self.new_game()
+        else:
             self.root.destroy()
     
-    def check_guess(self):
-        feedback = []
-        target_list = list(self.target_word)
-        
-        # Проверка точных совпадений
-        for i in range(5):
-            if self.current_guess[i] == self.target_word[i]:
-                feedback.append("green")
-                target_list[i] = None
-            else:
-                feedback.append("gray")
-        
-        # Проверка букв в слове, но не на месте
-        for i in range(5):
-            if feedback[i] != "green" and self.current_guess[i] in target_list:
-                feedback[i] = "yellow"
-                target_list[target_list.index(self.current_guess[i])] = None
-        
-        return feedback
+    def update_colors(self, row, feedback):
+        """Поочерёдное открытие цветов строки; возвращает время окончания (мс)"""
+        return self.animator.reveal(self.board.cells[row], feedback)
     
-    def update_colors(self, feedback):
-        row = self.attempts
-        for col in range(5):
-            color = feedback[col]
-            self.cells[row][col].config(bg=color)
+    def update_candidates_label(self):
+        if self.game.candidates is None:
+            self.candidates_label.config(text="")  # Индекс ещё строится
+            return
+        self.candidates_label.config(text=f"Возможных слов: {self.game.candidates.count()}")
     
-    def highlight_win(self):
+    @metrics.timed("ui.highlight_win")
+    def highlight_win(self, row, start=0):
         """Анимация победы - мигание угаданного слова"""
-        row = self.attempts
-        for _ in range(3):
-            for col in range(5):
-                self.cells[row][col].config(bg="white")
-            self.root.update()
-            self.root.after(150)
-            for col in range(5):
-                self.cells[row][col].config(bg="green")
-            self.root.update()
-            self.root.after(150)
+        return self.animator.flash(self.board.cells[row], "green", start)
     
     def reveal_answer(self):
-        """Показывает правильный ответ при проигрыше"""
-        for col in range(5):
-            self.cells[self.attempts][col].config(
-                text=self.target_word[col].upper(),
-                bg="#6aaa64",
-                fg="white"
-            )
+        """Показывает правильный ответ при проигрыше в последней строке"""
+        self.board.fill(self.game.max_attempts - 1, self.game.target, bg="#6aaa64", fg="white")
 
 if __name__ == "__main__":
-    root = tk.Tk()
-    game = WordleGame(root)
-    root.mainloop()
+    with metrics.session():
+        root = tk.Tk()
+        game = WordleGame(root)
+        root.mainloop()
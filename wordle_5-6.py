@@ -1,164 +1,306 @@
+import threading
+import time
 import tkinter as tk
 from tkinter import messagebox, ttk
-import random
-from collections import defaultdict
-import urllib.request
-import re
-import os
-import json
+from animation import Animator
+from backup_words import LENGTHS, backup_lexicon
+from board import Board
+from constraints import LetterIndex
+from dictionary import DictionaryLoader, open_lexicon
+from engine import (GAME_LOST, GAME_OVER, GAME_WON, GUESS_REJECTED, GUESS_SCORED,
+                    LETTER_ADDED, LETTER_DELETED, PREFIX_CHECKED, AdversarialGame, Game)
+from gamelog import MODE_ADVERSARIAL, MODE_HARD, GameLog, LogError
+import metrics
+from partition import Partitioner
+from scoring import decode_pattern
+from solver import Solver
+from stats_view import show_stats
+
+DEFAULT_LENGTH = 5
+LOADER_POLL_MS = 100
+MODES_PER_ROW = 4
+
+
+def build_indexes(lexicon):
+    """Индекс и подсказки режима по умолчанию; строятся в потоке загрузки словаря.
+
+    Первая попытка подсказки тоже считается здесь, а не по первому нажатию.
+    Слова остальных длин загружаются и индексируются, только когда выбран
+    их режим. Возвращает индексы и подсказчики по длинам.
+    """
+    lexicon.automaton(DEFAULT_LENGTH)
+    index = LetterIndex(lexicon.words(DEFAULT_LENGTH))
+    solver = Solver(index)
+    solver.opener()
+    return {DEFAULT_LENGTH: index}, {DEFAULT_LENGTH: solver}
+
+
+def build_index(lexicon, length):
+    """Индекс и подсказки слов выбранной длины; строятся в фоновом потоке"""
+    index = LetterIndex(lexicon.words(length))
+    return index, Solver(index).warm_up()
+
+
+def build_partitioner(lexicon, length):
+    """Разбиение слов выбранной длины для режима Absurdle; строится в фоновом потоке"""
+    return Partitioner(lexicon.words(length))
+
+
+def cell_font(length):
+    """Шрифт клеток, при котором строка из length букв помещается в окно"""
+    return ("Arial", 20 - 2 * max(0, length - 6))
+
 
 class WordleGame:
     def __init__(self, root):
+        self.started = time.perf_counter()
+        self.time_to_first_frame = None
         self.root = root
         self.root.title("Wordle на русском")
         self.root.geometry("450x550")
         self.root.resizable(False, False)
         
         # Настройки игры
-        self.word_length = 5  # По умолчанию
+        self.word_length = DEFAULT_LENGTH
         self.max_attempts = 6
-        self.words_cache = {
-            5: "wordle_words_5.json",
-            6: "wordle_words_6.json"
-        }
+        self.animator = Animator(self.root)
+        self.letter_indexes = {}  # Битсеты для отбора кандидатов по длинам
+        self.solvers = {}  # Подсказки по длинам
+        self.hard_mode = tk.BooleanVar(value=False)
+        self.adversarial = tk.BooleanVar(value=False)
+        self.partitioners = {}  # Разбиение словаря по длинам для режима Absurdle
+        self.building = {}  # Структуры, которые строятся в фоне: {(вид, длина): [результат]}
+        self.waiting = None  # Длина партии Absurdle, ждущей разбиения словаря
+        self.game_log = GameLog()
+        self.game_started = None
+        self.game = None
+        self.progress = None
+        
+        # Сеть на старте не используется: без кэша игра идёт по резервным
+        # словарям, а полный словарь загружается в фоне; сохранённый кэш
+        # используется сразу и проверяется на обновления тоже в фоне
+        self.lexicon = open_lexicon()
+        self.loader = DictionaryLoader(prepare=build_indexes, revalidate=True)
+        # Шарды остальных длин читаются при выборе режима, поэтому для них
+        # проверяется только число слов, а слова — для режима по умолчанию
+        if (self.lexicon is None or not all(map(self.lexicon.count, LENGTHS))
+                or not self.lexicon.words(DEFAULT_LENGTH)):
+            self.lexicon = backup_lexicon()
+            self.loader = DictionaryLoader(prepare=build_indexes)
+        self.lexicon.warm_up([DEFAULT_LENGTH])
+        self.loader.start()
+        self.root.after(LOADER_POLL_MS, self.poll_loader)
         
         # Цвета для интерфейса
         self.bg_color = "#f0f0f0"
         self.root.config(bg=self.bg_color)
         
+        # Экраны создаются один раз и переключаются без пересоздания виджетов
+        self.setup_progress()
+        self.menu_frame = tk.Frame(self.root, bg=self.bg_color)
+        self.game_frame = tk.Frame(self.root, bg=self.bg_color)
+        self.build_mode_selection()
+        self.build_game_ui()
+        self.root.bind("<Key>", self.handle_key_press)
+        
         # Запуск меню выбора режима
         self.setup_mode_selection()
+        self.root.after_idle(self.first_frame_drawn)
     
-    def setup_mode_selection(self):
+    def first_frame_drawn(self):
+        """Время от запуска до первой отрисовки окна (с)"""
+        self.time_to_first_frame = time.perf_counter() - self.started
+    
+    def setup_progress(self):
+        """Индикатор фоновой загрузки словаря внизу окна"""
+        self.progress = None
+        if not self.loader.revalidate:
+            self.progress = ttk.Progressbar(self.root, length=200, maximum=1.0)
+            self.progress.pack(side="bottom", pady=10)
+    
+    def poll_loader(self):
+        """Ход фоновой загрузки; готовый словарь подменяется в потоке Tk"""
+        if not self.loader.ready():
+            if self.progress is not None:
+                self.progress.config(value=self.loader.fraction())
+            self.root.after(LOADER_POLL_MS, self.poll_loader)
+            return
+        loader, self.loader = self.loader, None
+        if self.progress is not None:
+            self.progress.destroy()
+            self.progress = None
+        if loader.lexicon is None or not all(map(loader.lexicon.words, LENGTHS)):
+            return  # Остаются резервные словари
+        self.lexicon = loader.lexicon
+        self.letter_indexes, self.solvers = loader.prepared
+        self.partitioners = {}
+        self.building = {}
+        if self.game is not None:
+            self.game.use_lexicon(self.lexicon, self.letter_indexes.get(self.word_length))
+            self.update_candidates_label()
+        if self.game is not None or self.waiting is not None:
+            self.prepare(self.word_length, self.waiting is not None)
+    
+    def use_backup(self):
+        """Резервные словари вместо кэша, шард которого не прочитан.
+
+        Повреждённый кэш уже удалён, поэтому загрузка собирает словарь из
+        источников заново.
+        """
+        self.lexicon = backup_lexicon()
+        self.letter_indexes, self.solvers, self.partitioners = {}, {}, {}
+        self.building = {}
+        if self.loader is None:
+            self.loader = DictionaryLoader(prepare=build_indexes).start()
+            self.setup_progress()
+            self.root.after(LOADER_POLL_MS, self.poll_loader)
+    
+    def show_screen(self, frame):
+        """Переключение экрана: другой экран скрывается, но не уничтожается"""
+        self.animator.clear()
+        for screen in (self.menu_frame, self.game_frame):
+            if screen is not frame:
+                screen.pack_forget()
+        frame.pack(fill="both", expand=True)
+    
+    def build_mode_selection(self):
         """Экран выбора режима игры"""
-        self.clear_window()
-        
-        title = tk.Label(self.root, text="Выберите режим", 
+        title = tk.Label(self.menu_frame, text="Выберите режим", 
                         font=("Arial", 20), bg=self.bg_color)
         title.pack(pady=20)
         
-        btn_frame = tk.Frame(self.root, bg=self.bg_color)
+        btn_frame = tk.Frame(self.menu_frame, bg=self.bg_color)
         btn_frame.pack(pady=10)
         
-        # Кнопки выбора режима
-        modes = [
-            (5, "5 букв", "#6aaa64"),
-            (6, "6 букв", "#8fbc8f")
-        ]
-        
-        for length, text, color in modes:
-            tk.Button(btn_frame, text=text, width=15, height=2,
+        # Кнопки выбора режима: по одной на каждую длину слова
+        for i, length in enumerate(LENGTHS):
+            color = ("#6aaa64", "#8fbc8f")[i % 2]
+            tk.Button(btn_frame, text=f"{length} букв", width=7, height=2,
                      command=lambda l=length: self.start_game(l),
-                     font=("Arial", 14), bg=color, fg="white").pack(pady=10)
+                     font=("Arial", 12), bg=color, fg="white").grid(
+                         row=i // MODES_PER_ROW, column=i % MODES_PER_ROW, padx=5, pady=5)
+        
+        tk.Checkbutton(self.menu_frame, text="Сложный режим: только слова, согласные с подсказками",
+                       variable=self.hard_mode, font=("Arial", 10),
+                       bg=self.bg_color).pack(pady=10)
+        tk.Checkbutton(self.menu_frame, text="Absurdle: слово меняется, чтобы ускользнуть от вас",
+                       variable=self.adversarial, font=("Arial", 10),
+                       bg=self.bg_color).pack()
+        tk.Button(self.menu_frame, text="Статистика", width=15, command=self.show_stats,
+                  font=("Arial", 10), bg="#d3d6da").pack(pady=15)
     
+    def setup_mode_selection(self):
+        """Переход в меню выбора режима"""
+        self.game = None
+        self.waiting = None
+        self.show_screen(self.menu_frame)
+    
+    def prepare(self, length, adversarial):
+        """Фоновое построение индекса и разбиения для Absurdle, которых ещё нет"""
+        if length not in self.letter_indexes:
+            self.build("index", length, build_index)
+        if adversarial and length not in self.partitioners:
+            self.build("partitioner", length, build_partitioner)
+    
+    def build(self, kind, length, function):
+        """Запуск function(словарь, length) в фоновом потоке, если она ещё не запущена"""
+        key = (kind, length)
+        if key in self.building:
+            return
+        lexicon = self.lexicon
+        built = self.building[key] = []
+        threading.Thread(target=lambda: built.append(function(lexicon, length)),
+                         daemon=True).start()
+        self.root.after(LOADER_POLL_MS, self.poll_build, lexicon, key)
+    
+    def poll_build(self, lexicon, key):
+        """Готовые индекс или разбиение подключаются к партии в потоке Tk"""
+        if lexicon is not self.lexicon:
+            return  # Словарь уже заменён, а с ним и всё построенное по нему
+        built = self.building[key]
+        if not built:
+            self.root.after(LOADER_POLL_MS, self.poll_build, lexicon, key)
+            return
+        del self.building[key]
+        kind, length = key
+        if kind == "index":
+            self.letter_indexes[length], self.solvers[length] = built[0]
+            if self.game is not None and self.game.length == length:
+                self.game.use_lexicon(self.lexicon, self.letter_indexes[length])
+                self.update_candidates_label()
+        else:
+            self.partitioners[length] = built[0]
+            if self.waiting == length:
+                self.begin_game()
+    
+    @metrics.timed("ui.start_game")
     def start_game(self, word_length):
-        """Инициализация новой игры"""
+        """Инициализация новой игры.
+
+        Индекс, автомат и разбиение новой длины строятся в фоне: обычная
+        партия начинается сразу и получает индекс через Game.use_lexicon,
+        а партия Absurdle — как только готово разбиение словаря.
+        """
         self.word_length = word_length
-        self.WORDS = self.load_words(word_length)
-        
-        if not self.WORDS:
-            # Резервные словари
-            backup_words = {
-                5: ["яблок", "столб", "речка", "ветер", "каска", "лампа", 
-                    "метро", "норма", "океан", "пирог", "рубин", "салат",
-                    "танец", "улица", "фонарь", "хобби", "цветок", "штора",
-                    "щука", "эмаль", "юноша", "якорь"],
-                6: ["абзац", "автограф", "береза", "ветер", "горшок", 
-                    "дерево", "ежевика", "жалюзи", "заря", "избушка",
-                    "качели", "лампа", "метро", "норма", "очки", "пирог"]
-            }
-            self.WORDS = backup_words.get(word_length, backup_words[5])
-            messagebox.showwarning("Внимание", "Используется локальный словарь")
-        
-        self.target_word = random.choice(self.WORDS).lower()
-        self.attempts = 0
-        self.current_guess = ""
-        self.used_letters = defaultdict(set)
+        if not self.lexicon.words(word_length):
+            self.use_backup()
+        # Словарь всех длин общий для режимов, смена режима его не трогает
+        self.lexicon.warm_up([word_length])
+        adversarial = self.adversarial.get()
+        self.prepare(word_length, adversarial)
+        self.game = None
+        self.waiting = word_length
+        if not adversarial or word_length in self.partitioners:
+            self.begin_game()
         
         self.setup_game_ui()
         self.center_window()
         self.root.focus_set()
     
-    def load_words(self, word_length):
-        """Загрузка и кэширование словаря"""
-        cache_file = self.words_cache[word_length]
-        
-        # Пробуем загрузить из кэша
-        if os.path.exists(cache_file):
-            try:
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    words = json.load(f)
-                    return [w for w in words if len(w) == word_length]
-            except:
-                pass
-        
-        # Загрузка из интернета
-        try:
-            urls = [
-                "https://raw.githubusercontent.com/danakt/russian-words/master/russian.txt",
-                "https://raw.githubusercontent.com/Harrix/Russian-Nouns/main/dist/russian_nouns.txt"
-            ]
-            
-            words = set()
-            pattern = fr'\b[а-яё]{{{word_length}}}\b'
-            
-            for url in urls:
-                try:
-                    with urllib.request.urlopen(url, timeout=3) as response:
-                        text = response.read().decode('utf-8')
-                        found_words = re.findall(pattern, text.lower())
-                        words.update(found_words)
-                except:
-                    continue
-            
-            if words:
-                with open(cache_file, 'w', encoding='utf-8') as f:
-                    json.dump(list(words), f, ensure_ascii=False)
-                return list(words)
-            
-        except Exception as e:
-            print(f"Ошибка загрузки словаря: {e}")
-        
-        return None
+    def begin_game(self):
+        """Создание партии, когда для неё всё готово"""
+        length = self.waiting
+        self.waiting = None
+        index = self.letter_indexes.get(length)
+        if self.adversarial.get():
+            self.game = AdversarialGame(self.lexicon, length, self.max_attempts,
+                                        partitioner=self.partitioners[length],
+                                        index=index, hard_mode=self.hard_mode.get())
+        else:
+            self.game = Game(self.lexicon, length, self.max_attempts,
+                             index=index, hard_mode=self.hard_mode.get())
+        self.game.subscribe(self.on_game_event)
+        self.game_started = time.monotonic()
+        self.update_candidates_label()
     
-    def setup_game_ui(self):
-        """Настройка игрового интерфейса"""
-        self.clear_window()
-        
+    def build_game_ui(self):
+        """Игровой экран; поле подстраивается под длину слова в setup_game_ui"""
         # Заголовок
-        title_text = f"WORDLE - {self.word_length} букв"
-        title_label = tk.Label(self.root, text=title_text, 
-                             font=("Arial", 16, "bold"), 
-                             bg=self.bg_color, fg="#333")
-        title_label.pack(pady=10)
+        self.title_label = tk.Label(self.game_frame, 
+                                  font=("Arial", 16, "bold"), 
+                                  bg=self.bg_color, fg="#333")
+        self.title_label.pack(pady=10)
         
         # Кнопка возврата
-        tk.Button(self.root, text="← Меню", command=self.setup_mode_selection,
+        tk.Button(self.game_frame, text="← Меню", command=self.setup_mode_selection,
                  font=("Arial", 10), bg="#d3d6da").pack(anchor="nw", padx=10, pady=5)
         
         # Подсказка управления
-        controls_label = tk.Label(self.root, 
+        controls_label = tk.Label(self.game_frame, 
                                 text="Вводите буквы с клавиатуры\nEnter - проверить\nBackspace - удалить", 
                                 font=("Arial", 10), bg=self.bg_color)
         controls_label.pack(pady=5)
         
         # Игровая сетка
-        self.grid_frame = tk.Frame(self.root, bg=self.bg_color)
-        self.grid_frame.pack(pady=10)
+        self.board = Board(self.game_frame, self.max_attempts, self.word_length, bg=self.bg_color)
+        self.board.frame.pack(pady=10)
         
-        self.cells = []
-        for row in range(self.max_attempts):
-            row_cells = []
-            for col in range(self.word_length):
-                cell = tk.Label(self.grid_frame, text="", width=3, height=1, 
-                              font=("Arial", 20), relief="solid", borderwidth=1,
-                              bg="white", fg="black")
-                cell.grid(row=row, column=col, padx=3, pady=3)
-                row_cells.append(cell)
-            self.cells.append(row_cells)
+        # Сколько слов ещё подходит под подсказки
+        self.candidates_label = tk.Label(self.game_frame, font=("Arial", 10), bg=self.bg_color)
+        self.candidates_label.pack()
         
         # Кнопки управления
-        control_frame = tk.Frame(self.root, bg=self.bg_color)
+        control_frame = tk.Frame(self.game_frame, bg=self.bg_color)
         control_frame.pack(pady=10)
         
         tk.Button(control_frame, text="Enter", width=10, 
@@ -167,11 +309,23 @@ class WordleGame:
         tk.Button(control_frame, text="Del", width=10, 
                  command=self.delete_letter, bg="#787c7e", fg="white").pack(side="left", padx=5)
         
-        # Привязка клавиш
-        self.root.bind("<Key>", self.handle_key_press)
+        tk.Button(control_frame, text="Подсказка", width=10, 
+                 command=self.show_hint, bg="#c9b458", fg="white").pack(side="left", padx=5)
+    
+    @metrics.timed("ui.setup_game_ui")
+    def setup_game_ui(self):
+        """Настройка игрового экрана под текущую партию"""
+        name = "ABSURDLE" if self.adversarial.get() else "WORDLE"
+        self.title_label.config(text=f"{name} - {self.word_length} букв")
+        self.board.set_font(cell_font(self.word_length))
+        self.board.resize(self.max_attempts, self.word_length)
+        self.update_candidates_label()
+        self.show_screen(self.game_frame)
     
     def handle_key_press(self, event):
         """Обработка ввода с клавиатуры"""
+        if self.game is None:
+            return  # Открыто меню или партия Absurdle ещё готовится
         char = event.char.lower()
         
         # Русские буквы
@@ -197,100 +351,109 @@ class WordleGame:
     
     def add_letter(self, letter):
         """Добавление буквы в текущую попытку"""
-        if len(self.current_guess) < self.word_length:
-            self.current_guess += letter
-            row = self.attempts
-            col = len(self.current_guess) - 1
-            self.cells[row][col].config(text=letter.upper())
+        self.game.add_letter(letter)
     
     def delete_letter(self):
         """Удаление последней буквы"""
-        if len(self.current_guess) > 0:
-            row = self.attempts
-            col = len(self.current_guess) - 1
-            self.cells[row][col].config(text="")
-            self.current_guess = self.current_guess[:-1]
+        self.game.delete_letter()
+    
+    def show_hint(self):
+        """Подстановка слова с наибольшей ожидаемой информацией"""
+        solver = self.solvers.get(self.word_length)
+        if solver is None or self.game.candidates is None:
+            return  # Индекс этой длины ещё строится
+        hint = solver.best_guess(self.game.candidates, self.game.hard_mode)
+        if hint is None:
+            return
+        while self.game.current:
+            self.delete_letter()
+        for letter in hint:
+            self.add_letter(letter)
     
+    @metrics.timed("ui.submit_guess")
     def submit_guess(self):
         """Проверка введенного слова"""
-        if len(self.current_guess) != self.word_length:
-            messagebox.showwarning("Ошибка", f"Слово должно быть из {self.word_length} букв!")
-            return
-        
-        if self.current_guess not in self.WORDS:
-            messagebox.showwarning("Ошибка", "Такого слова нет в словаре!")
-            return
-        
-        feedback = self.check_guess()
-        self.update_colors(feedback)
-        
-        if self.current_guess == self.target_word:
-            self.highlight_win()
-            messagebox.showinfo("Победа!", f"Вы угадали слово {self.target_word.upper()}!")
-            self.root.after(2000, self.root.destroy)
-            return
-        
-        self.attempts += 1
-        self.current_guess = ""
-        
-        if self.attempts >= self.max_attempts:
-            self.reveal_answer()
-            messagebox.showinfo("Конец игры", f"Загаданное слово: {self.target_word.upper()}")
-            self.root.after(2000, self.root.destroy)
+        self.game.submit()
     
-    def check_guess(self):
-        """Анализ введенного слова"""
-        feedback = []
-        target_list = list(self.target_word)
-        
-        # Проверка точных совпадений
-        for i in range(self.word_length):
-            if self.current_guess[i] == self.target_word[i]:
-                feedback.append("green")
-                target_list[i] = None
-            else:
-                feedback.append("gray")
-        
-        # Проверка букв в слове, но не на месте
-        for i in range(self.word_length):
-            if feedback[i] != "green" and self.current_guess[i] in target_list:
-                feedback[i] = "yellow"
-                target_list[target_list.index(self.current_guess[i])] = None
-        
-        return feedback
+    def on_game_event(self, event, payload):
+        """Отображение событий игры"""
+        if event == LETTER_ADDED:
+            row, col, letter = payload
+            self.board.cells[row][col].config(text=letter.upper())
+        elif event == LETTER_DELETED:
+            row, col = payload
+            self.board.cells[row][col].config(text="")
+        elif event == PREFIX_CHECKED:
+            row, valid = payload
+            # Буквы строки краснеют, как только с набранного не начинается ни одно слово
+            for cell in self.board.cells[row]:
+                cell.config(fg="black" if valid else "#d9534f")
+        elif event == GUESS_REJECTED:
+            # После последней строки, пока не показан итог, качать уже нечего
+            if payload.rejected != GAME_OVER and payload.row < len(self.board.cells):
+                self.animator.shake(self.board.cells[payload.row])
+            messagebox.showwarning("Ошибка", payload.message(self.word_length))
+        elif event == GUESS_SCORED:
+            self.reveal_end = self.update_colors(payload.row, decode_pattern(payload.pattern, self.word_length))
+            self.update_candidates_label()
+        elif event == GAME_WON:
+            self.log_game()
+            end = self.highlight_win(payload.row, self.reveal_end)
+            self.animator.call_later(end, self.announce_win)
+        elif event == GAME_LOST:
+            self.log_game()
+            self.animator.call_later(self.reveal_end, self.announce_loss)
+    
+    def log_game(self):
+        """Запись законченной партии в журнал"""
+        mode = MODE_HARD if self.game.hard_mode else 0
+        if isinstance(self.game, AdversarialGame):
+            mode |= MODE_ADVERSARIAL
+        try:
+            self.game_log.append(self.game, time.monotonic() - self.game_started, mode)
+        except (OSError, LogError) as e:
+            print(f"Партия не записана в журнал: {e}")
+    
+    def show_stats(self):
+        show_stats(self.root, self.game_log, self.bg_color)
+    
+    def announce_win(self):
+        """Сообщение о победе после окончания анимации"""
+        messagebox.showinfo("Победа!", f"Вы угадали слово {self.game.target.upper()}!")
+        self.offer_new_game()
+    
+    def announce_loss(self):
+        """Показ ответа после открытия последней строки"""
+        self.reveal_answer()
+        messagebox.showinfo("Конец игры", f"Загаданное слово: {self.game.target.upper()}")
+        self.offer_new_game()
     
-    def update_colors(self, feedback):
-        """Обновление цветов клеток"""
-        row = self.attempts
-        for col in range(self.word_length):
-            self.cells[row][col].config(bg=feedback[col])
+    def offer_new_game(self):
+        """Новая партия той же длины без перезапуска или возврат в меню"""
+        if messagebox.askyesno("Wordle", "Сыграть ещё раз?"):
+            self.start_game(self.word_length)
+        else:
+            self.setup_mode_selection()
     
-    def highlight_win(self):
+    def update_colors(self, row, feedback):
+        """Поочерёдное открытие цветов строки; возвращает время окончания (мс)"""
+        return self.animator.reveal(self.board.cells[row], feedback)
+    
+    def update_candidates_label(self):
+        """Обновление счётчика возможных слов"""
+        if self.game is None or self.game.candidates is None:
+            self.candidates_label.config(text="")  # Индекс ещё строится
+            return
+        self.candidates_label.config(text=f"Возможных слов: {self.game.candidates.count()}")
+    
+    @metrics.timed("ui.highlight_win")
+    def highlight_win(self, row, start=0):
         """Анимация победы"""
-        row = self.attempts
-        for _ in range(3):
-            for col in range(self.word_length):
-                self.cells[row][col].config(bg="white")
-            self.root.update()
-            self.root.after(150)
-            for col in range(self.word_length):
-                self.cells[row][col].config(bg="green")
-            self.root.update()
-            self.root.after(150)
+        return self.animator.flash(self.board.cells[row], "green", start)
     
     def reveal_answer(self):
-        """Показ правильного ответа"""
-        for col in range(self.word_length):
-            self.cells[self.attempts][col].config(
-                text=self.target_word[col].upper(),
-                bg="#6aaa64",
-                fg="white"
-            )
-    
-    def clear_window(self):
-        """Очистка окна"""
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        """Показ правильного ответа в последней строке"""
+        self.board.fill(self.max_attempts - 1, self.game.target, bg="#6aaa64", fg="white")
     
     def center_window(self):
         """Центрирование окна"""
@@ -302,6 +465,7 @@ class WordleGame:
         self.root.geometry(f'+{x}+{y}')
 
 if __name__ == "__main__":
-    root = tk.Tk()
-    game = WordleGame(root)
-    root.mainloop()
+    with metrics.session():
+        root = tk.Tk()
+        game = WordleGame(root)
+        root.mainloop()
@@ -0,0 +1,266 @@
+import threading
+import time
+import tkinter as tk
+from tkinter import messagebox
+from animation import Animator
+from backup_words import backup_lexicon
+from board import Board
+from constraints import LetterIndex
+from dictionary import DictionaryLoader, open_lexicon
+from engine import (BOARD_EVENT, GAME_LOST, GAME_OVER, GAME_WON, GUESS_REJECTED,
+                    GUESS_SCORED, LETTER_ADDED, LETTER_DELETED, PREFIX_CHECKED, MultiGame)
+import metrics
+from scoring import decode_pattern
+
+LENGTHS = (5, 6)
+BOARD_COUNTS = (4, 8, 16)
+LOADER_POLL_MS = 100
+# Раскладка полей и размер клеток в зависимости от числа слов
+COLUMNS = {4: 4, 8: 4, 16: 8}
+CELL_FONTS = {4: ("Arial", 14), 8: ("Arial", 11), 16: ("Arial", 8)}
+SOLVED_COLOR = "#6aaa64"
+
+
+def build_index(lexicon, length):
+    """Автомат и индекс слов одной длины; строятся в фоновом потоке"""
+    lexicon.automaton(length)
+    return LetterIndex(lexicon.words(length))
+
+
+def build_indexes(lexicon):
+    """Индексы для всех длин; строятся в потоке загрузки словаря"""
+    return {length: build_index(lexicon, length) for length in LENGTHS}
+
+
+class MultiWordleGame:
+    """Несколько загаданных слов сразу: 4, 8 или 16 полей с общими попытками"""
+
+    def __init__(self, root):
+        self.started = time.perf_counter()
+        self.time_to_first_frame = None
+        self.root = root
+        self.root.title("Wordle на русском: несколько слов")
+        self.bg_color = "#f0f0f0"
+        self.root.config(bg=self.bg_color)
+
+        # Словарь открывается так же, как в wordle_5-6.py: без сети на старте
+        self.lexicon = open_lexicon()
+        self.loader = DictionaryLoader(prepare=build_indexes, revalidate=True)
+        # Проверяются сами слова: повреждённый шард читается как пустой
+        if self.lexicon is None or not all(map(self.lexicon.words, LENGTHS)):
+            self.lexicon = backup_lexicon(LENGTHS)
+            self.loader = DictionaryLoader(prepare=build_indexes)
+        # Автомат и индекс выбранной длины строятся в фоне по одному потоку
+        # на длину, чтобы не задерживать первый кадр
+        self.letter_indexes = {}
+        self.building = set()  # Длины, индекс которых строится
+
+        self.animator = Animator(self.root)
+        self.count = tk.IntVar(value=BOARD_COUNTS[0])
+        self.word_length = tk.IntVar(value=LENGTHS[0])
+        self.boards = []  # Пул полей; лишние скрываются, а не уничтожаются
+        self.game = None
+        self.reveal_end = 0
+
+        self.setup_ui()
+        self.new_game()
+        self.root.focus_set()
+        self.root.after_idle(self.first_frame_drawn)
+        self.loader.start()
+        self.root.after(LOADER_POLL_MS, self.poll_loader)
+
+    def first_frame_drawn(self):
+        """Время от запуска до первой отрисовки окна (с)"""
+        self.time_to_first_frame = time.perf_counter() - self.started
+
+    def poll_loader(self):
+        """Ход фоновой загрузки; готовый словарь подменяется в потоке Tk"""
+        if not self.loader.ready():
+            if not self.loader.revalidate:
+                self.status_label.config(
+                    text=f"Загрузка словаря: {self.loader.fraction():.0%}")
+            self.root.after(LOADER_POLL_MS, self.poll_loader)
+            return
+        loader, self.loader = self.loader, None
+        self.status_label.config(text="")
+        if loader.lexicon is None or not all(map(loader.lexicon.words, LENGTHS)):
+            return  # Остаются резервные словари
+        self.lexicon = loader.lexicon
+        self.letter_indexes = loader.prepared
+        self.building = set()
+        self.game.use_lexicon(self.lexicon, self.letter_indexes[self.game.length])
+
+    def start_index(self, length):
+        """Построение индекса текущего словаря в фоновом потоке"""
+        if length in self.building:
+            return
+        self.building.add(length)
+        lexicon = self.lexicon
+        built = []
+        threading.Thread(target=lambda: built.append(build_index(lexicon, length)),
+                         daemon=True).start()
+        self.root.after(LOADER_POLL_MS, self.poll_index, lexicon, length, built)
+
+    def poll_index(self, lexicon, length, built):
+        """Готовый индекс подключается к партии в потоке Tk"""
+        if lexicon is not self.lexicon:
+            return  # Словарь уже заменён загруженным вместе с его индексами
+        if not built:
+            self.root.after(LOADER_POLL_MS, self.poll_index, lexicon, length, built)
+            return
+        self.building.discard(length)
+        self.letter_indexes[length] = built[0]
+        if self.game.length == length:
+            self.game.use_lexicon(self.lexicon, built[0])
+
+    @metrics.timed("ui.setup_ui")
+    def setup_ui(self):
+        top = tk.Frame(self.root, bg=self.bg_color)
+        top.pack(pady=5)
+
+        tk.Label(top, text="Слов:", font=("Arial", 10), bg=self.bg_color).pack(side="left")
+        for count in BOARD_COUNTS:
+            tk.Radiobutton(top, text=str(count), value=count, variable=self.count,
+                           command=self.new_game, bg=self.bg_color).pack(side="left")
+        tk.Label(top, text="  Букв:", font=("Arial", 10), bg=self.bg_color).pack(side="left")
+        for length in LENGTHS:
+            tk.Radiobutton(top, text=str(length), value=length, variable=self.word_length,
+                           command=self.new_game, bg=self.bg_color).pack(side="left")
+        tk.Button(top, text="Новая игра", command=self.new_game,
+                  font=("Arial", 10), bg="#d3d6da").pack(side="left", padx=10)
+
+        self.attempts_label = tk.Label(self.root, font=("Arial", 10), bg=self.bg_color)
+        self.attempts_label.pack()
+
+        self.boards_frame = tk.Frame(self.root, bg=self.bg_color)
+        self.boards_frame.pack(padx=10, pady=5)
+
+        # Ход фоновой загрузки словаря
+        self.status_label = tk.Label(self.root, font=("Arial", 9), bg=self.bg_color, fg="#787c7e")
+        self.status_label.pack()
+
+        self.root.bind("<Key>", self.handle_key_press)
+
+    @metrics.timed("ui.new_game")
+    def new_game(self):
+        """Новая партия; поля переиспользуются и меняют только размер и шрифт"""
+        self.animator.clear()
+        count, length = self.count.get(), self.word_length.get()
+        self.game = MultiGame(self.lexicon, length, count,
+                              index=self.letter_indexes.get(length))
+        if length not in self.letter_indexes:
+            self.start_index(length)
+        self.game.subscribe(self.on_game_event)
+
+        font = CELL_FONTS[count]
+        while len(self.boards) < count:
+            self.boards.append(Board(self.boards_frame, 0, 0, bg=self.bg_color, font=font, pad=1))
+        for number, board in enumerate(self.boards):
+            if number < count:
+                board.set_font(font)
+                board.resize(self.game.max_attempts, length)
+                board.frame.config(bg=self.bg_color)
+                board.frame.grid(row=number // COLUMNS[count], column=number % COLUMNS[count],
+                                 padx=4, pady=4)
+            else:
+                board.frame.grid_remove()
+        self.update_attempts_label()
+        self.root.focus_set()
+
+    def handle_key_press(self, event):
+        """Обработка ввода с клавиатуры"""
+        char = event.char.lower()
+
+        # Русские буквы
+        if 'а' <= char <= 'я' or char == 'ё':
+            self.game.add_letter(char)
+        # Английская раскладка (автоконвертация)
+        elif char in self.eng_to_rus:
+            self.game.add_letter(self.eng_to_rus[char])
+        elif event.keysym == "BackSpace":
+            self.game.delete_letter()
+        elif event.keysym == "Return":
+            with metrics.span("ui.submit_guess"):
+                self.game.submit()
+
+    # Словарь для конвертации английской раскладки в русскую
+    eng_to_rus = {
+        'f': 'а', ',': 'б', 'd': 'в', 'u': 'г', 'l': 'д', 't': 'е',
+        '`': 'ё', ';': 'ж', 'p': 'з', 'b': 'и', 'q': 'й', 'r': 'к',
+        'k': 'л', 'v': 'м', 'y': 'н', 'j': 'о', 'g': 'п', 'h': 'р',
+        'c': 'с', 'n': 'т', 'e': 'у', 'a': 'ф', '[': 'х', 'w': 'ц',
+        'x': 'ч', 'i': 'ш', 'o': 'щ', ']': 'ъ', 's': 'ы', 'm': 'ь',
+        "'": 'э', '.': 'ю', 'z': 'я'
+    }
+
+    def active_rows(self, row):
+        """Строка row во всех полях, где слово ещё не отгадано"""
+        return [self.boards[number].cells[row]
+                for number, board in enumerate(self.game.boards) if not board.finished]
+
+    def on_game_event(self, event, payload):
+        """Отображение событий игры; меняются только затронутые клетки"""
+        if event == LETTER_ADDED:
+            row, col, letter = payload
+            for cells in self.active_rows(row):
+                cells[col].config(text=letter.upper())
+        elif event == LETTER_DELETED:
+            row, col = payload
+            for cells in self.active_rows(row):
+                cells[col].config(text="")
+        elif event == PREFIX_CHECKED:
+            row, valid = payload
+            for cells in self.active_rows(row):
+                for cell in cells:
+                    cell.config(fg="black" if valid else "#d9534f")
+        elif event == GUESS_REJECTED:
+            # После последней строки, пока не показан итог, качать уже нечего
+            if payload.rejected != GAME_OVER and payload.row < self.game.max_attempts:
+                for cells in self.active_rows(payload.row):
+                    self.animator.shake(cells, pad=1)
+            messagebox.showwarning("Ошибка", payload.message(self.game.length))
+        elif event == BOARD_EVENT:
+            self.on_board_event(*payload)
+        elif event == GAME_WON:
+            self.animator.call_later(self.reveal_end, self.announce_win)
+        elif event == GAME_LOST:
+            self.animator.call_later(self.reveal_end, self.announce_loss)
+
+    def on_board_event(self, number, event, payload):
+        """События одного поля: все поля открывают строку одновременно"""
+        board = self.boards[number]
+        if event == GUESS_SCORED:
+            feedback = decode_pattern(payload.pattern, self.game.length)
+            self.reveal_end = self.animator.reveal(board.cells[payload.row], feedback)
+            self.update_attempts_label()
+        elif event == GAME_WON:
+            self.animator.schedule(self.reveal_end, board.frame, bg=SOLVED_COLOR)
+
+    def update_attempts_label(self):
+        solved = sum(board.won for board in self.game.boards)
+        self.attempts_label.config(
+            text=f"Попыток: {self.game.attempts} из {self.game.max_attempts}, "
+                 f"отгадано {solved} из {len(self.game.boards)}")
+
+    def announce_win(self):
+        """Сообщение о победе после окончания анимации"""
+        messagebox.showinfo("Победа!", f"Все слова отгаданы за {self.game.attempts} попыток!")
+        self.offer_new_game()
+
+    def announce_loss(self):
+        """Показ неотгаданных слов"""
+        missed = [board.target.upper() for board in self.game.boards if not board.won]
+        messagebox.showinfo("Конец игры", "Не отгаданы: " + ", ".join(missed))
+        self.offer_new_game()
+
+    def offer_new_game(self):
+        if messagebox.askyesno("Wordle", "Сыграть ещё раз?"):
+            self.new_game()
+        else:
+            self.root.destroy()
+
+if __name__ == "__main__":
+    with metrics.session():
+        root = tk.Tk()
+        game = MultiWordleGame(root)
+        root.mainloop()